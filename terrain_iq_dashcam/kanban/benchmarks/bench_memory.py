@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark: memory held by a loaded board, per task representation
+Loads the same synthetic board as fully parsed task dicts (load_task), as the
+earlier frontmatter dicts (a dict subclass plus a Path per task) and as the
+TaskRecords get_all_tasks returns, and reports the bytes each keeps alive
+(tracemalloc) along with the load time (frontmatter_dict is built straight
+from the cache without stat'ing the files, so its time is a lower bound).
+
+Usage:
+    python benchmarks/bench_memory.py --tasks 20000
+    python benchmarks/bench_memory.py --tasks 50000 --body-words 200 --tags 3 -o memory.json
+"""
+
+import gc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import click
+
+def measure(build):
+    """Bytes still allocated after build() returns (while its result is alive), peak bytes, seconds
+
+    The time comes from a separate untraced run, since tracing slows down allocation.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    build()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {'retained_bytes': current, 'peak_bytes': peak, 'seconds': round(elapsed, 4)}
+
+def representations(kanban):
+    """Name -> function loading the whole board in that representation"""
+
+    class FrontmatterDict(dict):
+        """The earlier get_all_tasks task: a frontmatter dict plus its file path"""
+
+        def __init__(self, fields, task_file):
+            super().__init__(fields)
+            self.task_file = task_file
+            self.body_loaded = False
+
+    def parsed():
+        return {column: [kanban.load_task(task_file) for task_file in kanban.list_column_files(column)]
+                for column in kanban.COLUMNS}
+
+    def frontmatter_dicts():
+        tasks = {column: [] for column in kanban.COLUMNS}
+        for key, entry in kanban.load_task_cache().items():
+            column, name = key.split('/', 1)
+            tasks[column].append(FrontmatterDict(entry['fields'], kanban.KANBAN_DIR / column / name))
+        return tasks
+
+    def records_with_bodies():
+        tasks = kanban.get_all_tasks()
+        for column_tasks in tasks.values():
+            for task in column_tasks:
+                task.load_body()
+        return tasks
+
+    return {
+        'parsed_dict': parsed,
+        'frontmatter_dict': frontmatter_dicts,
+        'task_record': kanban.get_all_tasks,
+        'task_record_with_bodies': records_with_bodies,
+    }
+
+@click.command()
+@click.option('--tasks', default=20000, show_default=True, help='Synthetic board size')
+@click.option('--body-words', default=6, show_default=True, help='Extra description words per task')
+@click.option('--tags', 'tag_count', default=0, show_default=True, help='Tags per task')
+@click.option('--seed', default=0, show_default=True, help='Random seed for the synthetic board')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write results JSON here (default: stdout)')
+def main(tasks, body_words, tag_count, seed, output):
+    """Compare the memory a loaded board takes per task representation"""
+    board_dir = Path(tempfile.mkdtemp(prefix='kanban-bench-'))
+    os.environ['KANBAN_DIR'] = str(board_dir)
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    from synthetic import generate_board
+    import kanban
+
+    try:
+        generate_board(board_dir, tasks, seed, None, body_words, tag_count)
+        # Every representation below starts from a warm parsed-task cache
+        kanban.get_all_tasks()
+
+        results = {}
+        print(f"{'representation':<26} {'retained MB':>12} {'bytes/task':>11} {'peak MB':>9} {'load s':>8}",
+              file=sys.stderr)
+        for name, build in representations(kanban).items():
+            stats = results[name] = measure(build)
+            stats['bytes_per_task'] = round(stats['retained_bytes'] / tasks)
+            print(f"{name:<26} {stats['retained_bytes'] / 1e6:>12.2f} {stats['bytes_per_task']:>11} "
+                  f"{stats['peak_bytes'] / 1e6:>9.2f} {stats['seconds']:>8.3f}", file=sys.stderr)
+    finally:
+        shutil.rmtree(board_dir, ignore_errors=True)
+
+    report = {'board': {'tasks': tasks, 'body_words': body_words, 'tags': tag_count, 'seed': seed},
+              'results': results}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+if __name__ == '__main__':
+    main()
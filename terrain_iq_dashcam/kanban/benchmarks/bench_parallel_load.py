@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs thread-pool task loading in get_all_tasks
+Runs against a synthetic board with the parsed-task cache cleared before every run,
+so each measurement pays the full listing, stat and frontmatter read cost.
+
+Usage:
+    python benchmarks/bench_parallel_load.py --tasks 5000 --workers 1,2,4,8,16
+    python benchmarks/bench_parallel_load.py --latency-ms 2   # emulate a network filesystem
+"""
+
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import click
+
+@click.command()
+@click.option('--tasks', default=5000, show_default=True, help='Synthetic board size')
+@click.option('--workers', default='1,2,4,8,16', show_default=True, help='Comma-separated worker counts')
+@click.option('--repeat', default=5, show_default=True, help='Runs per worker count')
+@click.option('--latency-ms', default=0.0, show_default=True,
+              help='Extra per-file read latency to emulate network filesystems / cold caches')
+def main(tasks, workers, repeat, latency_ms):
+    """Compare get_all_tasks load time across worker counts"""
+    board_dir = Path(tempfile.mkdtemp(prefix='kanban-bench-'))
+    os.environ['KANBAN_DIR'] = str(board_dir)
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    from synthetic import generate_board
+    import kanban
+
+    try:
+        generate_board(board_dir, tasks)
+
+        if latency_ms:
+            read_frontmatter_block = kanban.read_frontmatter_block
+
+            def slow_read_frontmatter_block(task_file):
+                time.sleep(latency_ms / 1000)
+                return read_frontmatter_block(task_file)
+
+            kanban.read_frontmatter_block = slow_read_frontmatter_block
+
+        worker_counts = [int(w) for w in workers.split(',')]
+        print(f"{tasks} tasks, {repeat} runs each, latency {latency_ms} ms/file")
+        print(f"{'workers':>8} {'median s':>10} {'min s':>10} {'speedup':>8}")
+
+        baseline = None
+        for count in worker_counts:
+            timings = []
+            for _ in range(repeat):
+                shutil.rmtree(kanban.CACHE_DIR, ignore_errors=True)
+                start = time.perf_counter()
+                kanban.get_all_tasks(workers=count)
+                timings.append(time.perf_counter() - start)
+            median = statistics.median(timings)
+            baseline = baseline or median
+            print(f"{count:>8} {median:>10.4f} {min(timings):>10.4f} {baseline / median:>7.2f}x")
+    finally:
+        shutil.rmtree(board_dir, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: parsing/rendering functions, board loading and lookups in-process,
+plus end-to-end `show`, `stats` and `move` runs of the CLI, on a synthetic board.
+Results are written as JSON; pass an earlier result with --compare to flag regressions.
+
+Usage:
+    python benchmarks/bench_suite.py --tasks 20000 -o results.json
+    python benchmarks/bench_suite.py --tasks 20000 --compare results.json   # exit 1 on regression
+    python benchmarks/bench_suite.py --board ../path/to/board --only show,stats
+"""
+
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+KANBAN_PY = Path(__file__).resolve().parent.parent / "kanban.py"
+RESULTS_VERSION = 1
+# Tasks sampled for the per-task parse/render and lookup benchmarks
+SAMPLE_SIZE = 500
+
+def measure(function, repeat, ops=1, setup=None):
+    """Run function `repeat` times (after setup, untimed); return timing stats"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        'median_s': round(median, 6),
+        'min_s': round(min(timings), 6),
+        'ops': ops,
+        'per_op_us': round(median / ops * 1e6, 3),
+    }
+
+def run_cli(board_dir, *args):
+    env = dict(os.environ, KANBAN_DIR=str(board_dir), KANBAN_NO_DAEMON='1')
+    result = subprocess.run([sys.executable, str(KANBAN_PY), *args], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise click.ClickException(f"kanban.py {' '.join(args)} failed: {result.stderr or result.stdout}")
+    return result
+
+def run_suite(board_dir, repeat, only=None):
+    """Run every benchmark (or those named in only) against board_dir; returns {name: stats}"""
+    import kanban
+
+    rng = random.Random(0)
+    files = [task_file for column in kanban.COLUMNS for task_file in kanban.list_column_files(column)]
+    sample = rng.sample(files, min(SAMPLE_SIZE, len(files)))
+    texts = [task_file.read_text() for task_file in sample]
+    bodies = [text.split('---\n', 2)[2] for text in texts]
+    tasks = [kanban.parse_markdown_task(text) for text in texts]
+    ids = [task_file.stem for task_file in sample]
+    moving = ids[0] if ids else None
+
+    def clear_cache():
+        shutil.rmtree(kanban.CACHE_DIR, ignore_errors=True)
+        kanban._ID_INDEX = None
+
+    def find_all():
+        for task_id in ids:
+            kanban.find_task(task_id)
+
+    def move_round_trip():
+        column = kanban.locate_task(moving)
+        target = 'review' if column != 'review' else 'ready'
+        run_cli(board_dir, 'move', moving, target)
+        run_cli(board_dir, 'move', moving, column)
+
+    benchmarks = {
+        'parse_markdown_task': lambda: measure(lambda: [kanban.parse_markdown_task(text) for text in texts],
+                                               repeat, len(texts)),
+        'parse_markdown_sections': lambda: measure(
+            lambda: [kanban.parse_markdown_sections(body) for body in bodies], repeat, len(bodies)),
+        'task_to_markdown': lambda: measure(lambda: [kanban.task_to_markdown(task) for task in tasks],
+                                            repeat, len(tasks)),
+        'get_all_tasks_cold': lambda: measure(kanban.get_all_tasks, repeat, len(files), setup=clear_cache),
+        'get_all_tasks_warm': lambda: measure(kanban.get_all_tasks, repeat, len(files)),
+        'find_task': lambda: measure(find_all, repeat, len(ids)),
+        'show': lambda: measure(lambda: run_cli(board_dir, '--json', 'show'), repeat),
+        'stats': lambda: measure(lambda: run_cli(board_dir, '--json', 'stats'), repeat),
+        'move': lambda: measure(move_round_trip, repeat, 2),
+    }
+
+    results = {}
+    for name, benchmark in benchmarks.items():
+        if only and name not in only:
+            continue
+        if name == 'move' and not moving:
+            continue
+        results[name] = benchmark()
+        print(f"{name:<26} {results[name]['median_s']:>10.4f} s  {results[name]['per_op_us']:>12.1f} µs/op",
+              file=sys.stderr)
+    return results
+
+def compare_results(results, baseline, threshold):
+    """Names whose median grew by more than threshold (a fraction) over the baseline"""
+    regressions = []
+    print(f"\n{'benchmark':<26} {'baseline s':>11} {'now s':>11} {'change':>8}", file=sys.stderr)
+    for name, stats in results.items():
+        before = baseline.get('results', {}).get(name)
+        if not before:
+            continue
+        change = stats['median_s'] / before['median_s'] - 1 if before['median_s'] else 0.0
+        flag = ''
+        if change > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:<26} {before['median_s']:>11.4f} {stats['median_s']:>11.4f} {change:>+7.0%}{flag}",
+              file=sys.stderr)
+    return regressions
+
+@click.command()
+@click.option('--tasks', default=5000, show_default=True, help='Synthetic board size')
+@click.option('--spread', help='Column weights backlog,ready,in_progress,review,done (default: even)')
+@click.option('--body-words', default=6, show_default=True, help='Extra description words per task')
+@click.option('--tags', 'tag_count', default=0, show_default=True, help='Tags per task')
+@click.option('--seed', default=0, show_default=True, help='Random seed for the synthetic board')
+@click.option('--board', 'source_board', type=click.Path(exists=True, file_okay=False),
+              help='Benchmark a copy of this board instead of a synthetic one')
+@click.option('--repeat', default=5, show_default=True, help='Runs per benchmark (the median is reported)')
+@click.option('--only', help='Comma-separated benchmark names')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write results JSON here (default: stdout)')
+@click.option('--compare', 'baseline_path', type=click.Path(exists=True, dir_okay=False),
+              help='Earlier results JSON to compare against')
+@click.option('--threshold', default=0.2, show_default=True,
+              help='Flag a regression when a median is this fraction slower than the baseline')
+def main(tasks, spread, body_words, tag_count, seed, source_board, repeat, only, output, baseline_path, threshold):
+    """Benchmark kanban.py on a synthetic board and save the results as JSON"""
+    board_dir = Path(tempfile.mkdtemp(prefix='kanban-bench-'))
+    os.environ['KANBAN_DIR'] = str(board_dir)
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+    from synthetic import generate_board, parse_spread
+
+    try:
+        if source_board:
+            shutil.copy(Path(source_board) / "board-metadata.json", board_dir)
+            for column in ['backlog', 'ready', 'in_progress', 'review', 'done']:
+                if (Path(source_board) / column).exists():
+                    shutil.copytree(Path(source_board) / column, board_dir / column)
+            board = {'source': str(source_board)}
+        else:
+            generate_board(board_dir, tasks, seed, parse_spread(spread), body_words, tag_count)
+            board = {'tasks': tasks, 'spread': spread, 'body_words': body_words, 'tags': tag_count, 'seed': seed}
+
+        results = {
+            'version': RESULTS_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'board': board,
+            'repeat': repeat,
+            'results': run_suite(board_dir, repeat, set(only.split(',')) if only else None),
+        }
+    finally:
+        shutil.rmtree(board_dir, ignore_errors=True)
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get('board') != results['board']:
+            print(f"Warning: baseline was run on a different board ({baseline.get('board')})", file=sys.stderr)
+        regressions = compare_results(results['results'], baseline, threshold)
+        results['regressions'] = regressions
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if regressions:
+        raise click.ClickException(f"Slower than baseline by more than {threshold:.0%}: {', '.join(regressions)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Synthetic board generator for kanban.py benchmarks
+Writes a board directory (metadata + column folders) that kanban.py can load via KANBAN_DIR
+
+Usage:
+    python benchmarks/synthetic.py /tmp/board --tasks 20000
+    python benchmarks/synthetic.py /tmp/board --tasks 5000 --spread 60,15,10,5,10 --body-words 400 --tags 4
+"""
+
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SOURCE_METADATA = Path(__file__).resolve().parent.parent / "board-metadata.json"
+
+WORDS = ("camera frame upload sensor gps route terrain mqtt retry buffer storage video "
+         "battery screen layout sync offline queue device network latency map alert").split()
+TAGS = [f"tag{i}" for i in range(50)]
+
+def parse_spread(spread):
+    """'60,15,10,5,10' -> column weights in COLUMNS order (None = even spread)"""
+    if not spread:
+        return None
+    weights = [float(weight) for weight in spread.split(',')]
+    if len(weights) != 5 or sum(weights) <= 0:
+        raise click.BadParameter("expected 5 comma-separated weights (backlog,ready,in_progress,review,done)")
+    return weights
+
+def generate_board(board_dir, task_count, seed=0, spread=None, body_words=6, tag_count=0):
+    """Write `task_count` synthetic tasks spread over the columns of a new board
+
+    spread weights the columns (in COLUMNS order, default even), body_words
+    sets the description length and tag_count the tags per task.
+    """
+    import kanban
+
+    rng = random.Random(seed)
+    board_dir = Path(board_dir)
+    board_dir.mkdir(parents=True, exist_ok=True)
+
+    with open(SOURCE_METADATA, 'r') as f:
+        metadata = json.load(f)
+    metadata['next_task_number'] = task_count + 1
+    with open(board_dir / "board-metadata.json", 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    for column in kanban.COLUMNS:
+        (board_dir / column).mkdir(exist_ok=True)
+
+    start = datetime(2025, 1, 1)
+    for num in range(1, task_count + 1):
+        created = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+        column = rng.choices(kanban.COLUMNS, spread)[0] if spread else rng.choice(kanban.COLUMNS)
+        description = ' '.join(rng.choice(WORDS) for _ in range(body_words))
+        task = {
+            'id': f"TASK-{num:03d}",
+            'title': f"Synthetic task {num}",
+            'description': f"Generated task {num} for benchmarking. {description}".strip(),
+            'type': rng.choice(['feature', 'bug', 'test', 'docs', 'refactor']),
+            'priority': rng.choice(['low', 'medium', 'high', 'critical']),
+            'assignee': rng.choice(['agent', 'human', 'unassigned']),
+            'use_case': '',
+            'acceptance_criteria': [f"Criterion {i}" for i in range(rng.randrange(0, 6))],
+            'validation_status': 'passed' if column == 'done' else 'pending',
+            'created_at': created.isoformat(),
+            'updated_at': created.isoformat(),
+            'completed_at': created.isoformat() if column == 'done' else None,
+            'tags': rng.sample(TAGS, min(tag_count, len(TAGS))),
+            'notes': [],
+        }
+        with open(board_dir / column / f"{task['id']}.md", 'w') as f:
+            f.write(kanban.task_to_markdown(task))
+
+    return board_dir
+
+@click.command()
+@click.argument('board_dir', type=click.Path(file_okay=False))
+@click.option('--tasks', default=1000, show_default=True, help='Number of tasks')
+@click.option('--spread', help='Column weights backlog,ready,in_progress,review,done (default: even)')
+@click.option('--body-words', default=6, show_default=True, help='Extra description words per task')
+@click.option('--tags', 'tag_count', default=0, show_default=True, help='Tags per task')
+@click.option('--seed', default=0, show_default=True, help='Random seed')
+def main(board_dir, tasks, spread, body_words, tag_count, seed):
+    """Generate a synthetic board in BOARD_DIR"""
+    generate_board(board_dir, tasks, seed, parse_spread(spread), body_words, tag_count)
+    print(f"Wrote {tasks} tasks to {board_dir}")
+
+if __name__ == '__main__':
+    main()
@@ -5,36 +5,166 @@ Folder-based task management system optimized for AI agent workflows
 Uses Markdown files with YAML frontmatter for better readability and documentation
 """
 
+import bisect
+import functools
+import io
 import json
+import math
+import os
 import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
 import click
-from datetime import datetime
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from rich.console import Console
-from rich.table import Table
-from rich import print as rprint
+from types import SimpleNamespace
 
-console = Console()
-KANBAN_DIR = Path(__file__).parent
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class LazyConsole:
+    """rich Console created on first use, so JSON output never imports rich"""
+
+    def __init__(self):
+        self._console = None
+
+    def __getattr__(self, name):
+        if TRACE:
+            # Importing rich and printing count as render time
+            return TRACE.wrap('render', lambda *args, **kwargs: getattr(self.get(), name)(*args, **kwargs))
+        return getattr(self.get(), name)
+
+    def get(self):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console()
+        return self._console
+
+console = LazyConsole()
+KANBAN_DIR = Path(os.environ.get('KANBAN_DIR') or Path(__file__).parent)
 METADATA_FILE = KANBAN_DIR / "board-metadata.json"
+LOCK_FILE = KANBAN_DIR / ".board.lock"
 COLUMNS = ['backlog', 'ready', 'in_progress', 'review', 'done']
 
+# Derived, rebuildable state lives here (safe to delete at any time)
+CACHE_DIR = KANBAN_DIR / ".kanban-cache"
+TASK_CACHE_FILE = CACHE_DIR / "tasks.json"
+ID_INDEX_FILE = CACHE_DIR / "ids.json"
+CACHE_VERSION = 3
+# A file modified this recently (ns) may change again within the same mtime
+# tick without its mtime or size changing, so its cache entry is not trusted
+RACY_MTIME_NS = 1_000_000_000
+
+# Set by the global --json/--jsonl flags ('json', 'jsonl' or None for rich output)
+OUTPUT_FORMAT = None
+
+# Route commands through a running `serve` daemon (disable with --no-daemon / KANBAN_NO_DAEMON)
+USE_DAEMON = True
+DAEMON_TIMEOUT = 5
+
+# Broker that board changes are published to (--mqtt / KANBAN_MQTT_URL, see MQTT Events)
+MQTT_URL = None
+
+# Phase timings and counters when --profile / KANBAN_TRACE is on (see enable_trace)
+TRACE = None
+_PROCESS_START = time.perf_counter()
+
+# Thread count for get_all_tasks (None = core-count based default, 1 = serial)
+LOAD_WORKERS = None
+
+# ID -> column index, loaded once per process (see load_id_index)
+_ID_INDEX = None
+
+# board_lock state: process-wide file lock, re-entrant per thread
+_BOARD_THREAD_LOCK = threading.RLock()
+_board_lock_file = None
+_board_lock_depth = 0
+
+# Set by deferred_index_writes() while a batch holds the board lock
+_defer_index_save = False
+
+# Column folder stamps taken just before the current operation's write (see
+# update_board_index); None when there is no board index to keep current
+_stamps_before_write = None
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 # Helper Functions
 
-def load_metadata():
-    """Load board metadata from JSON file"""
-    if not METADATA_FILE.exists():
-        console.print("[red]Error: board-metadata.json not found![/red]")
-        console.print("Run from the kanban directory or check installation")
-        raise click.Abort()
+def warn(message):
+    """Print a warning (to stderr in JSON modes, keeping stdout machine-readable)"""
+    if OUTPUT_FORMAT:
+        click.echo(f"Warning: {message}", err=True)
+    else:
+        console.print(f"[yellow]Warning: {message}[/yellow]")
 
-    with open(METADATA_FILE, 'r') as f:
-        return json.load(f)
+def report_error(message):
+    """Report a command error: a JSON object and exit status 1 in JSON modes"""
+    if OUTPUT_FORMAT:
+        click.echo(json.dumps({'ok': False, 'error': message}))
+        sys.exit(1)
+    console.print(f"[red]Error: {message}[/red]")
+
+def emit(data, records=None):
+    """Print a command result as JSON; with --jsonl, one line per record if given"""
+    if OUTPUT_FORMAT == 'jsonl':
+        for record in (records if records is not None else [data]):
+            click.echo(json.dumps(record, default=str))
+    else:
+        click.echo(json.dumps(data, indent=2, default=str))
+
+def load_metadata():
+    """Load board metadata (board-metadata.json, or board.db with SQLite storage)"""
+    return STORAGE.load_metadata()
 
 def save_metadata(metadata):
-    """Save board metadata to JSON file"""
-    with open(METADATA_FILE, 'w') as f:
-        json.dump(metadata, f, indent=2)
+    """Save board metadata atomically (callers hold board_lock)"""
+    STORAGE.save_metadata(metadata)
+
+@contextmanager
+def board_lock():
+    """Hold the board-wide lock that serializes metadata and index updates
+
+    Uses an OS file lock on .board.lock, so it excludes other processes as well
+    as other threads; re-entrant within a thread.
+    """
+    global _board_lock_file, _board_lock_depth
+    with _BOARD_THREAD_LOCK:
+        if _board_lock_depth == 0:
+            lock_file = open(LOCK_FILE, 'a+')
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                lock_file.close()
+                raise
+            _board_lock_file = lock_file
+        _board_lock_depth += 1
+        try:
+            yield
+        finally:
+            _board_lock_depth -= 1
+            if _board_lock_depth == 0:
+                if fcntl:
+                    fcntl.flock(_board_lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    _board_lock_file.seek(0)
+                    msvcrt.locking(_board_lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+                _board_lock_file.close()
+                _board_lock_file = None
 
 def parse_markdown_task(content):
     """Parse markdown file with YAML frontmatter into task dict"""
@@ -46,7 +176,17 @@ def parse_markdown_task(content):
     frontmatter_text = parts[1]
     markdown_content = parts[2]
 
-    # Parse frontmatter manually (simple YAML parser for our use case)
+    task = parse_frontmatter(frontmatter_text)
+    task.update(parse_task_body(markdown_content))
+
+    # Ensure test_data structure exists
+    if 'test_data' not in task:
+        task['test_data'] = {'good_samples': [], 'bad_samples': []}
+
+    return task
+
+def parse_frontmatter(frontmatter_text):
+    """Parse frontmatter lines into a dict (simple YAML parser for our use case)"""
     task = {}
     for line in frontmatter_text.strip().split('\n'):
         if ':' in line:
@@ -72,8 +212,11 @@ def parse_markdown_task(content):
             else:
                 task[key] = value
 
-    # Parse markdown content sections
-    task['_markdown'] = markdown_content
+    return task
+
+def parse_task_body(markdown_content):
+    """Parse the markdown body of a task into its body fields"""
+    task = {'_markdown': markdown_content}
 
     # Extract sections from markdown
     sections = parse_markdown_sections(markdown_content)
@@ -102,12 +245,39 @@ def parse_markdown_task(content):
                 notes.append(line[2:].strip())
         task['notes'] = notes
 
-    # Ensure test_data structure exists
-    if 'test_data' not in task:
-        task['test_data'] = {'good_samples': [], 'bad_samples': []}
-
     return task
 
+def read_frontmatter(task_file):
+    """Read and parse only the frontmatter block, stopping at the closing ---"""
+    lines = []
+    with task_file.open('r') as f:
+        if f.readline() != '---\n':
+            raise ValueError("Invalid markdown format: missing frontmatter")
+        for line in f:
+            if line == '---\n':
+                if TRACE:
+                    TRACE.count(files_read=1, bytes_read=sum(map(len, lines)) + 8)
+                return parse_frontmatter(''.join(lines))
+            lines.append(line)
+    raise ValueError("Invalid markdown format: missing frontmatter")
+
+def read_frontmatter_block(task_file):
+    """read_frontmatter for a file on disk; returns (fields, byte offset where the body starts)"""
+    lines = []
+    with open(task_file, 'rb') as f:
+        line = f.readline()
+        if line not in (b'---\n', b'---\r\n'):
+            raise ValueError("Invalid markdown format: missing frontmatter")
+        offset = len(line)
+        for line in f:
+            offset += len(line)
+            if line in (b'---\n', b'---\r\n'):
+                if TRACE:
+                    TRACE.count(files_read=1, bytes_read=offset)
+                return parse_frontmatter(b''.join(lines).decode()), offset
+            lines.append(line)
+    raise ValueError("Invalid markdown format: missing frontmatter")
+
 def parse_markdown_sections(markdown):
     """Parse markdown into sections based on ## headers"""
     sections = {}
@@ -152,6 +322,11 @@ def task_to_markdown(task):
     else:
         frontmatter_lines.append("tags: []")
 
+    # Claim lease (see claim_task)
+    for field in LEASE_FIELDS:
+        if task.get(field):
+            frontmatter_lines.append(f"{field}: {task[field]}")
+
     frontmatter = '\n'.join(frontmatter_lines)
 
     # Build markdown content
@@ -217,52 +392,519 @@ def task_to_markdown(task):
     # Combine frontmatter and content
     return f"---\n{frontmatter}\n---\n\n{markdown_content}\n"
 
+# Frontmatter fields recording a claim lease (written only while a task holds one)
+LEASE_FIELDS = ('lease_owner', 'lease_expires_at')
+
+# Fields that live in the markdown body rather than the frontmatter
+BODY_FIELDS = frozenset(['_markdown', 'description', 'use_case', 'acceptance_criteria',
+                         'notes', 'test_data'])
+
+# Frontmatter fields a TaskRecord keeps in slots (in task_to_markdown's order);
+# other frontmatter keys go into its `extra` dict
+RECORD_FIELDS = ('id', 'title', 'type', 'priority', 'assignee', 'validation_status',
+                 'created_at', 'updated_at', 'completed_at', 'tags')
+_RECORD_FIELD_SET = frozenset(RECORD_FIELDS)
+_RECORD_FIELD_POSITIONS = {field: position for position, field in enumerate(RECORD_FIELDS)}
+# Choice fields whose values are interned, so every task shares one string per value
+INTERNED_FIELDS = frozenset(['type', 'priority', 'assignee', 'validation_status'])
+
+class TaskRecord(MutableMapping):
+    """Compact task as listed by get_all_tasks: frontmatter in slots, body on demand
+
+    Reads and writes like the dict load_task returns. The frontmatter fields
+    live in __slots__ (an unset slot is an absent key) instead of a per-task
+    dict, choice values and the column are interned, and the file path is
+    rebuilt from the column and ID when needed. The body is not held at all
+    until a body field (description, use case, criteria, notes, test data, raw
+    markdown) is touched or the task is iterated, copied or compared; it is
+    then read from body_offset, the byte offset just past the frontmatter.
+    """
+
+    __slots__ = RECORD_FIELDS + ('column', 'file_name', 'body_offset', 'extra', 'order', 'body')
+
+    def __init__(self, fields, column, file_name, body_offset=None):
+        extra = None
+        last = -1
+        in_order = True
+        for key, value in fields.items():
+            if key in _RECORD_FIELD_SET:
+                position = _RECORD_FIELD_POSITIONS[key]
+                if extra is not None or position < last:
+                    in_order = False
+                last = position
+                if key in INTERNED_FIELDS and value.__class__ is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        self.extra = extra
+        # The file's frontmatter key order, only kept when it isn't RECORD_FIELDS
+        # order followed by the other keys
+        self.order = None if in_order else tuple(sys.intern(key) for key in fields)
+        self.column = sys.intern(column)
+        # Only stored when it isn't "<id>.md"
+        self.file_name = None if file_name == f"{fields.get('id')}.md" else file_name
+        self.body_offset = body_offset
+        self.body = None
+
+    @property
+    def task_file(self):
+        """The task's file (a Path, or a StoredTaskFile with SQLite storage)"""
+        return STORAGE.task_file(self.column, self.file_name or f"{self.id}.md")
+
+    def load_body(self):
+        """Read and parse the markdown body (once); returns the body fields"""
+        if self.body is None:
+            self.body = read_task_body(self.task_file, self.body_offset)
+        return self.body
+
+    def get(self, key, default=None):
+        if key in _RECORD_FIELD_SET:
+            return getattr(self, key, default)
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        if key in _RECORD_FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if key in BODY_FIELDS:
+            body = self.load_body()
+            if key in body:
+                return body[key]
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in _RECORD_FIELD_SET:
+            if key == 'id' and self.file_name is None:
+                # Keep pointing at the same file
+                self.file_name = f"{self.id}.md"
+            if key in INTERNED_FIELDS and value.__class__ is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        elif key in BODY_FIELDS:
+            self.load_body()[key] = value
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _RECORD_FIELD_SET:
+            try:
+                if key == 'id' and self.file_name is None:
+                    self.file_name = f"{self.id}.md"
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif key in BODY_FIELDS and key in self.load_body():
+            del self.body[key]
+        elif self.extra and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    def __iter__(self):
+        # Same keys, in the same order, as load_task's dict: frontmatter keys in
+        # file order (a key also in the body keeps its frontmatter place), then
+        # the body's
+        body = self.load_body()
+        keys = [key for key in RECORD_FIELDS if hasattr(self, key)]
+        if self.extra:
+            keys.extend(self.extra)
+        if self.order is not None:
+            present = set(keys)
+            # Keys set after loading go last
+            keys = [key for key in self.order if key in present] + \
+                   [key for key in keys if key not in self.order]
+        yield from keys
+        yield from (key for key in body if key not in keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"<TaskRecord {self.column}/{self.file_name or str(self.get('id')) + '.md'}>"
+
+def read_task_body(task_file, offset=None):
+    """Body fields of a task file, as parse_markdown_task returns them
+
+    With the byte offset where the body starts (see read_frontmatter_block)
+    only the body is read; the whole file is read and parsed instead when the
+    offset is unknown or no longer lands just past the frontmatter.
+    """
+    if offset is not None:
+        with open(task_file, 'rb') as f:
+            f.seek(offset - 5)
+            data = f.read()
+        if data[:5] in (b'\n---\n', b'---\r\n'):
+            if TRACE:
+                TRACE.count(files_read=1, bytes_read=len(data))
+            text = data[5:].decode()
+            if '\r' in text:
+                # Universal newlines, as load_task reads the file
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            body = parse_task_body(text)
+            body['test_data'] = {'good_samples': [], 'bad_samples': []}
+            return body
+
+    task = load_task(task_file)
+    return {key: task[key] for key in BODY_FIELDS if key in task}
+
 def load_task(task_file):
-    """Load a task from Markdown file"""
-    with open(task_file, 'r') as f:
+    """Load a task from Markdown file (a Path, or a zipfile.Path into an archive pack)"""
+    with task_file.open('r') as f:
         content = f.read()
+    if TRACE:
+        TRACE.count(files_read=1, bytes_read=len(content))
     return parse_markdown_task(content)
 
 def save_task(task, column):
-    """Save task to column folder as Markdown"""
-    task_file = KANBAN_DIR / column / f"{task['id']}.md"
-    markdown = task_to_markdown(task)
-    with open(task_file, 'w') as f:
-        f.write(markdown)
-
-def get_all_tasks():
-    """Get all tasks organized by column"""
-    tasks = {}
-    for column in COLUMNS:
-        column_path = KANBAN_DIR / column
-        tasks[column] = []
+    """Save task to a column as Markdown (atomically, never leaves a partial task)"""
+    STORAGE.save_task(task, column)
 
-        if column_path.exists():
-            for task_file in sorted(column_path.glob('TASK-*.md')):
-                try:
-                    task = load_task(task_file)
-                    tasks[column].append(task)
-                except Exception as e:
-                    console.print(f"[yellow]Warning: Could not load {task_file.name}: {e}[/yellow]")
+def format_frontmatter_value(value):
+    """Format a value the way parse_frontmatter reads it back"""
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, list):
+        return f"[{', '.join(value)}]"
+    return str(value)
 
-    return tasks
+def patch_frontmatter(task_file, updates):
+    """Rewrite only the given frontmatter lines of a task file in place
+
+    Every other byte of the file (line endings, body, unknown sections, checkbox
+    state) is left untouched. Keys not yet present are appended to the block,
+    unless their value is None (an absent key already reads as null).
+    """
+    with open(task_file, 'r', newline='') as f:
+        text = f.read()
+    write_text_atomic(task_file, patch_frontmatter_text(text, updates), durable=True, newline='')
+
+def patch_frontmatter_text(text, updates):
+    """patch_frontmatter on task markdown text; returns the new text"""
+    lines = io.StringIO(text, newline='').readlines()
+
+    if not lines or lines[0].rstrip('\r\n') != '---':
+        raise ValueError("Invalid markdown format: missing frontmatter")
+    try:
+        end = next(i for i in range(1, len(lines)) if lines[i].rstrip('\r\n') == '---')
+    except StopIteration:
+        raise ValueError("Invalid markdown format: missing frontmatter")
+
+    eol = lines[0][3:] or '\n'
+    pending = dict(updates)
+    for i in range(1, end):
+        key = lines[i].split(':', 1)[0].strip()
+        if ':' in lines[i] and key in pending:
+            line_eol = lines[i][len(lines[i].rstrip('\r\n')):] or eol
+            lines[i] = f"{key}: {format_frontmatter_value(pending.pop(key))}{line_eol}"
+    lines[end:end] = [f"{key}: {format_frontmatter_value(value)}{eol}" for key, value in pending.items()
+                      if value is not None]
+    return ''.join(lines)
+
+def write_text_atomic(path, text, durable=False, newline=None):
+    """Write text to a temp file in the same directory, then rename it into place
+
+    Readers see either the old or the new file, never a truncated one. With
+    durable=True the data is fsynced before the rename so it survives a crash.
+    """
+    if TRACE:
+        TRACE.count(files_written=1, bytes_written=len(text))
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline=newline) as f:
+            f.write(text)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the existing (or default) permissions
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def write_json_atomic(path, data, **dump_kwargs):
+    """Write JSON to a temp file in the same directory, then rename it into place"""
+    write_text_atomic(path, json.dumps(data, **dump_kwargs))
+
+def load_task_cache():
+    """Load the parsed-task cache, or an empty one if missing, corrupt or outdated"""
+    try:
+        with open(TASK_CACHE_FILE, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cache, dict) or cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+def save_task_cache(entries):
+    """Save the parsed-task cache; failures only cost a re-parse next time"""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        write_json_atomic(TASK_CACHE_FILE, {'version': CACHE_VERSION, 'files': entries},
+                          separators=(',', ':'))
+    except OSError as e:
+        warn(f"Could not write task cache: {e}")
+
+def cache_entry(stat, fields, body):
+    """Task cache entry for a file read after `stat`
+
+    An entry read within RACY_MTIME_NS of the file's mtime gets no mtime, so
+    the next scan reads the file again instead of trusting a stamp that a
+    same-size edit in the same tick would not change.
+    """
+    mtime = stat.st_mtime_ns
+    if time.time_ns() - mtime < RACY_MTIME_NS:
+        mtime = None
+    return {'mtime': mtime, 'size': stat.st_size, 'fields': fields, 'body': body}
+
+def default_load_workers():
+    """Default loader thread count; loading is I/O bound, so exceed the core count"""
+    return min(32, (os.cpu_count() or 1) + 4)
+
+def list_column_files(column):
+    """List a column's task files in sorted order"""
+    column_path = KANBAN_DIR / column
+    if not column_path.exists():
+        return []
+    files = sorted(column_path.glob('TASK-*.md'))
+    if TRACE:
+        TRACE.count(files_scanned=len(files))
+    return files
+
+def get_all_tasks(workers=None):
+    """Get all tasks organized by column
+
+    Only the frontmatter of each file is read; tasks are compact TaskRecords
+    that read their body on demand. Frontmatter is cached in .kanban-cache/ keyed by
+    column/filename, mtime and size, so only files that changed since the last
+    run are read at all (see scan_board). With SQLite storage this is one
+    indexed query.
+    """
+    return STORAGE.get_all_tasks(workers)
+
+def scan_board(cache, workers=None):
+    """Stat every task file, reading frontmatter only where cache is out of date
+
+    cache maps "column/filename" to {mtime, size, fields, body (offset)}. A file moved between
+    columns outside the CLI keeps its mtime and size, so it is matched by
+    filename and reused. Returns (entries, tasks by column, dirty).
+
+    Directory listing, stat and frontmatter reads run on a thread pool of
+    `workers` threads (default: LOAD_WORKERS, else a core-count based value);
+    workers=1 loads serially. Column order and per-file warnings are unchanged.
+    """
+    if workers is None:
+        workers = LOAD_WORKERS or default_load_workers()
+
+    moved = {(key.split('/', 1)[-1], entry['mtime'], entry['size']): entry
+             for key, entry in cache.items()}
+
+    def load_entry(item):
+        column, task_file = item
+        key = f"{column}/{task_file.name}"
+        try:
+            stat = task_file.stat()
+            entry = cache.get(key)
+            if entry and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                return key, entry, False, None
+            entry = moved.get((task_file.name, stat.st_mtime_ns, stat.st_size))
+            if not entry:
+                entry = cache_entry(stat, *read_frontmatter_block(task_file))
+            return key, entry, True, None
+        except Exception as e:
+            return key, None, False, e
+
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            files = [(column, task_file)
+                     for column, column_files in zip(COLUMNS, pool.map(list_column_files, COLUMNS))
+                     for task_file in column_files]
+            # Hand out files in contiguous chunks to keep per-future overhead low
+            size = max(1, -(-len(files) // (workers * 4)))
+            chunks = [files[i:i + size] for i in range(0, len(files), size)]
+            results = [result
+                       for chunk_results in pool.map(lambda chunk: [load_entry(item) for item in chunk], chunks)
+                       for result in chunk_results]
+    else:
+        files = [(column, task_file) for column in COLUMNS for task_file in list_column_files(column)]
+        results = [load_entry(item) for item in files]
 
-def find_task(task_id):
-    """Find task and return (task, column)"""
+    tasks = {column: [] for column in COLUMNS}
+    entries = {}
+    dirty = False
+    for (column, task_file), (key, entry, changed, error) in zip(files, results):
+        dirty = dirty or changed
+        if error is not None:
+            warn(f"Could not load {task_file.name}: {error}")
+            continue
+        entries[key] = entry
+        tasks[column].append(TaskRecord(entry['fields'], column, task_file.name, entry['body']))
+
+    return entries, tasks, dirty or len(entries) != len(cache)
+
+def task_id_key(task_id):
+    """Sort key ordering IDs numerically, with subtasks right after their parent"""
+    match = re.match(r'^(\D*?)(\d+(?:\.\d+)*)$', task_id)
+    if not match:
+        return (task_id,)
+    return (match.group(1),) + tuple(int(part) for part in match.group(2).split('.'))
+
+def column_dir_stamps():
+    """Modification times of the column folders (change when files are added/removed)"""
+    stamps = {}
+    for column in COLUMNS:
+        try:
+            stamps[column] = (KANBAN_DIR / column).stat().st_mtime_ns
+        except FileNotFoundError:
+            stamps[column] = None
+    return stamps
+
+def build_id_index():
+    """Build the task ID -> column index from the column folders"""
+    index = {}
     for column in COLUMNS:
-        task_file = KANBAN_DIR / column / f"{task_id}.md"
-        if task_file.exists():
-            return load_task(task_file), column
-    return None, None
+        for task_file in list_column_files(column):
+            # Same precedence as a column-by-column search: first column wins
+            index.setdefault(task_file.stem, column)
+    return index
+
+def load_id_index():
+    """Load the ID index, rebuilding it if a column folder changed since it was saved"""
+    global _ID_INDEX
+    if _ID_INDEX is not None:
+        return _ID_INDEX
+
+    stamps = column_dir_stamps()
+    try:
+        with open(ID_INDEX_FILE, 'r') as f:
+            data = json.load(f)
+        if data.get('version') == CACHE_VERSION and data.get('dirs') == stamps:
+            _ID_INDEX = data['ids']
+            return _ID_INDEX
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+
+    _ID_INDEX = build_id_index()
+    save_id_index()
+    return _ID_INDEX
+
+def save_id_index():
+    """Save the ID index stamped with the current column folder mtimes"""
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        write_json_atomic(ID_INDEX_FILE, {
+            'version': CACHE_VERSION,
+            'dirs': column_dir_stamps(),
+            'ids': _ID_INDEX,
+        }, separators=(',', ':'))
+    except OSError as e:
+        warn(f"Could not write ID index: {e}")
+
+def index_task(task_id, column):
+    """Record a task's column in the ID index after a write (column=None removes it)
+
+    Re-reads the saved index under board_lock so concurrent writers don't drop
+    each other's entries.
+    """
+    global _ID_INDEX
+    if _defer_index_save:
+        if column is None:
+            _ID_INDEX.pop(task_id, None)
+        else:
+            _ID_INDEX[task_id] = column
+        return
+
+    with board_lock():
+        load_id_index()
+        try:
+            with open(ID_INDEX_FILE, 'r') as f:
+                _ID_INDEX = json.load(f)['ids']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        if column is None:
+            _ID_INDEX.pop(task_id, None)
+        else:
+            _ID_INDEX[task_id] = column
+        save_id_index()
+
+def locate_task(task_id):
+    """Return the column holding task_id, or None, using the ID index"""
+    return STORAGE.locate(task_id)
+
+def find_task_ids(prefix=None, start=None, end=None, index=None):
+    """List (id, column) pairs in ID order from the index, without scanning folders
+
+    prefix matches an ID and its subtasks (TASK-006 -> TASK-006, TASK-006.01, ...),
+    or, without a number, every ID starting with it (TASK- -> all tasks);
+    start/end bound the range inclusively. index defaults to the ID index.
+    """
+    if index is None:
+        index = STORAGE.id_index()
+    ordered = sorted((task_id_key(task_id), task_id) for task_id in index)
+    keys = [key for key, _ in ordered]
+
+    lo, hi = 0, len(ordered)
+    if prefix:
+        key = task_id_key(prefix)
+        lo = bisect.bisect_left(keys, key)
+        if len(key) > 1:
+            hi = bisect.bisect_left(keys, key[:-1] + (key[-1] + 1,))
+        else:
+            # Every key whose text starts with the prefix sorts below this one
+            hi = bisect.bisect_left(keys, (prefix + '\U0010ffff',))
+    if start:
+        lo = max(lo, bisect.bisect_left(keys, task_id_key(start)))
+    if end:
+        hi = min(hi, bisect.bisect_right(keys, task_id_key(end)))
+
+    return [(task_id, index[task_id]) for _, task_id in ordered[lo:hi]]
+
+def find_task(task_id, archived=False):
+    """Find task and return (task, column)
+
+    With archived, tasks moved into the archive packs are found too (column
+    "archive"); callers that modify the task must not pass it.
+    """
+    task, column = STORAGE.load_task(task_id)
+    if task is None and archived:
+        task = find_archived_task(task_id)
+        return (task, 'archive') if task else (None, None)
+    return task, column
 
 def generate_task_id():
     """Generate next task ID"""
-    metadata = load_metadata()
-    task_num = metadata['next_task_number']
-    task_id = f"TASK-{task_num:03d}"
-    metadata['next_task_number'] = task_num + 1
-    save_metadata(metadata)
-    return task_id
+    return reserve_task_ids(1)[0]
+
+def reserve_task_ids(count):
+    """Reserve `count` consecutive task IDs with a single locked metadata write"""
+    with board_lock():
+        first = STORAGE.reserve_ids(count)
+        journal_append('reserve', None, {'first': first, 'count': count})
+    return [f"TASK-{num:03d}" for num in range(first, first + count)]
 
 def get_color_for_priority(priority):
     """Get color code for priority"""
@@ -285,64 +927,505 @@ def get_color_for_type(task_type):
     }
     return colors.get(task_type, 'white')
 
-# CLI Commands
+# Storage Backends
+# Everything that reads or writes tasks and metadata goes through STORAGE:
+# MarkdownStorage (one file per task, the default) or SQLiteStorage (board.db,
+# used when that file exists; see convert-storage)
 
-@click.group()
-def cli():
-    """Kanban board management for TerrainIQ Dashcam Development"""
-    pass
+STORAGE_TYPES = ['markdown', 'sqlite']
+BOARD_DB_FILE = KANBAN_DIR / "board.db"
+BOARD_DB_VERSION = 1
 
-@cli.command()
-@click.option('--column', type=click.Choice(COLUMNS), help='Show specific column only')
-def show(column):
-    """Display the kanban board"""
-    metadata = load_metadata()
-    tasks = get_all_tasks()
-
-    columns_to_show = [column] if column else COLUMNS
-
-    for col in columns_to_show:
-        col_meta = metadata['columns'][col]
-        table = Table(title=f"\n{col_meta['name']} ({len(tasks[col])} tasks)",
-                     title_style="bold cyan")
-
-        table.add_column("ID", style="cyan", width=10)
-        table.add_column("Title", style="white", width=40)
-        table.add_column("Type", width=10)
-        table.add_column("Priority", width=10)
-        table.add_column("Assignee", width=12)
-
-        for task in tasks[col]:
-            type_color = get_color_for_type(task.get('type', 'feature'))
-            priority_color = get_color_for_priority(task.get('priority', 'medium'))
-            assignee_style = "green" if task.get('assignee') == 'agent' else "blue" if task.get('assignee') == 'human' else "dim"
-
-            table.add_row(
-                f"[cyan]{task['id']}[/cyan]",
-                task['title'][:38] + "..." if len(task['title']) > 40 else task['title'],
-                f"[{type_color}]{task.get('type', 'feature')}[/{type_color}]",
-                f"[{priority_color}]{task.get('priority', 'medium')}[/{priority_color}]",
-                f"[{assignee_style}]{task.get('assignee', 'unassigned')}[/{assignee_style}]"
-            )
-
-        if tasks[col]:
-            console.print(table)
-        else:
-            console.print(f"\n[dim]{col_meta['name']}: No tasks[/dim]")
+class MarkdownStorage:
+    """Tasks as markdown files in the column folders, metadata in board-metadata.json
 
-@cli.command()
-@click.option('--title', prompt='Task title', help='Task title')
-@click.option('--description', prompt='Description', help='Detailed description')
-@click.option('--type', type=click.Choice(['feature', 'bug', 'test', 'docs', 'refactor']),
-              prompt='Type', help='Task type')
-@click.option('--priority', type=click.Choice(['low', 'medium', 'high', 'critical']),
-              prompt='Priority', help='Task priority')
-@click.option('--assignee', type=click.Choice(['agent', 'human', 'unassigned']),
-              default='unassigned', help='Task assignee')
-@click.option('--use-case', default='', help='Related use case ID')
-def add(title, description, type, priority, assignee, use_case):
-    """Add new task to backlog"""
-    task_id = generate_task_id()
+    Lookups go through the ID index and listings through the frontmatter cache
+    in .kanban-cache/; the files themselves are the source of truth.
+    """
+
+    name = 'markdown'
+
+    def load_metadata(self):
+        if not METADATA_FILE.exists():
+            report_error("board-metadata.json not found!")
+            console.print("Run from the kanban directory or check installation")
+            raise click.Abort()
+
+        with open(METADATA_FILE, 'r') as f:
+            return json.load(f)
+
+    def save_metadata(self, metadata):
+        write_text_atomic(METADATA_FILE, json.dumps(metadata, indent=2), durable=True)
+
+    def reserve_ids(self, count):
+        """First of `count` newly reserved task numbers (callers hold board_lock)"""
+        # Load the ID index while the folder stamps still match, so the write
+        # that follows only updates it instead of forcing a rebuild
+        load_id_index()
+        metadata = self.load_metadata()
+        first = metadata['next_task_number']
+        metadata['next_task_number'] = first + count
+        self.save_metadata(metadata)
+        return first
+
+    def locate(self, task_id):
+        index = load_id_index()
+        column = index.get(task_id)
+        if column and (KANBAN_DIR / column / f"{task_id}.md").exists():
+            return column
+
+        # Index entry missing or wrong (e.g. another process wrote concurrently):
+        # probe the columns directly and repair the index
+        for column in COLUMNS:
+            if (KANBAN_DIR / column / f"{task_id}.md").exists():
+                index_task(task_id, column)
+                return column
+        if task_id in index:
+            index_task(task_id, None)
+        return None
+
+    def id_index(self):
+        return load_id_index()
+
+    def load_task(self, task_id):
+        column = self.locate(task_id)
+        if column is None:
+            return None, None
+        return load_task(KANBAN_DIR / column / f"{task_id}.md"), column
+
+    def get_all_tasks(self, workers=None):
+        cache = load_task_cache()
+        entries, tasks, dirty = scan_board(cache, workers)
+
+        # Files deleted outside the CLI simply drop out of the cache
+        if dirty or len(entries) != len(cache):
+            save_task_cache(entries)
+
+        return tasks
+
+    def add_task(self, task, column):
+        self.save_task(task, column)
+        index_task(task['id'], column)
+
+    def save_task(self, task, column):
+        task_file = KANBAN_DIR / column / f"{task['id']}.md"
+        task_file.parent.mkdir(exist_ok=True)
+        write_text_atomic(task_file, task_to_markdown(task), durable=True)
+
+    def move_task(self, task_id, column, updates):
+        current_column = self.locate(task_id)
+        if not current_column:
+            raise KanbanError(f"Task {task_id} not found")
+        if current_column == column:
+            return column
+
+        old_file = KANBAN_DIR / current_column / f"{task_id}.md"
+        new_file = KANBAN_DIR / column / f"{task_id}.md"
+        # Rename rather than re-render, so the body stays byte-for-byte identical.
+        # os.rename replaces an existing file on POSIX, so the check and the
+        # rename must not interleave with another move to the same column.
+        with board_lock():
+            if new_file.exists():
+                raise KanbanError(f"{column}/{task_id}.md already exists")
+            new_file.parent.mkdir(exist_ok=True)
+            try:
+                os.rename(old_file, new_file)
+            except FileNotFoundError:
+                # Moved or deleted concurrently
+                self.locate(task_id)
+                raise KanbanError(f"Task {task_id} not found")
+        patch_frontmatter(new_file, updates)
+        index_task(task_id, column)
+        return current_column
+
+    def patch_task(self, task_id, updates):
+        """Patch frontmatter fields in place; returns the task's column"""
+        column = self.locate(task_id)
+        if not column:
+            raise KanbanError(f"Task {task_id} not found")
+        try:
+            patch_frontmatter(KANBAN_DIR / column / f"{task_id}.md", updates)
+        except FileNotFoundError:
+            self.locate(task_id)
+            raise KanbanError(f"Task {task_id} not found")
+        return column
+
+    def delete_task(self, task_id):
+        column = self.locate(task_id)
+        if not column:
+            raise KanbanError(f"Task {task_id} not found")
+
+        try:
+            (KANBAN_DIR / column / f"{task_id}.md").unlink()
+        except FileNotFoundError:
+            self.locate(task_id)
+            raise KanbanError(f"Task {task_id} not found")
+        index_task(task_id, None)
+        return column
+
+    def stamps(self):
+        """Value that changes whenever tasks are added, removed or replaced"""
+        return column_dir_stamps()
+
+    def file_stamps(self):
+        """Yield ("column/filename", mtime, size) for every task"""
+        for column in COLUMNS:
+            # scandir rather than list_column_files: no Path objects, no sorting
+            try:
+                entries = list(os.scandir(KANBAN_DIR / column))
+            except FileNotFoundError:
+                continue
+            if TRACE:
+                TRACE.count(files_scanned=len(entries))
+            for entry in entries:
+                if not (entry.name.startswith('TASK-') and entry.name.endswith('.md')):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                yield f"{column}/{entry.name}", stat.st_mtime_ns, stat.st_size
+
+    def task_file(self, column, name):
+        return KANBAN_DIR / column / name
+
+    def column_files(self, column):
+        return list_column_files(column)
+
+class StoredTaskFile:
+    """Path-like handle to a task row in board.db, so load_task, read_frontmatter,
+    TaskRecord and the board index read it like a task file"""
+
+    def __init__(self, storage, column, name):
+        self.storage = storage
+        self.column = column
+        self.name = name
+        self.stem = name[:-3]
+
+    def row(self):
+        row = self.storage.connect().execute(
+            "SELECT revision, markdown FROM tasks WHERE id = ? AND col = ?", (self.stem, self.column)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{self.column}/{self.name} is not in {self.storage.path.name}")
+        return row
+
+    def open(self, mode='r'):
+        # Universal newlines, like open(): CRLF task files read the same way
+        return io.StringIO(self.row()[1], newline=None)
+
+    def stat(self):
+        revision, markdown = self.row()
+        return SimpleNamespace(st_mtime_ns=revision, st_size=len(markdown))
+
+    def __str__(self):
+        return f"{self.storage.path.name}:{self.column}/{self.name}"
+
+def frontmatter_fields(markdown):
+    """Parsed frontmatter of task markdown text (what read_frontmatter returns for a file)"""
+    parts = markdown.replace('\r\n', '\n').split('---\n', 2)
+    if len(parts) < 3 or parts[0]:
+        raise ValueError("Invalid markdown format: missing frontmatter")
+    return parse_frontmatter(parts[1])
+
+class SQLiteStorage:
+    """Tasks and metadata in a SQLite database (board.db)
+
+    Each task row keeps its exact markdown plus its frontmatter as JSON, with
+    an index on the column, so listings and lookups are indexed reads. Every
+    write is one IMMEDIATE transaction: moves and ID reservations are atomic
+    across processes. Each write bumps a board revision that stands in for
+    file mtimes in the caches and the board index.
+
+    With the markdown mirror on, the column folders and board-metadata.json
+    are rewritten inside the same transaction (the database stays the source
+    of truth), keeping the git-friendly view current.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+
+    def connect(self):
+        """This thread's connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode = WAL")
+            self.local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction taking the database write lock up front; yields (conn, revision)"""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("UPDATE board SET value = value + 1 WHERE name = 'revision'")
+            revision = int(conn.execute("SELECT value FROM board WHERE name = 'revision'").fetchone()[0])
+            yield conn, revision
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def create(self, metadata, mirror):
+        """Create the schema in an empty database"""
+        conn = self.connect()
+        conn.executescript(f"""
+            CREATE TABLE board (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE tasks (id TEXT PRIMARY KEY, col TEXT NOT NULL, revision INTEGER NOT NULL,
+                                fields TEXT NOT NULL, markdown TEXT NOT NULL);
+            CREATE INDEX tasks_col ON tasks (col, id);
+            PRAGMA user_version = {BOARD_DB_VERSION};
+        """)
+        conn.executemany("INSERT INTO board VALUES (?, ?)", [
+            ('metadata', json.dumps(metadata)),
+            ('revision', 0),
+            ('mirror', int(mirror)),
+        ])
+
+    def setting(self, conn, name):
+        return conn.execute("SELECT value FROM board WHERE name = ?", (name,)).fetchone()[0]
+
+    def mirrored(self, conn):
+        return self.setting(conn, 'mirror') == '1'
+
+    def load_metadata(self):
+        return json.loads(self.setting(self.connect(), 'metadata'))
+
+    def write_metadata(self, conn, metadata):
+        conn.execute("UPDATE board SET value = ? WHERE name = 'metadata'", (json.dumps(metadata),))
+        if self.mirrored(conn):
+            write_text_atomic(METADATA_FILE, json.dumps(metadata, indent=2), durable=True)
+
+    def save_metadata(self, metadata):
+        with self.transaction() as (conn, _):
+            self.write_metadata(conn, metadata)
+
+    def reserve_ids(self, count):
+        with self.transaction() as (conn, _):
+            metadata = json.loads(self.setting(conn, 'metadata'))
+            first = metadata['next_task_number']
+            metadata['next_task_number'] = first + count
+            self.write_metadata(conn, metadata)
+        return first
+
+    def locate(self, task_id):
+        row = self.connect().execute("SELECT col FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return row[0] if row else None
+
+    def id_index(self):
+        return dict(self.connect().execute("SELECT id, col FROM tasks"))
+
+    def load_task(self, task_id):
+        row = self.connect().execute("SELECT col, markdown FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        if row is None:
+            return None, None
+        return parse_markdown_task(row[1]), row[0]
+
+    def get_all_tasks(self, workers=None):
+        tasks = {column: [] for column in COLUMNS}
+        # Same order as the sorted column folders
+        for task_id, column, fields in self.connect().execute(
+                "SELECT id, col, fields FROM tasks ORDER BY col, id || '.md'"):
+            if column in tasks:
+                tasks[column].append(TaskRecord(json.loads(fields), column, f"{task_id}.md"))
+        return tasks
+
+    def write_row(self, conn, revision, task_id, column, markdown, old_column=None):
+        conn.execute("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)",
+                     (task_id, column, revision, json.dumps(frontmatter_fields(markdown), default=str), markdown))
+        if self.mirrored(conn):
+            task_file = KANBAN_DIR / column / f"{task_id}.md"
+            task_file.parent.mkdir(exist_ok=True)
+            write_text_atomic(task_file, markdown, durable=True, newline='')
+            if old_column and old_column != column:
+                (KANBAN_DIR / old_column / f"{task_id}.md").unlink(missing_ok=True)
+
+    def add_task(self, task, column):
+        with self.transaction() as (conn, revision):
+            if self.locate(task['id']):
+                raise KanbanError(f"Task {task['id']} already exists")
+            self.write_row(conn, revision, task['id'], column, task_to_markdown(task))
+
+    def add_rows(self, rows):
+        """Insert (task_id, column, markdown) rows in one transaction (used by convert-storage)"""
+        with self.transaction() as (conn, revision):
+            for task_id, column, markdown in rows:
+                self.write_row(conn, revision, task_id, column, markdown)
+
+    def save_task(self, task, column):
+        with self.transaction() as (conn, revision):
+            old_column = self.locate(task['id'])
+            self.write_row(conn, revision, task['id'], column, task_to_markdown(task), old_column)
+
+    def move_task(self, task_id, column, updates):
+        with self.transaction() as (conn, revision):
+            row = conn.execute("SELECT col, markdown FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                raise KanbanError(f"Task {task_id} not found")
+            current_column, markdown = row
+            if current_column != column:
+                self.write_row(conn, revision, task_id, column, patch_frontmatter_text(markdown, updates),
+                               current_column)
+        return current_column
+
+    def patch_task(self, task_id, updates):
+        with self.transaction() as (conn, revision):
+            row = conn.execute("SELECT col, markdown FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                raise KanbanError(f"Task {task_id} not found")
+            column, markdown = row
+            self.write_row(conn, revision, task_id, column, patch_frontmatter_text(markdown, updates), column)
+        return column
+
+    def delete_task(self, task_id):
+        with self.transaction() as (conn, _):
+            column = self.locate(task_id)
+            if not column:
+                raise KanbanError(f"Task {task_id} not found")
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+            if self.mirrored(conn):
+                (KANBAN_DIR / column / f"{task_id}.md").unlink(missing_ok=True)
+        return column
+
+    def stamps(self):
+        return {'revision': int(self.setting(self.connect(), 'revision'))}
+
+    def file_stamps(self):
+        for key, revision, size in self.connect().execute(
+                "SELECT col || '/' || id || '.md', revision, length(markdown) FROM tasks"):
+            yield key, revision, size
+
+    def task_file(self, column, name):
+        return StoredTaskFile(self, column, name)
+
+    def column_files(self, column):
+        return [StoredTaskFile(self, column, f"{task_id}.md") for (task_id,) in self.connect().execute(
+            "SELECT id FROM tasks WHERE col = ? ORDER BY id || '.md'", (column,))]
+
+    def rows(self):
+        """Yield (task_id, column, markdown) for every task"""
+        yield from self.connect().execute("SELECT id, col, markdown FROM tasks ORDER BY col, id")
+
+STORAGE = SQLiteStorage(BOARD_DB_FILE) if BOARD_DB_FILE.exists() else MarkdownStorage()
+
+def require_markdown_storage(command):
+    """Raise KanbanError for commands that work on the task files directly"""
+    if STORAGE.name != 'markdown':
+        raise KanbanError(f"{command} needs markdown storage (see convert-storage)")
+
+def convert_storage(target, mirror=True):
+    """Convert the board to `target` storage; returns the number of tasks converted
+
+    To sqlite: the task files and metadata are loaded into a new board.db,
+    which is only moved into place once complete. With mirror the files stay
+    as the markdown mirror, otherwise the converted files are removed. To
+    markdown: every task is written back to its column folder, then board.db
+    is removed.
+    """
+    global STORAGE
+    check_choice('storage', target, STORAGE_TYPES)
+    with board_lock():
+        if STORAGE.name == target:
+            raise KanbanError(f"Board already uses {target} storage")
+
+        if target == 'sqlite':
+            temp = BOARD_DB_FILE.with_name(f".{BOARD_DB_FILE.name}.tmp")
+            for path in [temp, Path(f"{temp}-wal"), Path(f"{temp}-shm")]:
+                path.unlink(missing_ok=True)
+            storage = SQLiteStorage(temp)
+            # The mirror is switched on after loading: it would rewrite the
+            # very files being converted
+            storage.create(STORAGE.load_metadata(), mirror=False)
+
+            ids = set()
+            rows = []
+            converted = []
+            for column in COLUMNS:
+                for task_file in list_column_files(column):
+                    with open(task_file, 'r', newline='') as f:
+                        markdown = f.read()
+                    if task_file.stem in ids:
+                        warn(f"Skipping {column}/{task_file.name}: {task_file.stem} is already in another column")
+                        continue
+                    try:
+                        frontmatter_fields(markdown)
+                    except ValueError as e:
+                        warn(f"Skipping {column}/{task_file.name}: {e}")
+                        continue
+                    ids.add(task_file.stem)
+                    rows.append((task_file.stem, column, markdown))
+                    converted.append(task_file)
+
+            storage.add_rows(rows)
+            storage.connect().execute("UPDATE board SET value = ? WHERE name = 'mirror'", (int(mirror),))
+            storage.close()
+            os.replace(temp, BOARD_DB_FILE)
+
+            if not mirror:
+                for task_file in converted:
+                    task_file.unlink()
+                METADATA_FILE.unlink(missing_ok=True)
+            STORAGE = SQLiteStorage(BOARD_DB_FILE)
+            return len(rows)
+
+        count = 0
+        for task_id, column, markdown in STORAGE.rows():
+            task_file = KANBAN_DIR / column / f"{task_id}.md"
+            task_file.parent.mkdir(exist_ok=True)
+            write_text_atomic(task_file, markdown, durable=True, newline='')
+            for other in COLUMNS:
+                if other != column:
+                    (KANBAN_DIR / other / f"{task_id}.md").unlink(missing_ok=True)
+            count += 1
+        write_text_atomic(METADATA_FILE, json.dumps(STORAGE.load_metadata(), indent=2), durable=True)
+        STORAGE.close()
+        for path in [BOARD_DB_FILE, Path(f"{BOARD_DB_FILE}-wal"), Path(f"{BOARD_DB_FILE}-shm")]:
+            path.unlink(missing_ok=True)
+        STORAGE = MarkdownStorage()
+        return count
+
+# Task Operations
+# Shared by the CLI commands and `batch`; they raise KanbanError instead of printing
+
+TASK_TYPES = ['feature', 'bug', 'test', 'docs', 'refactor']
+PRIORITIES = ['low', 'medium', 'high', 'critical']
+ASSIGNEES = ['agent', 'human', 'unassigned']
+
+class KanbanError(Exception):
+    """A task operation could not be applied"""
+
+def check_choice(name, value, choices):
+    """Raise KanbanError unless value is one of choices"""
+    if value not in choices:
+        raise KanbanError(f"Invalid {name} '{value}' (expected one of: {', '.join(choices)})")
+
+def check_reserved_id(task_id):
+    """Raise KanbanError unless task_id was reserved and is not in use"""
+    match = re.match(r'^TASK-(\d+)$', task_id)
+    if not match or int(match.group(1)) >= load_metadata()['next_task_number']:
+        raise KanbanError(f"{task_id} has not been reserved (see reserve-ids)")
+    if locate_task(task_id):
+        raise KanbanError(f"Task {task_id} already exists")
+
+def add_task(title, description='', type='feature', priority='medium', assignee='unassigned',
+             use_case='', task_id=None):
+    """Create a task in the backlog; task_id must already be reserved if given"""
+    check_choice('type', type, TASK_TYPES)
+    check_choice('priority', priority, PRIORITIES)
+    check_choice('assignee', assignee, ASSIGNEES)
+
+    if task_id is None:
+        task_id = generate_task_id()
     now = datetime.now().isoformat()
 
     task = {
@@ -366,81 +1449,3388 @@ def add(title, description, type, priority, assignee, use_case):
         "notes": []
     }
 
-    save_task(task, 'backlog')
-    console.print(f"[green]✓[/green] Created task [cyan]{task_id}[/cyan]: {title}")
-    console.print(f"[dim]Task added to backlog[/dim]")
-
-@cli.command()
-@click.argument('task_id')
-@click.argument('column', type=click.Choice(COLUMNS))
-def move(task_id, column):
-    """Move task to a different column"""
-    task, current_column = find_task(task_id)
-
-    if not task:
-        console.print(f"[red]Error: Task {task_id} not found[/red]")
-        return
+    STORAGE.add_task(task, 'backlog')
+    return {'id': task_id, 'title': title, 'column': 'backlog'}
 
-    if current_column == column:
-        console.print(f"[yellow]Task {task_id} is already in {column}[/yellow]")
-        return
+def move_task(task_id, column):
+    """Move a task to another column, patching only its timestamps"""
+    check_choice('column', column, COLUMNS)
 
     # Update task metadata
-    task['updated_at'] = datetime.now().isoformat()
+    now = datetime.now().isoformat()
+    updates = {'updated_at': now}
 
     # Mark as completed if moving to done
     if column == 'done':
-        task['completed_at'] = datetime.now().isoformat()
-        task['validation_status'] = 'passed'
+        updates['completed_at'] = now
+        updates['validation_status'] = 'passed'
 
-    # Remove from old location
-    old_file = KANBAN_DIR / current_column / f"{task_id}.md"
-    old_file.unlink()
-
-    # Save to new location
-    save_task(task, column)
+    # A manual move ends any claim lease (only tasks that hold one are touched)
+    updates.update(dict.fromkeys(LEASE_FIELDS))
 
-    console.print(f"[green]✓[/green] Moved [cyan]{task_id}[/cyan] from [yellow]{current_column}[/yellow] to [green]{column}[/green]")
+    current_column = STORAGE.move_task(task_id, column, updates)
+    return {'id': task_id, 'from': current_column, 'to': column, 'moved': current_column != column}
 
-@cli.command()
-@click.argument('task_id')
-@click.argument('assignee', type=click.Choice(['agent', 'human', 'unassigned']))
-def assign(task_id, assignee):
-    """Assign task to agent or human"""
+def assign_task(task_id, assignee):
+    """Assign a task to agent, human or unassigned"""
+    check_choice('assignee', assignee, ASSIGNEES)
     task, column = find_task(task_id)
 
     if not task:
-        console.print(f"[red]Error: Task {task_id} not found[/red]")
-        return
+        raise KanbanError(f"Task {task_id} not found")
 
     task['assignee'] = assignee
     task['updated_at'] = datetime.now().isoformat()
 
     save_task(task, column)
+    return {'id': task_id, 'assignee': assignee, 'column': column}
 
-    assignee_color = "green" if assignee == 'agent' else "blue" if assignee == 'human' else "dim"
-    console.print(f"[green]✓[/green] Assigned [cyan]{task_id}[/cyan] to [{assignee_color}]{assignee}[/{assignee_color}]")
-
-@cli.command()
-@click.argument('task_id')
-def details(task_id):
-    """Show detailed task information"""
+def update_task(task_id, title=None, description=None, priority=None, type=None,
+                add_note=None, add_tag=None):
+    """Update task fields; returns the list of changes applied"""
+    if priority:
+        check_choice('priority', priority, PRIORITIES)
+    if type:
+        check_choice('type', type, TASK_TYPES)
     task, column = find_task(task_id)
 
     if not task:
-        console.print(f"[red]Error: Task {task_id} not found[/red]")
-        return
+        raise KanbanError(f"Task {task_id} not found")
 
-    metadata = load_metadata()
-    col_name = metadata['columns'][column]['name']
+    changes = []
+    skipped = []
 
-    console.print()
-    console.print(f"[bold cyan]{'='*70}[/bold cyan]")
-    console.print(f"[bold]Task Details: {task['id']}[/bold]")
-    console.print(f"[bold cyan]{'='*70}[/bold cyan]")
-    console.print()
+    if title:
+        task['title'] = title
+        changes.append('title')
 
-    console.print(f"[bold]Title:[/bold] {task['title']}")
+    if description:
+        task['description'] = description
+        changes.append('description')
+
+    if priority:
+        task['priority'] = priority
+        changes.append('priority')
+
+    if type:
+        task['type'] = type
+        changes.append('type')
+
+    if add_note:
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+        note_with_time = f"[{timestamp}] {add_note}"
+        if 'notes' not in task:
+            task['notes'] = []
+        task['notes'].append(note_with_time)
+        changes.append('note')
+
+    if add_tag:
+        tags = task.get('tags', [])
+        if isinstance(tags, str):
+            tags = [t.strip() for t in tags.split(',') if t.strip()]
+        if add_tag not in tags:
+            tags.append(add_tag)
+            task['tags'] = tags
+            changes.append('tag')
+        else:
+            skipped.append('tag')
+
+    if changes:
+        task['updated_at'] = datetime.now().isoformat()
+        save_task(task, column)
+
+    return {'id': task_id, 'column': column, 'changes': changes, 'skipped': skipped}
+
+def delete_task(task_id):
+    """Delete a task permanently"""
+    column = STORAGE.delete_task(task_id)
+    return {'id': task_id, 'column': column}
+
+# Claim leases: `claim` moves a ready task to in_progress under a lease that
+# expires unless renewed; expired tasks go back to ready on the next claim
+DEFAULT_LEASE_TTL = 1800
+
+def default_lease_owner():
+    """Lease holder when none is given: $KANBAN_AGENT, else user@host"""
+    import getpass
+    import socket
+
+    return os.environ.get('KANBAN_AGENT') or f"{getpass.getuser()}@{socket.gethostname()}"
+
+def lease_expiry(ttl):
+    if ttl <= 0:
+        raise KanbanError("ttl must be a positive number of seconds")
+    return (datetime.now() + timedelta(seconds=ttl)).isoformat(timespec='seconds')
+
+def check_lease(task_id, owner=None):
+    """Frontmatter of a claimed task; KanbanError unless owner (None = anyone) holds its lease"""
+    column = locate_task(task_id)
+    if not column:
+        raise KanbanError(f"Task {task_id} not found")
+    fields = read_frontmatter(STORAGE.task_file(column, f"{task_id}.md"))
+    if column != 'in_progress' or not fields.get('lease_owner'):
+        raise KanbanError(f"Task {task_id} is not claimed")
+    if owner and fields['lease_owner'] != owner:
+        raise KanbanError(f"Task {task_id} is claimed by {fields['lease_owner']}")
+    return fields
+
+def requeue_task(task_id, owner, expired=False):
+    """Put a claimed task back in ready, unassigned and without a lease"""
+    updates = dict.fromkeys(LEASE_FIELDS)
+    updates.update(assignee='unassigned', updated_at=datetime.now().isoformat())
+    STORAGE.move_task(task_id, 'ready', updates)
+    return {'id': task_id, 'from': 'in_progress', 'to': 'ready', 'assignee': 'unassigned',
+            'owner': owner, 'expired': expired}
+
+def claim_task(owner=None, ttl=DEFAULT_LEASE_TTL, type=None, tags=None):
+    """Lease the most urgent unassigned ready task to owner and move it to in_progress
+
+    Candidates come from the board index's priority-ordered queue (priority,
+    then oldest first), optionally limited to the given type(s) and to tasks
+    carrying every given tag. Runs under board_lock, so concurrent claimers
+    never get the same task; expired leases are returned to ready first.
+    """
+    owner = owner or default_lease_owner()
+    types = [type] if isinstance(type, str) else list(type or [])
+    tags = [tags] if isinstance(tags, str) else list(tags or [])
+    for value in types:
+        check_choice('type', value, TASK_TYPES)
+    expires = lease_expiry(ttl)
+
+    with board_lock():
+        conn = open_board_index()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE name = 'dirs'").fetchone()
+            if not row or json.loads(row[0]) != STORAGE.stamps():
+                sync_board_index(conn)
+            for released in expire_leases(conn):
+                publish_change('release', {'task_id': released['id']}, released)
+            candidate = next_queued_task(conn, types, tags)
+            if not candidate:
+                raise KanbanError("No unassigned task in ready to claim"
+                                  + (" (with the given type/tags)" if types or tags else ''))
+            task_id, title, priority, task_type = candidate
+
+            STORAGE.move_task(task_id, 'in_progress', {
+                'assignee': 'agent', 'lease_owner': owner, 'lease_expires_at': expires,
+                'updated_at': datetime.now().isoformat(),
+            })
+            # Index the move before the next claimer gets the lock; the index was
+            # current as of the check above, under the same lock
+            with conn:
+                sync_index_keys(conn, [f"ready/{task_id}.md", f"in_progress/{task_id}.md"])
+                save_index_stamps(conn, STORAGE.stamps())
+        finally:
+            conn.close()
+
+    return {'id': task_id, 'title': title, 'priority': priority, 'type': task_type, 'from': 'ready',
+            'to': 'in_progress', 'assignee': 'agent', 'owner': owner, 'lease_expires_at': expires}
+
+def next_queued_task(conn, types, tags):
+    """(id, title, priority, type) of the first unassigned ready task in claim order, or None
+
+    Walks the docs_queue index; a candidate whose file changed since it was
+    indexed (edited outside the CLI) is re-indexed and the walk repeated.
+    """
+    sql = "SELECT key, id, title, priority, type, mtime, size FROM docs WHERE col = 'ready' AND assignee = 'unassigned'"
+    params = []
+    if types:
+        sql += f" AND type IN ({', '.join('?' * len(types))})"
+        params.extend(types)
+    for tag in tags:
+        sql += " AND key IN (SELECT key FROM tags WHERE tag = ?)"
+        params.append(tag)
+    sql += f" ORDER BY {PRIORITY_RANK_SQL}, created_at, id LIMIT 1"
+
+    while True:
+        row = conn.execute(sql, params).fetchone()
+        if not row:
+            return None
+        key, task_id, title, priority, task_type, mtime, size = row
+        try:
+            stat = STORAGE.task_file('ready', key.split('/', 1)[1]).stat()
+            if (stat.st_mtime_ns, stat.st_size) == (mtime, size):
+                return task_id, title, priority, task_type
+        except FileNotFoundError:
+            pass
+        with conn:
+            sync_index_keys(conn, [key])
+
+def expire_leases(conn):
+    """Return in_progress tasks whose lease has run out to ready; returns requeue results"""
+    now = datetime.now().isoformat(timespec='seconds')
+    released = []
+    rows = conn.execute("SELECT key, id FROM docs WHERE col = 'in_progress' AND lease_expires_at < ?",
+                        (now,)).fetchall()
+    for key, task_id in rows:
+        try:
+            fields = read_frontmatter(STORAGE.task_file('in_progress', key.split('/', 1)[1]))
+        except FileNotFoundError:
+            fields = {}
+        # Renewed or released since it was indexed?
+        if fields.get('lease_owner') and (fields.get('lease_expires_at') or now) < now:
+            released.append(requeue_task(task_id, fields['lease_owner'], expired=True))
+        with conn:
+            sync_index_keys(conn, [key, f"ready/{task_id}.md"])
+    return released
+
+def renew_lease(task_id, owner=None, ttl=DEFAULT_LEASE_TTL):
+    """Extend owner's lease on a claimed task to ttl seconds from now
+
+    A lease that ran out but has not been requeued yet can still be renewed.
+    """
+    owner = owner or default_lease_owner()
+    expires = lease_expiry(ttl)
+    with board_lock():
+        check_lease(task_id, owner)
+        STORAGE.patch_task(task_id, {'lease_expires_at': expires})
+    return {'id': task_id, 'column': 'in_progress', 'owner': owner, 'lease_expires_at': expires}
+
+def release_task(task_id, owner=None, force=False):
+    """Give a claimed task back: ready, unassigned, no lease (force: whoever holds it)"""
+    owner = owner or default_lease_owner()
+    with board_lock():
+        fields = check_lease(task_id, None if force else owner)
+        return requeue_task(task_id, fields['lease_owner'])
+
+# Operation name -> (function, accepted fields) for batch input
+OPERATIONS = {
+    'add': (add_task, {'title', 'description', 'type', 'priority', 'assignee', 'use_case', 'id'}),
+    'move': (move_task, {'id', 'column'}),
+    'assign': (assign_task, {'id', 'assignee'}),
+    'update': (update_task, {'id', 'title', 'description', 'priority', 'type', 'add_note', 'add_tag'}),
+    'delete': (delete_task, {'id'}),
+    'claim': (claim_task, {'owner', 'ttl', 'type', 'tags'}),
+    'renew': (renew_lease, {'id', 'owner', 'ttl'}),
+    'release': (release_task, {'id', 'owner', 'force'}),
+}
+
+def apply_operation(operation, reserved_ids=None):
+    """Apply one batch operation dict such as {"op": "move", "id": ..., "column": ...}
+
+    Adds without an explicit id take the next ID from reserved_ids when given.
+    """
+    if not isinstance(operation, dict):
+        raise KanbanError("Operation must be a JSON object")
+    fields = dict(operation)
+    name = fields.pop('op', None)
+    if name not in OPERATIONS:
+        raise KanbanError(f"Unknown op '{name}' (expected one of: {', '.join(OPERATIONS)})")
+
+    function, accepted = OPERATIONS[name]
+    unknown = set(fields) - accepted
+    if unknown:
+        raise KanbanError(f"Unknown field(s) for {name}: {', '.join(sorted(unknown))}")
+
+    if name == 'add':
+        if 'title' not in fields:
+            raise KanbanError("add requires a title")
+        if 'id' in fields:
+            check_reserved_id(fields['id'])
+        elif reserved_ids is not None:
+            fields['id'] = next(reserved_ids)
+        fields['task_id'] = fields.pop('id', None)
+    elif name != 'claim':
+        if 'id' not in fields:
+            raise KanbanError(f"{name} requires an id")
+        fields['task_id'] = fields.pop('id')
+        if name == 'move' and 'column' not in fields:
+            raise KanbanError("move requires a column")
+        if name == 'assign' and 'assignee' not in fields:
+            raise KanbanError("assign requires an assignee")
+
+    global _stamps_before_write
+    _stamps_before_write = STORAGE.stamps() if INDEX_DB_FILE.exists() else None
+    result = function(**fields)
+    publish_change(name, fields, result)
+    return result
+
+# Functions called as hook(op, fields, result) after every successful operation
+# (fields are the operation's arguments), keeping derived data (board index,
+# journal, ...) current; register with @on_task_change
+CHANGE_HOOKS = []
+
+def on_task_change(hook):
+    """Register a hook to run after each task operation (add, move, ..., claim, release)"""
+    CHANGE_HOOKS.append(hook)
+    return hook
+
+def publish_change(op, fields, result):
+    """Run the change hooks; a failing hook only warns, the operation already happened"""
+    for hook in CHANGE_HOOKS:
+        try:
+            hook(op, fields, result)
+        except Exception as e:
+            warn(f"{hook.__name__} failed after {op} {result.get('id')}: {e}")
+
+@contextmanager
+def deferred_index_writes():
+    """Hold board_lock and save the ID index once at the end instead of per operation"""
+    global _defer_index_save
+    with board_lock():
+        load_id_index()
+        _defer_index_save = True
+        try:
+            yield
+        finally:
+            _defer_index_save = False
+            save_id_index()
+            flush_mqtt_events()
+
+# Board Queries
+# Structured results behind show/details/stats, rendered as rich tables or JSON
+
+SUMMARY_FIELDS = ['id', 'title', 'type', 'priority', 'assignee', 'validation_status',
+                  'created_at', 'updated_at', 'completed_at', 'tags']
+
+def task_summary(task, column):
+    """Frontmatter-only view of a task (never loads a TaskRecord body)"""
+    summary = {field: task.get(field) for field in SUMMARY_FIELDS}
+    summary['column'] = column
+    return summary
+
+def board_view(tasks, metadata, column=None):
+    """Board for show: {column: {name, tasks: [summary, ...]}}"""
+    return {
+        col: {
+            'name': metadata['columns'][col]['name'],
+            'tasks': [task_summary(task, col) for task in tasks[col]],
+        }
+        for col in ([column] if column else COLUMNS)
+    }
+
+def task_details(task, column, metadata):
+    """Everything details shows, except the raw markdown"""
+    result = {key: value for key, value in task.items() if key != '_markdown'}
+    result['column'] = column
+    result['column_name'] = metadata['columns'][column]['name'] if column in COLUMNS else 'Archived'
+    return result
+
+def count_cells(tasks, columns=COLUMNS):
+    """Count tasks by (column, assignee, priority, type) in one pass"""
+    counts = {}
+    for col in columns:
+        for t in tasks[col]:
+            cell = (col, t.get('assignee') or 'unassigned', t.get('priority') or '', t.get('type') or '')
+            counts[cell] = counts.get(cell, 0) + 1
+    return counts
+
+def stats_from_counts(counts, metadata):
+    """Per-column assignee counts, totals and the priority breakdown for stats
+
+    counts maps (column, assignee, priority, type) to a task count, so the
+    cost depends on the number of distinct cells, not on the number of tasks.
+    """
+    columns = {
+        col: {'name': metadata['columns'][col]['name'], 'count': 0, 'agent': 0, 'human': 0, 'unassigned': 0}
+        for col in COLUMNS
+    }
+    total = {'count': 0, 'agent': 0, 'human': 0, 'unassigned': 0}
+    priorities = {priority: 0 for priority in ['critical', 'high', 'medium', 'low']}
+
+    for (col, assignee, priority, _type), count in counts.items():
+        if col not in columns or not count:
+            continue
+        columns[col]['count'] += count
+        total['count'] += count
+        if assignee in total:
+            columns[col][assignee] += count
+            total[assignee] += count
+        if priority in priorities:
+            priorities[priority] += count
+
+    return {'columns': columns, 'total': total, 'priorities': priorities}
+
+def board_stats(tasks, metadata):
+    """stats result for tasks by column"""
+    return stats_from_counts(count_cells(tasks), metadata)
+
+# Board Index
+# SQLite database in .kanban-cache/index.db holding secondary indexes on the
+# frontmatter fields and a full-text inverted index; synced incrementally
+
+INDEX_DB_FILE = CACHE_DIR / "index.db"
+INDEX_SCHEMA_VERSION = 3
+
+# Frontmatter fields stored (and indexed) per task file
+INDEXED_FIELDS = ['id', 'title', 'type', 'priority', 'assignee', 'validation_status',
+                  'use_case', 'created_at', 'updated_at', 'completed_at', *LEASE_FIELDS]
+
+# Claim order: most urgent first (docs_queue indexes this exact expression)
+PRIORITY_RANK_SQL = ("CASE priority " + ' '.join(f"WHEN '{priority}' THEN {rank}" for rank, priority in
+                                                 enumerate(reversed(PRIORITIES))) + f" ELSE {len(PRIORITIES)} END")
+
+# Full-text fields and their ranking weights
+SEARCH_FIELDS = {
+    'title': 3.0,
+    'tags': 2.5,
+    'description': 1.5,
+    'use_case': 1.0,
+    'acceptance_criteria': 1.0,
+    'notes': 1.0,
+}
+
+def tokenize(text):
+    """Lowercase alphanumeric terms of text"""
+    return re.findall(r'[a-z0-9]+', text.lower())
+
+def open_board_index(path=None):
+    """Open the board index database, creating it (or resetting an outdated one)
+
+    path selects another database with the same schema (the archive index).
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    conn = sqlite3.connect(path or INDEX_DB_FILE, timeout=30)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+        conn.executescript(f"""
+            DROP TABLE IF EXISTS docs;
+            DROP TABLE IF EXISTS tags;
+            DROP TABLE IF EXISTS postings;
+            DROP TABLE IF EXISTS cells;
+            DROP TABLE IF EXISTS meta;
+            CREATE TABLE docs (key TEXT PRIMARY KEY, col TEXT, mtime INTEGER, size INTEGER,
+                               length INTEGER, {', '.join(f'{field} TEXT' for field in INDEXED_FIELDS)});
+            CREATE TABLE tags (key TEXT, tag TEXT);
+            CREATE TABLE postings (term TEXT, key TEXT, field TEXT, tf INTEGER);
+            CREATE INDEX docs_col ON docs (col);
+            CREATE INDEX docs_id ON docs (id);
+            CREATE INDEX docs_type ON docs (type);
+            CREATE INDEX docs_priority ON docs (priority);
+            CREATE INDEX docs_assignee ON docs (assignee);
+            -- The claim queue (see claim_task) and lease expiry
+            CREATE INDEX docs_queue ON docs (col, assignee, {PRIORITY_RANK_SQL}, created_at, id);
+            CREATE INDEX docs_lease ON docs (col, lease_expires_at);
+            CREATE INDEX tags_tag ON tags (tag);
+            CREATE INDEX tags_key ON tags (key);
+            CREATE INDEX postings_term ON postings (term);
+            CREATE INDEX postings_key ON postings (key);
+
+            -- Materialized column x assignee x priority x type counts, kept
+            -- current by triggers as docs rows come and go
+            CREATE TABLE cells (col TEXT, assignee TEXT, priority TEXT, type TEXT, count INTEGER,
+                                PRIMARY KEY (col, assignee, priority, type));
+            CREATE TRIGGER docs_count_insert AFTER INSERT ON docs BEGIN
+                INSERT INTO cells VALUES (NEW.col, coalesce(NEW.assignee, ''), coalesce(NEW.priority, ''),
+                                          coalesce(NEW.type, ''), 1)
+                ON CONFLICT (col, assignee, priority, type) DO UPDATE SET count = count + 1;
+            END;
+            CREATE TRIGGER docs_count_delete AFTER DELETE ON docs BEGIN
+                UPDATE cells SET count = count - 1
+                WHERE col = OLD.col AND assignee = coalesce(OLD.assignee, '')
+                  AND priority = coalesce(OLD.priority, '') AND type = coalesce(OLD.type, '');
+            END;
+
+            -- Column folder mtimes as of the last full sync (see check_board_index)
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT);
+            PRAGMA user_version = {INDEX_SCHEMA_VERSION};
+        """)
+    conn.execute("PRAGMA journal_mode = WAL")
+    return conn
+
+def index_task_file(conn, column, task_file):
+    """(Re)index one task file"""
+    stat = task_file.stat()
+    index_task_record(conn, f"{column}/{task_file.name}", column, load_task(task_file),
+                      stat.st_mtime_ns, stat.st_size, task_file.stem)
+
+def index_task_record(conn, key, column, task, mtime, size, default_id):
+    """(Re)index one parsed task under key"""
+    counts = {}
+    length = 0
+    for field in SEARCH_FIELDS:
+        value = task.get(field) or ''
+        if isinstance(value, list):
+            value = ' '.join(str(item) for item in value)
+        for term in tokenize(str(value)):
+            counts[(term, field)] = counts.get((term, field), 0) + 1
+            length += 1
+
+    tags = task.get('tags') or []
+
+    remove_indexed_file(conn, key)
+    conn.execute(f"INSERT INTO docs VALUES ({', '.join('?' * (5 + len(INDEXED_FIELDS)))})",
+                 [key, column, mtime, size, length] + indexed_values(task, default_id))
+    conn.executemany("INSERT INTO tags VALUES (?, ?)",
+                     [(key, str(tag)) for tag in (tags if isinstance(tags, list) else [tags])])
+    conn.executemany("INSERT INTO postings VALUES (?, ?, ?, ?)",
+                     [(term, key, field, tf) for (term, field), tf in counts.items()])
+
+def indexed_values(task, default_id):
+    """A task's INDEXED_FIELDS values as stored in its docs row"""
+    values = {field: task.get(field) for field in INDEXED_FIELDS}
+    values['id'] = values['id'] or default_id
+    values['assignee'] = values['assignee'] or 'unassigned'
+    return [None if values[field] is None else str(values[field]) for field in INDEXED_FIELDS]
+
+def remove_indexed_file(conn, key):
+    """Drop one task file from the index"""
+    conn.execute("DELETE FROM postings WHERE key = ?", (key,))
+    conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+    conn.execute("DELETE FROM docs WHERE key = ?", (key,))
+
+def sync_index_keys(conn, keys):
+    """Re-index or drop the given "column/filename" keys to match the files on disk"""
+    for key in keys:
+        column, name = key.split('/', 1)
+        try:
+            index_task_file(conn, column, STORAGE.task_file(column, name))
+        except FileNotFoundError:
+            remove_indexed_file(conn, key)
+        except Exception as e:
+            warn(f"Could not index {name}: {e}")
+            remove_indexed_file(conn, key)
+
+def sync_board_index(conn):
+    """Bring the index up to date with the board, re-reading only changed tasks"""
+    stamps = STORAGE.stamps()
+    known = {key: (mtime, size) for key, mtime, size in conn.execute("SELECT key, mtime, size FROM docs")}
+    changed = []
+    seen = set()
+    for key, mtime, size in STORAGE.file_stamps():
+        seen.add(key)
+        if known.get(key) != (mtime, size):
+            changed.append(key)
+
+    with conn:
+        sync_index_keys(conn, changed)
+        for key in set(known) - seen:
+            remove_indexed_file(conn, key)
+        save_index_stamps(conn, stamps)
+    return len(changed)
+
+def save_index_stamps(conn, stamps):
+    """Record the column folder mtimes the index is known to be current with"""
+    conn.execute("INSERT OR REPLACE INTO meta VALUES ('dirs', ?)", (json.dumps(stamps),))
+
+@on_task_change
+def update_board_index(op, fields, result):
+    """Keep an existing board index current after CLI writes
+
+    Only the written task is re-indexed. The column folder stamps are moved
+    forward only when they matched the stamps taken just before the write, i.e.
+    the index was current then; otherwise files added, removed or replaced
+    outside the CLI since the last sync would be marked as indexed, so the
+    stamps are left for the next read to notice and sync.
+    """
+    if not INDEX_DB_FILE.exists():
+        return
+    conn = open_board_index()
+    try:
+        with conn:
+            sync_index_keys(conn, [f"{column}/{result['id']}.md" for column in COLUMNS])
+            row = conn.execute("SELECT value FROM meta WHERE name = 'dirs'").fetchone()
+            if _stamps_before_write is not None and row and json.loads(row[0]) == _stamps_before_write:
+                save_index_stamps(conn, STORAGE.stamps())
+    finally:
+        conn.close()
+
+def board_counts(resync=False):
+    """Materialized (column, assignee, priority, type) -> count from the board index
+
+    Write commands keep the counts current through update_board_index. A full
+    (incremental) sync only runs when a column folder's mtime shows files were
+    added, removed or replaced outside the CLI, so this is normally a read of a
+    few hundred rows whatever the board size. Files edited in place leave the
+    folder mtimes alone; resync forces the sync (a stat pass) to catch them.
+    """
+    conn = open_board_index()
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE name = 'dirs'").fetchone()
+        if resync or not row or json.loads(row[0]) != STORAGE.stamps():
+            sync_board_index(conn)
+        return {(col, assignee, priority, type): count for col, assignee, priority, type, count in
+                conn.execute("SELECT col, assignee, priority, type, count FROM cells WHERE count > 0")}
+    finally:
+        conn.close()
+
+def select_in_chunks(conn, sql, keys, size=500):
+    """Run sql (with a {keys} placeholder list) over keys in chunks"""
+    for i in range(0, len(keys), size):
+        chunk = keys[i:i + size]
+        yield from conn.execute(sql.format(keys=', '.join('?' * len(chunk))), chunk)
+
+def search_tasks(query, column=None, limit=20, match_any=False, archived=False):
+    """Rank tasks matching query (BM25 over weighted fields)
+
+    Every term must match unless match_any; a trailing * makes a term a prefix.
+    archived also searches the archive packs (column "archive").
+    Returns [{id, column, title, score, fields: {field: [matched terms]}}].
+    """
+    terms = []
+    for word in query.lower().split():
+        prefix = word.endswith('*')
+        terms.extend((token, prefix) for token in tokenize(word))
+    terms = list(dict.fromkeys(terms))
+    if not terms:
+        return []
+
+    sources = [(None, sync_board_index)]
+    if archived:
+        sources.append((ARCHIVE_INDEX_DB_FILE, sync_archive_index))
+
+    results = []
+    for path, sync in sources:
+        conn = open_board_index(path)
+        try:
+            sync(conn)
+            results.extend(rank_documents(conn, terms, match_any))
+        finally:
+            conn.close()
+
+    if column:
+        results = [result for result in results if result['column'] == column]
+    results.sort(key=lambda result: (-result['score'], task_id_key(result['id'])))
+    return results[:limit] if limit else results
+
+def rank_documents(conn, terms, match_any):
+    """Score the documents of one index against parsed (term, prefix) pairs"""
+    doc_count, total_length = conn.execute("SELECT COUNT(*), SUM(length) FROM docs").fetchone()
+    if not doc_count:
+        return []
+    avg_length = (total_length or 1) / doc_count
+    lengths = {}
+    k1, b = 1.2, 0.75
+
+    scores = {}
+    matched = {}
+    hits = {}
+    for term, prefix in terms:
+        if prefix:
+            rows = conn.execute("SELECT key, field, tf, term FROM postings WHERE term >= ? AND term < ?",
+                                (term, term + '\uffff'))
+        else:
+            rows = conn.execute("SELECT key, field, tf, term FROM postings WHERE term = ?", (term,))
+
+        weighted = {}
+        for key, field, tf, found in rows:
+            weighted[key] = weighted.get(key, 0.0) + SEARCH_FIELDS.get(field, 1.0) * tf
+            hits.setdefault(key, {}).setdefault(field, set()).add(found)
+
+        missing = [key for key in weighted if key not in lengths]
+        lengths.update(select_in_chunks(conn, "SELECT key, length FROM docs WHERE key IN ({keys})", missing))
+
+        idf = math.log(1 + (doc_count - len(weighted) + 0.5) / (len(weighted) + 0.5))
+        for key, tf in weighted.items():
+            norm = k1 * (1 - b + b * lengths.get(key, avg_length) / avg_length)
+            scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+            matched[key] = matched.get(key, 0) + 1
+
+    keys = [key for key in scores if match_any or matched[key] == len(terms)]
+    return [
+        {
+            'id': task_id,
+            'column': col,
+            'title': title,
+            'score': round(scores[key], 4),
+            'fields': {field: sorted(found) for field, found in sorted(hits[key].items())},
+        }
+        for key, task_id, col, title in
+        select_in_chunks(conn, "SELECT key, id, col, title FROM docs WHERE key IN ({keys})", keys)
+    ]
+
+# Query Expressions
+# e.g. `priority>=high and assignee=agent and tag:mqtt and column!=done`
+# Parsed once into a tree that compiles to SQL over the board index (CLI) or
+# to a predicate over in-memory tasks (daemon)
+
+QUERY_FIELDS = ['column', 'tag'] + INDEXED_FIELDS
+
+# Fields whose values are ordered choices; <, >= etc. follow this order
+ORDERED_FIELDS = {
+    'column': COLUMNS,
+    'priority': PRIORITIES,
+}
+CHOICE_FIELDS = dict(ORDERED_FIELDS, type=TASK_TYPES, assignee=ASSIGNEES)
+
+QUERY_TOKEN = re.compile(r'\s*(?:(\()|(\))|(!=|>=|<=|=|<|>|~|:)|"([^"]*)"|\'([^\']*)\'|([^\s()=!<>~:"\']+))')
+
+def tokenize_query(expression):
+    """Split a query expression into (kind, text) tokens"""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = QUERY_TOKEN.match(expression, position)
+        if not match:
+            raise KanbanError(f"Unexpected character in query at {position + 1}: "
+                              f"{expression[position:].strip()[:10]!r}")
+        position = match.end()
+        lparen, rparen, op, double, single, word = match.groups()
+        if lparen or rparen:
+            tokens.append(('paren', lparen or rparen))
+        elif op:
+            tokens.append(('op', op))
+        elif word and word.lower() in ('and', 'or', 'not'):
+            tokens.append(('keyword', word.lower()))
+        else:
+            tokens.append(('value', word if word is not None else double if double is not None else single))
+    return tokens
+
+def parse_query(expression):
+    """Parse a query expression into a tree of tuples
+
+    ('and', left, right) | ('or', left, right) | ('not', node) | ('cmp', field, op, value)
+    Comparisons: field=value, !=, <, <=, >, >=, ~ (case-insensitive substring);
+    tag:value is shorthand for tag=value. `and` binds tighter than `or`.
+    """
+    tokens = tokenize_query(expression)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else (None, None)
+
+    def take():
+        nonlocal position
+        token = peek()
+        position += 1
+        return token
+
+    def parse_or():
+        node = parse_and()
+        while peek() == ('keyword', 'or'):
+            take()
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == ('keyword', 'and'):
+            take()
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == ('keyword', 'not'):
+            take()
+            return ('not', parse_not())
+        return parse_atom()
+
+    def parse_atom():
+        kind, text = take()
+        if (kind, text) == ('paren', '('):
+            node = parse_or()
+            if take() != ('paren', ')'):
+                raise KanbanError("Query is missing a closing parenthesis")
+            return node
+        if kind != 'value':
+            raise KanbanError(f"Expected a field name in query, got {text or 'end of query'!r}")
+
+        field = text.lower()
+        if field == 'tags':
+            field = 'tag'
+        if field not in QUERY_FIELDS:
+            raise KanbanError(f"Unknown query field '{text}' (use one of: {', '.join(QUERY_FIELDS)})")
+
+        kind, op = take()
+        if kind != 'op':
+            raise KanbanError(f"Expected an operator after '{text}'")
+        if op == ':':
+            if field != 'tag':
+                raise KanbanError(f"'{text}:' is only valid for tags, use {text}=...")
+            op = '='
+
+        kind, value = take()
+        if kind != 'value':
+            raise KanbanError(f"Expected a value after '{text}{op}'")
+
+        if field in CHOICE_FIELDS and op != '~':
+            value = value.lower()
+            check_choice(field, value, CHOICE_FIELDS[field])
+            if op in ('<', '<=', '>', '>=') and field not in ORDERED_FIELDS:
+                raise KanbanError(f"'{field}' values are not ordered, use = or !=")
+        if field == 'tag' and op not in ('=', '!=', '~'):
+            raise KanbanError("Tags only support tag:value, tag=value, tag!=value and tag~text")
+        return ('cmp', field, op, value)
+
+    if not tokens:
+        raise KanbanError("Empty query")
+    tree = parse_or()
+    if position < len(tokens):
+        raise KanbanError(f"Unexpected {peek()[1]!r} in query")
+    return tree
+
+def ordered_values(field, op, value):
+    """Choices of an ordered field satisfying `field op value`"""
+    order = ORDERED_FIELDS[field]
+    rank = order.index(value)
+    keep = {
+        '<': lambda i: i < rank,
+        '<=': lambda i: i <= rank,
+        '>': lambda i: i > rank,
+        '>=': lambda i: i >= rank,
+    }[op]
+    return [choice for i, choice in enumerate(order) if keep(i)]
+
+def query_to_sql(node):
+    """Compile a parsed query into (WHERE clause, params) over the docs table"""
+    kind = node[0]
+    if kind in ('and', 'or'):
+        left, left_params = query_to_sql(node[1])
+        right, right_params = query_to_sql(node[2])
+        return f"({left} {kind.upper()} {right})", left_params + right_params
+    if kind == 'not':
+        clause, params = query_to_sql(node[1])
+        return f"(NOT {clause})", params
+
+    _, field, op, value = node
+    column = 'col' if field == 'column' else field
+    if field == 'tag':
+        if op == '~':
+            return "key IN (SELECT key FROM tags WHERE instr(lower(tag), ?) > 0)", [value.lower()]
+        return f"key {'NOT IN' if op == '!=' else 'IN'} (SELECT key FROM tags WHERE tag = ?)", [value]
+    if op == '~':
+        return f"instr(lower(coalesce({column}, '')), ?) > 0", [value.lower()]
+    if op == '=':
+        return f"{column} = ?", [value]
+    if op == '!=':
+        return f"coalesce({column}, '') != ?", [value]
+    if field in ORDERED_FIELDS:
+        values = ordered_values(field, op, value)
+        if not values:
+            return "0", []
+        return f"{column} IN ({', '.join('?' * len(values))})", values
+    return f"{column} {op} ?", [value]
+
+def query_predicate(node):
+    """Compile a parsed query into predicate(task, column) for in-memory tasks"""
+    kind = node[0]
+    if kind == 'and':
+        left, right = query_predicate(node[1]), query_predicate(node[2])
+        return lambda task, column: left(task, column) and right(task, column)
+    if kind == 'or':
+        left, right = query_predicate(node[1]), query_predicate(node[2])
+        return lambda task, column: left(task, column) or right(task, column)
+    if kind == 'not':
+        inner = query_predicate(node[1])
+        return lambda task, column: not inner(task, column)
+
+    _, field, op, value = node
+
+    if field == 'tag':
+        def tags(task):
+            found = task.get('tags') or []
+            return [str(tag) for tag in (found if isinstance(found, list) else [found])]
+        if op == '~':
+            return lambda task, column: any(value.lower() in tag.lower() for tag in tags(task))
+        if op == '!=':
+            return lambda task, column: value not in tags(task)
+        return lambda task, column: value in tags(task)
+
+    def get(task, column):
+        if field == 'column':
+            return column
+        found = task.get(field)
+        if field == 'assignee':
+            found = found or 'unassigned'
+        return None if found is None else str(found)
+
+    if op == '~':
+        return lambda task, column: value.lower() in (get(task, column) or '').lower()
+    if op == '=':
+        return lambda task, column: get(task, column) == value
+    if op == '!=':
+        return lambda task, column: (get(task, column) or '') != value
+    if field in ORDERED_FIELDS:
+        values = set(ordered_values(field, op, value))
+        return lambda task, column: get(task, column) in values
+    compare = {'<': str.__lt__, '<=': str.__le__, '>': str.__gt__, '>=': str.__ge__}[op]
+    return lambda task, column: get(task, column) is not None and compare(get(task, column), value)
+
+def filter_tasks(tasks, expression):
+    """Apply a query expression to tasks by column (e.g. the daemon's board)"""
+    predicate = query_predicate(parse_query(expression))
+    return {column: [task for task in tasks[column] if predicate(task, column)] for column in COLUMNS}
+
+def query_tasks(expression):
+    """Tasks matching a query expression, by column, answered from the board index
+
+    Only the index is read: tasks come back as frontmatter dicts built from
+    the indexed fields and tags, in the same order as get_all_tasks.
+    """
+    where, params = query_to_sql(parse_query(expression))
+    conn = open_board_index()
+    try:
+        sync_board_index(conn)
+        rows = conn.execute(f"SELECT key, col, {', '.join(INDEXED_FIELDS)} FROM docs WHERE {where}",
+                            params).fetchall()
+        keys = [row[0] for row in rows]
+        tags = {}
+        for key, tag in select_in_chunks(conn, "SELECT key, tag FROM tags WHERE key IN ({keys}) ORDER BY rowid",
+                                         keys):
+            tags.setdefault(key, []).append(tag)
+    finally:
+        conn.close()
+
+    tasks = {column: [] for column in COLUMNS}
+    for key, column, *values in sorted(rows, key=lambda row: row[0]):
+        task = {field: value for field, value in zip(INDEXED_FIELDS, values) if value is not None}
+        task['tags'] = tags.get(key, [])
+        if column in tasks:
+            tasks[column].append(task)
+    return tasks
+
+# Mutation Journal
+# Append-only log of every CLI mutation in .kanban-journal/journal.jsonl, with
+# compacted snapshots so history and replay read the latest snapshot plus the tail
+
+JOURNAL_DIR = KANBAN_DIR / ".kanban-journal"
+JOURNAL_FILE = JOURNAL_DIR / "journal.jsonl"
+JOURNAL_VERSION = 1
+
+# Compact into a new snapshot once this many journal bytes follow the latest one
+JOURNAL_COMPACT_BYTES = 512 * 1024
+# Snapshots kept for replay; older points in time are rebuilt from the journal start
+JOURNAL_KEEP_SNAPSHOTS = 8
+
+def journal_timestamp():
+    """Fixed-width local timestamp, so journal times compare as strings"""
+    return datetime.now().isoformat(timespec='microseconds')
+
+def normalize_timestamp(value):
+    """Parse a date or datetime argument into journal timestamp form"""
+    try:
+        return datetime.fromisoformat(value).isoformat(timespec='microseconds')
+    except ValueError:
+        raise KanbanError(f"Invalid time '{value}' (expected e.g. 2025-10-20 or 2025-10-20T14:30)")
+
+def list_snapshots():
+    """Snapshot files, oldest first
+
+    Names carry the journal offset a snapshot covers and the time of its last
+    entry: snapshot-<offset>-<ts without colons>.json
+    """
+    if not JOURNAL_DIR.exists():
+        return []
+    return sorted(JOURNAL_DIR.glob('snapshot-*.json'))
+
+def snapshot_offset(path):
+    return int(path.stem.split('-')[1])
+
+def snapshot_time(path):
+    return path.stem.split('-', 2)[2]
+
+def load_snapshot(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def save_snapshot(state):
+    """Write a snapshot and prune old ones (the baseline at offset 0 is always kept)"""
+    name = f"snapshot-{state['offset']:012d}-{state['ts'].replace(':', '')}.json"
+    write_json_atomic(JOURNAL_DIR / name, state, separators=(',', ':'))
+    for old in list_snapshots()[1:-JOURNAL_KEEP_SNAPSHOTS]:
+        old.unlink(missing_ok=True)
+
+def baseline_state():
+    """Journal state for the board as it is now (used when the journal is started)"""
+    ts = journal_timestamp()
+    tasks = {}
+    for column, column_tasks in get_all_tasks().items():
+        for task in column_tasks:
+            fields = {field: task.get(field) for field in SUMMARY_FIELDS}
+            tasks.setdefault(task.get('id'), {
+                'column': column,
+                'fields': fields,
+                'history': [[ts, 'baseline', {'column': column}]],
+            })
+    return {'version': JOURNAL_VERSION, 'ts': ts, 'start': ts, 'offset': 0,
+            'next_task_number': load_metadata()['next_task_number'], 'tasks': tasks}
+
+def journal_append(op, task_id, data):
+    """Append one mutation; starts the journal with a baseline snapshot if needed"""
+    journal_extend([(op, task_id, data)])
+
+def journal_extend(changes):
+    """Append (op, task_id, data) mutations in a single write"""
+    with board_lock():
+        if not JOURNAL_FILE.exists():
+            JOURNAL_DIR.mkdir(exist_ok=True)
+            save_snapshot(baseline_state())
+
+        lines = []
+        for op, task_id, data in changes:
+            entry = {'ts': journal_timestamp(), 'op': op, 'id': task_id, 'data': data}
+            lines.append(json.dumps(entry, separators=(',', ':'), default=str) + '\n')
+        fd = os.open(JOURNAL_FILE, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            data = ''.join(lines).encode()
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+        snapshots = list_snapshots()
+        latest = snapshot_offset(snapshots[-1]) if snapshots else 0
+        if JOURNAL_FILE.stat().st_size - latest >= JOURNAL_COMPACT_BYTES:
+            save_snapshot(journal_state())
+
+def read_journal(offset=0):
+    """Yield (entry, end offset) from offset on; a torn final line is skipped"""
+    if not JOURNAL_FILE.exists():
+        return
+    with open(JOURNAL_FILE, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            offset += len(line)
+            if not line.endswith(b'\n'):
+                break
+            try:
+                yield json.loads(line), offset
+            except ValueError:
+                continue
+
+def apply_journal_entry(state, entry):
+    """Apply one journal entry to a journal state in place"""
+    ts, op, task_id, data = entry['ts'], entry['op'], entry.get('id'), entry.get('data') or {}
+    state['ts'] = max(state['ts'], ts)
+
+    if op == 'reserve':
+        state['next_task_number'] = max(state.get('next_task_number') or 0, data['first'] + data['count'])
+        return
+
+    if op == 'add':
+        record = state['tasks'][task_id] = {'column': data.get('column', 'backlog'), 'history': [], 'fields': {
+            'id': task_id, 'title': data.get('title'), 'type': data.get('type'),
+            'priority': data.get('priority'), 'assignee': data.get('assignee'),
+            'validation_status': 'pending', 'created_at': ts, 'updated_at': ts,
+            'completed_at': None, 'tags': [],
+        }}
+    else:
+        # Tasks created outside the CLI still get a history
+        record = state['tasks'].setdefault(task_id, {'column': data.get('from'), 'history': [],
+                                                     'fields': {'id': task_id}})
+        fields = record['fields']
+        if op == 'move':
+            record['column'] = data['to']
+            fields['updated_at'] = ts
+            if data['to'] == 'done':
+                fields['completed_at'] = ts
+                fields['validation_status'] = 'passed'
+        elif op == 'assign':
+            fields['assignee'] = data['assignee']
+            fields['updated_at'] = ts
+        elif op in ('claim', 'release'):
+            record['column'] = data['to']
+            fields['assignee'] = data['assignee']
+            fields['updated_at'] = ts
+        elif op == 'update':
+            for field in ('title', 'priority', 'type'):
+                if field in data:
+                    fields[field] = data[field]
+            if 'add_tag' in data:
+                fields['tags'] = (fields.get('tags') or []) + [data['add_tag']]
+            fields['updated_at'] = ts
+        elif op == 'delete':
+            record['column'] = None
+        elif op == 'archive':
+            record['column'] = 'archive'
+
+    record['history'].append([ts, op, data])
+
+def journal_state(until=None):
+    """Board state from the journal, as of `until` (a journal timestamp) if given
+
+    Starts from the latest snapshot taken at or before that time and replays
+    only the journal tail after it.
+    """
+    snapshots = list_snapshots()
+    if not snapshots:
+        raise KanbanError("No journal yet (it starts with the first CLI change)")
+
+    if until is not None:
+        if until.replace(':', '') < snapshot_time(snapshots[0]):
+            raise KanbanError(f"The journal starts at {load_snapshot(snapshots[0])['start']}")
+        snapshots = [path for path in snapshots if snapshot_time(path) <= until.replace(':', '')]
+    state = load_snapshot(snapshots[-1])
+
+    for entry, offset in read_journal(state['offset']):
+        if until is None or entry['ts'] <= until:
+            apply_journal_entry(state, entry)
+        state['offset'] = offset
+    return state
+
+@on_task_change
+def record_change(op, fields, result):
+    """Journal a successful add/move/assign/update/delete/claim/release"""
+    task_id = result['id']
+    if op == 'add':
+        task = read_frontmatter(STORAGE.task_file('backlog', f"{task_id}.md"))
+        data = {field: task.get(field) for field in ('title', 'type', 'priority', 'assignee', 'use_case')}
+        data['description'] = fields.get('description') or ''
+    elif op == 'move':
+        if not result['moved']:
+            return
+        data = {'from': result['from'], 'to': result['to']}
+    elif op == 'assign':
+        data = {'assignee': result['assignee']}
+    elif op == 'update':
+        if not result['changes']:
+            return
+        names = {'note': 'add_note', 'tag': 'add_tag'}
+        data = {names.get(change, change): fields[names.get(change, change)] for change in result['changes']}
+    elif op in ('claim', 'release'):
+        data = {'from': result['from'], 'to': result['to'], 'assignee': result['assignee'], 'owner': result['owner']}
+        if result.get('expired'):
+            data['expired'] = True
+    elif op == 'renew':
+        return
+    else:
+        data = {'column': result['column']}
+    journal_append(op, task_id, data)
+
+def task_history(task_id):
+    """Journal events for one task: [{ts, op, ...data}], oldest first"""
+    record = journal_state()['tasks'].get(task_id)
+    if not record:
+        raise KanbanError(f"No journal history for {task_id}")
+    return [dict(data, ts=ts, op=op) for ts, op, data in record['history']]
+
+def replay_board(until):
+    """Tasks by column (summary fields) as they were at `until`"""
+    state = journal_state(normalize_timestamp(until))
+    tasks = {column: [] for column in COLUMNS}
+    for task_id in sorted(state['tasks'], key=task_id_key):
+        record = state['tasks'][task_id]
+        if record['column'] in tasks:
+            tasks[record['column']].append(record['fields'])
+    return tasks, state
+
+# MQTT Events
+# With --mqtt / KANBAN_MQTT_URL set, every add/move/assign/update/delete is
+# queued in .kanban-cache/mqtt-outbox.jsonl (one append per command, or per
+# batch). The CLI never talks to the broker: a detached `publish-events`
+# process, started on demand, drains the outbox, coalesces the events into one
+# message per task and publishes them to kanban/<column>/<task_id> with QoS 1
+
+MQTT_OUTBOX_FILE = CACHE_DIR / "mqtt-outbox.jsonl"
+# Events taken from the outbox by the publisher, removed once the broker acknowledged them
+MQTT_SENDING_FILE = CACHE_DIR / "mqtt-sending.jsonl"
+# Held by the running publisher
+MQTT_PUBLISHER_LOCK = CACHE_DIR / "mqtt-publisher.lock"
+MQTT_TOPIC_PREFIX = 'kanban'
+MQTT_TIMEOUT = 5
+# Messages per pipelined write (each waits for its PUBACKs before the next)
+MQTT_BATCH_SIZE = 500
+# The publisher waits this long for more events before disconnecting and exiting
+MQTT_LINGER = 2.0
+# ...and gives up on an unreachable broker after this long; the events stay queued
+MQTT_RETRY_FOR = 30.0
+
+_mqtt_events = []
+
+def parse_mqtt_url(url):
+    """mqtt://[user:password@]host[:port] -> urlsplit result"""
+    from urllib.parse import urlsplit
+
+    parts = urlsplit(url if '://' in url else f"mqtt://{url}")
+    if parts.scheme not in ('mqtt', 'tcp') or not parts.hostname:
+        raise KanbanError(f"Unsupported MQTT broker URL '{url}' (expected mqtt://host:port)")
+    return parts
+
+def mqtt_string(value):
+    data = value.encode()
+    return len(data).to_bytes(2, 'big') + data
+
+def mqtt_packet(header, body):
+    """Fixed header byte, variable-length remaining length, body"""
+    length, size = bytearray(), len(body)
+    while True:
+        byte, size = size % 128, size // 128
+        length.append(byte | (0x80 if size else 0))
+        if not size:
+            return bytes([header]) + bytes(length) + body
+
+class MqttClient:
+    """Minimal MQTT 3.1.1 publisher (QoS 1, no extra dependency)"""
+
+    def __init__(self, url, timeout=MQTT_TIMEOUT):
+        import socket
+        from urllib.parse import unquote
+
+        parts = parse_mqtt_url(url)
+        self.sock = socket.create_connection((parts.hostname, parts.port or 1883), timeout=timeout)
+        self.stream = self.sock.makefile('rb')
+        self.next_id = 1
+
+        flags, payload = 0x02, mqtt_string(f"kanban-{os.getpid()}")  # clean session
+        if parts.username:
+            flags |= 0x80
+            payload += mqtt_string(unquote(parts.username))
+        if parts.password:
+            flags |= 0x40
+            payload += mqtt_string(unquote(parts.password))
+        try:
+            self.sock.sendall(mqtt_packet(0x10, mqtt_string('MQTT') + bytes([4, flags, 0, 60]) + payload))
+            packet_type, body = self.read_packet()
+            if packet_type != 0x20 or len(body) < 2 or body[1] != 0:
+                raise ConnectionRefusedError(f"MQTT broker refused the connection (CONNACK {body.hex()})")
+        except BaseException:
+            self.sock.close()
+            raise
+
+    def read_packet(self):
+        """(packet type, body) of the next packet from the broker"""
+        header = self.read(1)[0]
+        length, shift = 0, 0
+        while True:
+            byte = self.read(1)[0]
+            length |= (byte & 0x7f) << shift
+            shift += 7
+            if not byte & 0x80:
+                return header & 0xf0, self.read(length)
+
+    def read(self, size):
+        data = self.stream.read(size)
+        if len(data) < size:
+            raise ConnectionError("MQTT broker closed the connection")
+        return data
+
+    def publish_many(self, messages):
+        """Publish (topic, payload) pairs, pipelined; returns once every one is acknowledged"""
+        for start in range(0, len(messages), MQTT_BATCH_SIZE):
+            pending, packets = set(), []
+            for topic, payload in messages[start:start + MQTT_BATCH_SIZE]:
+                packet_id, self.next_id = self.next_id, self.next_id % 65535 + 1
+                pending.add(packet_id)
+                packets.append(mqtt_packet(0x32, mqtt_string(topic) + packet_id.to_bytes(2, 'big')
+                                           + payload.encode()))
+            self.sock.sendall(b''.join(packets))
+            while pending:
+                packet_type, body = self.read_packet()
+                if packet_type == 0x40:
+                    pending.discard(int.from_bytes(body[:2], 'big'))
+
+    def close(self):
+        try:
+            self.sock.sendall(mqtt_packet(0xe0, b''))
+        except OSError:
+            pass
+        self.sock.close()
+
+@on_task_change
+def queue_mqtt_event(op, fields, result):
+    """Queue a change event for the MQTT publisher when --mqtt is set"""
+    if not MQTT_URL:
+        return
+    event = {'ts': datetime.now().isoformat(), 'op': op, 'id': result['id'],
+             'column': result.get('to') or result.get('column')}
+    if op == 'add':
+        event['changes'] = {field: fields[field] for field in ('title', 'type', 'priority', 'assignee')
+                            if fields.get(field)}
+    elif op == 'move':
+        if not result['moved']:
+            return
+        event['from'] = result['from']
+    elif op in ('claim', 'release'):
+        event['from'] = result['from']
+        event['changes'] = {'assignee': result['assignee'],
+                            'lease_owner': result['owner'] if op == 'claim' else None}
+    elif op == 'renew':
+        return
+    elif op == 'assign':
+        event['changes'] = {'assignee': result['assignee']}
+    elif op == 'update':
+        if not result['changes']:
+            return
+        # Notes and tags are lists, so coalescing accumulates them
+        event['changes'] = {}
+        for change in result['changes']:
+            if change in ('note', 'tag'):
+                event['changes'][f"{change}s"] = [fields[f"add_{change}"]]
+            else:
+                event['changes'][change] = fields[change]
+    _mqtt_events.append(event)
+    if not _defer_index_save:
+        flush_mqtt_events()
+
+def flush_mqtt_events():
+    """Append the queued events to the outbox in one write and make sure a publisher runs"""
+    global _mqtt_events
+    if not _mqtt_events:
+        return
+    events, _mqtt_events = _mqtt_events, []
+    CACHE_DIR.mkdir(exist_ok=True)
+    with board_lock():
+        with open(MQTT_OUTBOX_FILE, 'a') as f:
+            f.write(''.join(json.dumps(event, separators=(',', ':'), default=str) + '\n' for event in events))
+    # After releasing board_lock: a publisher that is about to exit checks the outbox under it
+    start_mqtt_publisher()
+
+def try_lock(lock_file):
+    """Take an exclusive lock on lock_file without waiting; False if someone else holds it"""
+    try:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def start_mqtt_publisher():
+    """Start a detached `publish-events` process unless one is already running"""
+    import subprocess
+
+    with open(MQTT_PUBLISHER_LOCK, 'a') as lock_file:
+        if not try_lock(lock_file):
+            return
+    subprocess.Popen([sys.executable, str(Path(__file__).resolve()), '--mqtt', MQTT_URL, 'publish-events'],
+                     stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                     env=dict(os.environ, KANBAN_DIR=str(KANBAN_DIR)), start_new_session=True)
+
+def take_mqtt_events():
+    """Move the outbox onto the events being sent and return all of them, oldest first"""
+    with board_lock():
+        if MQTT_OUTBOX_FILE.exists():
+            if MQTT_SENDING_FILE.exists():
+                with open(MQTT_SENDING_FILE, 'a') as f:
+                    f.write(MQTT_OUTBOX_FILE.read_text())
+                MQTT_OUTBOX_FILE.unlink()
+            else:
+                os.replace(MQTT_OUTBOX_FILE, MQTT_SENDING_FILE)
+    events = []
+    try:
+        with open(MQTT_SENDING_FILE, 'r') as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    pass  # torn line from an interrupted write
+    except FileNotFoundError:
+        pass
+    return events
+
+def coalesce_events(events):
+    """One (topic, payload) per task: latest column, ops in order, merged changes"""
+    messages = {}
+    for event in events:
+        message = messages.setdefault(event['id'], {'id': event['id'], 'ops': [], 'changes': {}})
+        message['column'] = event['column']
+        message['ts'] = event['ts']
+        if event['op'] not in message['ops']:
+            message['ops'].append(event['op'])
+        if 'from' in event:
+            message.setdefault('from', event['from'])
+        for field, value in event.get('changes', {}).items():
+            if isinstance(value, list):
+                message['changes'][field] = message['changes'].get(field, []) + value
+            else:
+                message['changes'][field] = value
+    return [(f"{MQTT_TOPIC_PREFIX}/{message['column']}/{task_id}", json.dumps(message, separators=(',', ':')))
+            for task_id, message in messages.items()]
+
+def run_mqtt_publisher(url, follow=False):
+    """Publish queued events until the outbox stays empty (or forever with follow)
+
+    Returns the number of messages published, or None if another publisher is
+    already running. An unreachable broker is retried with backoff for
+    MQTT_RETRY_FOR seconds; undelivered events stay queued for the next run.
+    """
+    CACHE_DIR.mkdir(exist_ok=True)
+    lock_file = open(MQTT_PUBLISHER_LOCK, 'a')
+    if not try_lock(lock_file):
+        lock_file.close()
+        return None
+
+    client, published = None, 0
+    idle_since, failing_since, delay = time.monotonic(), None, 0.5
+    try:
+        while True:
+            events = take_mqtt_events()
+            if events:
+                messages = coalesce_events(events)
+                try:
+                    client = client or MqttClient(url)
+                    client.publish_many(messages)
+                except OSError:
+                    if client:
+                        client.close()
+                    client = None
+                    failing_since = failing_since or time.monotonic()
+                    if not follow and time.monotonic() - failing_since > MQTT_RETRY_FOR:
+                        return published
+                    time.sleep(delay)
+                    delay = min(delay * 2, 30)
+                    continue
+                MQTT_SENDING_FILE.unlink()
+                published += len(messages)
+                idle_since, failing_since, delay = time.monotonic(), None, 0.5
+                continue
+
+            if not follow and time.monotonic() - idle_since >= MQTT_LINGER:
+                with board_lock():
+                    # Checked under board_lock, so a concurrent flush either lands
+                    # before this or finds the publisher lock free and starts a new one
+                    if not MQTT_OUTBOX_FILE.exists():
+                        lock_file.close()
+                        return published
+            time.sleep(0.05)
+    finally:
+        if client:
+            client.close()
+        lock_file.close()
+
+def queued_mqtt_events():
+    """Events waiting in the outbox or being sent"""
+    count = 0
+    for path in (MQTT_OUTBOX_FILE, MQTT_SENDING_FILE):
+        try:
+            with open(path, 'rb') as f:
+                count += sum(1 for _ in f)
+        except FileNotFoundError:
+            pass
+    return count
+
+# Flow Analytics
+# Lead time, cycle time, throughput and WIP computed on columnar NumPy arrays
+# (numpy is only imported by `analytics`)
+
+# Rows fetched from the board index per chunk while filling the arrays
+ANALYTICS_CHUNK = 10000
+PERCENTILES = [50, 85, 95]
+# Lead time histogram bin edges in days; the last bin is open-ended
+LEAD_TIME_BINS = [0, 1, 2, 4, 7, 14, 30, 60]
+ANALYTICS_GROUPS = ['all', 'agent', 'human']
+
+def iso_seconds_sql(field):
+    """SQL normalizing a timestamp field to 'YYYY-MM-DDTHH:MM:SS' (or NaT) for numpy"""
+    return (f"CASE WHEN {field} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*' "
+            f"THEN replace(substr({field}, 1, 19), ' ', 'T') ELSE 'NaT' END")
+
+def load_flow_arrays(np):
+    """Column, assignee, created and completed arrays for every task, from the board index
+
+    Rows stream from SQLite in chunks into preallocated arrays (a few bytes
+    per task), so no per-task dicts are built whatever the board size.
+    """
+    column_codes = {column: code for code, column in enumerate(COLUMNS)}
+    assignee_codes = {assignee: code for code, assignee in enumerate(ASSIGNEES)}
+    unassigned = assignee_codes['unassigned']
+
+    conn = open_board_index()
+    try:
+        sync_board_index(conn)
+        count = conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+        arrays = {
+            'column': np.empty(count, dtype=np.int8),
+            'assignee': np.empty(count, dtype=np.int8),
+            'created': np.empty(count, dtype='datetime64[s]'),
+            'completed': np.empty(count, dtype='datetime64[s]'),
+        }
+        cursor = conn.execute(f"SELECT col, assignee, {iso_seconds_sql('created_at')}, "
+                              f"{iso_seconds_sql('completed_at')} FROM docs")
+        position = 0
+        while position < count:
+            rows = cursor.fetchmany(min(ANALYTICS_CHUNK, count - position))
+            if not rows:
+                break
+            end = position + len(rows)
+            columns, assignees, created, completed = zip(*rows)
+            arrays['column'][position:end] = [column_codes.get(column, -1) for column in columns]
+            arrays['assignee'][position:end] = [assignee_codes.get(assignee, unassigned)
+                                                for assignee in assignees]
+            arrays['created'][position:end] = np.array(created, dtype='datetime64[s]')
+            arrays['completed'][position:end] = np.array(completed, dtype='datetime64[s]')
+            position = end
+    finally:
+        conn.close()
+
+    return {name: array[:position] for name, array in arrays.items()}
+
+def group_masks(np, assignees):
+    """Boolean masks selecting all/agent/human rows of an assignee code array"""
+    return {
+        'all': np.ones(len(assignees), dtype=bool),
+        'agent': assignees == ASSIGNEES.index('agent'),
+        'human': assignees == ASSIGNEES.index('human'),
+    }
+
+def summarize_days(np, days):
+    """Count, mean and percentiles of an array of durations in days"""
+    if not len(days):
+        return {'count': 0, 'mean': None, **{f"p{p}": None for p in PERCENTILES}}
+    values = np.percentile(days, PERCENTILES)
+    return {
+        'count': int(len(days)),
+        'mean': round(float(days.mean()), 2),
+        **{f"p{p}": round(float(value), 2) for p, value in zip(PERCENTILES, values)},
+    }
+
+def monday_of(np, days):
+    """Monday on or before each day number (days since 1970-01-01, a Thursday)"""
+    return days - (days - 4) % 7
+
+def column_cycle_times(np):
+    """Days spent per stint in each column, by group, streamed from the journal
+
+    Only stints that start after the journal began are measurable; the
+    baseline snapshot supplies the assignees of tasks that existed then.
+    """
+    from array import array
+
+    durations = {column: {group: array('d') for group in ANALYTICS_GROUPS} for column in COLUMNS}
+    snapshots = list_snapshots()
+    if not snapshots:
+        return durations
+
+    owner = {task_id: record['fields'].get('assignee')
+             for task_id, record in load_snapshot(snapshots[0])['tasks'].items()}
+    entered = {}
+    for entry, _ in read_journal():
+        op, task_id, data = entry['op'], entry.get('id'), entry.get('data') or {}
+        if op == 'add':
+            entered[task_id] = ('backlog', datetime.fromisoformat(entry['ts']).timestamp())
+            owner[task_id] = data.get('assignee')
+        elif op == 'assign':
+            owner[task_id] = data['assignee']
+        elif op in ('move', 'claim', 'release'):
+            now = datetime.fromisoformat(entry['ts']).timestamp()
+            previous = entered.get(task_id)
+            if previous and previous[0] == data['from'] and data['from'] in durations:
+                days = (now - previous[1]) / 86400
+                durations[data['from']]['all'].append(days)
+                if owner.get(task_id) in ('agent', 'human'):
+                    durations[data['from']][owner[task_id]].append(days)
+            entered[task_id] = (data['to'], now)
+            # A claim or release also reassigns; the closed stint keeps the old owner
+            if op != 'move':
+                owner[task_id] = data.get('assignee')
+        elif op == 'delete':
+            entered.pop(task_id, None)
+
+    return {column: {group: np.frombuffer(values, dtype=np.float64) if len(values) else np.empty(0)
+                     for group, values in groups.items()}
+            for column, groups in durations.items()}
+
+def flow_analytics(weeks=12):
+    """Lead time, per-column cycle time, weekly throughput and WIP, split agent/human
+
+    Raises KanbanError if numpy is not installed.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise KanbanError("analytics needs NumPy (pip install numpy)")
+
+    arrays = load_flow_arrays(np)
+    masks = group_masks(np, arrays['assignee'])
+    created, completed = arrays['created'], arrays['completed']
+
+    # Lead time: created_at -> completed_at
+    finished = ~np.isnat(created) & ~np.isnat(completed)
+    lead = (completed - created).astype(np.float64) / 86400
+    finished &= lead >= 0
+    edges = np.array(LEAD_TIME_BINS + [np.inf])
+    lead_time = {}
+    histogram = {'bins': [f"{low}-{high}d" for low, high in zip(LEAD_TIME_BINS, LEAD_TIME_BINS[1:])] +
+                         [f"{LEAD_TIME_BINS[-1]}d+"]}
+    for group, mask in masks.items():
+        days = lead[finished & mask]
+        lead_time[group] = summarize_days(np, days)
+        histogram[group] = np.histogram(days, bins=edges)[0].tolist()
+
+    cycle_time = {column: {group: summarize_days(np, days) for group, days in groups.items()}
+                  for column, groups in column_cycle_times(np).items() if column != 'done'}
+
+    # Weekly throughput (completions per Monday-start week) and WIP (tasks
+    # created but not completed) at the end of each of the last `weeks` weeks
+    today = np.datetime64(datetime.now().date(), 'D').astype(np.int64)
+    week_starts = monday_of(np, today) - 7 * np.arange(weeks - 1, -1, -1)
+    done_days = completed[~np.isnat(completed)].astype('datetime64[D]').astype(np.int64)
+    done_weeks = monday_of(np, done_days)
+    throughput = {}
+    wip = {}
+    for group, mask in masks.items():
+        group_done = done_weeks[mask[~np.isnat(completed)]]
+        index = (group_done - week_starts[0]) // 7
+        index = index[(index >= 0) & (index < weeks)]
+        throughput[group] = np.bincount(index, minlength=weeks)
+
+        # Open at week end t = created <= t minus completed <= t (both sorted)
+        ends = (week_starts + 7).astype('datetime64[D]').astype('datetime64[s]')
+        opened = np.sort(created[mask & ~np.isnat(created)])
+        closed = np.sort(completed[mask & ~np.isnat(completed)])
+        wip[group] = (np.searchsorted(opened, ends, side='left') -
+                      np.searchsorted(closed, ends, side='left'))
+
+    weekly = [
+        {
+            'week': str(np.datetime64(int(start), 'D')),
+            'throughput': {group: int(throughput[group][i]) for group in ANALYTICS_GROUPS},
+            'wip': {group: int(wip[group][i]) for group in ANALYTICS_GROUPS},
+        }
+        for i, start in enumerate(week_starts)
+    ]
+
+    return {
+        'tasks': int(len(created)),
+        'completed': int(finished.sum()),
+        'lead_time_days': lead_time,
+        'lead_time_histogram': histogram,
+        'cycle_time_days': cycle_time,
+        'weekly': weekly,
+    }
+
+# Export
+# Generator pipeline: task files -> projected records -> JSONL/CSV/Parquet
+# writer, one task in memory at a time (Parquet: one row batch)
+
+EXPORT_FORMATS = ['jsonl', 'csv', 'parquet']
+EXPORT_FIELDS = ['id', 'column', 'title', 'type', 'priority', 'assignee', 'validation_status', 'use_case',
+                 'created_at', 'updated_at', 'completed_at', 'tags', 'description',
+                 'acceptance_criteria', 'notes']
+# Exported as lists (Parquet list<string>, CSV "a; b")
+LIST_FIELDS = frozenset(['tags', 'acceptance_criteria', 'notes'])
+# Rows per Parquet row group
+EXPORT_BATCH = 1000
+
+def iter_task_files(column=None, where=None, archived=False):
+    """Yield (column, task file) in board order; with where, only files the board index matches
+
+    archived appends the archive packs' tasks (column "archive") after done.
+    """
+    import zipfile
+
+    columns = [column] if column else COLUMNS
+    if not where:
+        for col in columns:
+            for task_file in STORAGE.column_files(col):
+                yield col, task_file
+        if archived and not column:
+            yield from iter_archived_files()
+        return
+
+    where_sql, params = query_to_sql(parse_query(where))
+    conn = open_board_index()
+    try:
+        sync_board_index(conn)
+        for col in columns:
+            cursor = conn.execute(f"SELECT key FROM docs WHERE col = ? AND {where_sql} ORDER BY key",
+                                  [col] + params)
+            for (key,) in cursor:
+                yield col, STORAGE.task_file(col, key.split('/', 1)[1])
+    finally:
+        conn.close()
+    if not archived or column:
+        return
+
+    conn = open_board_index(ARCHIVE_INDEX_DB_FILE)
+    try:
+        sync_archive_index(conn)
+        for (key,) in conn.execute(f"SELECT key FROM docs WHERE {where_sql} ORDER BY key", params):
+            pack, name = key.split('/', 1)
+            yield 'archive', zipfile.Path(ARCHIVE_DIR / pack, at=name)
+    finally:
+        conn.close()
+
+def iter_export_records(files, fields):
+    """Yield one dict of the requested fields per task file
+
+    Only the frontmatter is read unless a body field is requested.
+    """
+    with_body = bool(set(fields) & BODY_FIELDS)
+    for column, task_file in files:
+        try:
+            task = load_task(task_file) if with_body else read_frontmatter(task_file)
+        except FileNotFoundError:
+            continue  # moved or deleted while exporting
+        except Exception as e:
+            warn(f"Could not load {task_file.name}: {e}")
+            continue
+        yield {field: column if field == 'column' else task.get(field) for field in fields}
+
+def flat_value(value):
+    """Render a field value as a CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return '; '.join(str(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+def write_jsonl(records, out):
+    count = 0
+    for record in records:
+        out.write(json.dumps(record, default=str) + '\n')
+        count += 1
+    return count
+
+def write_csv(records, fields, out):
+    import csv
+
+    writer = csv.writer(out)
+    writer.writerow(fields)
+    count = 0
+    for record in records:
+        writer.writerow([flat_value(record[field]) for field in fields])
+        count += 1
+    return count
+
+def write_parquet(records, fields, path):
+    """Write records to a Parquet file in row groups of EXPORT_BATCH (needs pyarrow)"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise KanbanError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([(field, pa.list_(pa.string()) if field in LIST_FIELDS else pa.string())
+                        for field in fields])
+
+    def cell(field, value):
+        if value is None:
+            return None
+        if field in LIST_FIELDS:
+            return [str(item) for item in (value if isinstance(value, list) else [value])]
+        return json.dumps(value) if isinstance(value, dict) else str(value)
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch = []
+        for record in records:
+            batch.append({field: cell(field, record[field]) for field in fields})
+            if len(batch) == EXPORT_BATCH:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    return count
+
+def export_tasks(export_format, fields=None, column=None, where=None, output=None, archived=False):
+    """Stream tasks to output (a path, or stdout if None); returns the number exported
+
+    Raises KanbanError for field names that are neither export fields nor
+    task_template keys.
+    """
+    fields = fields or EXPORT_FIELDS
+    known = set(EXPORT_FIELDS) | set(load_metadata()['task_template'])
+    unknown = [field for field in fields if field not in known]
+    if unknown:
+        raise KanbanError(f"Unknown field(s): {', '.join(unknown)} (expected some of: {', '.join(sorted(known))})")
+    records = iter_export_records(iter_task_files(column, where, archived), fields)
+
+    if export_format == 'parquet':
+        if not output:
+            raise KanbanError("Parquet export needs --output FILE")
+        return write_parquet(records, fields, output)
+
+    if not output:
+        if export_format == 'csv':
+            return write_csv(records, fields, sys.stdout)
+        return write_jsonl(records, sys.stdout)
+
+    with open(output, 'w', newline='' if export_format == 'csv' else None) as out:
+        if export_format == 'csv':
+            return write_csv(records, fields, out)
+        return write_jsonl(records, out)
+
+# Import
+# Validate records against task_template, reserve the whole ID range with one
+# metadata write, then write task files on a thread pool; resumable
+
+IMPORT_FORMATS = ['json', 'jsonl', 'csv']
+IMPORT_STATE_DIR = CACHE_DIR / "imports"
+# Records handed to the writer pool at a time
+IMPORT_BATCH = 500
+
+def detect_import_format(path):
+    suffix = Path(path).suffix.lower().lstrip('.')
+    if suffix == 'ndjson':
+        return 'jsonl'
+    if suffix not in IMPORT_FORMATS:
+        raise KanbanError(f"Cannot tell the format of {path}, use --format")
+    return suffix
+
+def read_import_records(path, import_format):
+    """Yield (record number, record dict) from a JSON array, JSON lines or CSV file"""
+    if import_format == 'json':
+        with open(path, 'r') as f:
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise KanbanError(f"Invalid JSON in {path}: {e}")
+        if isinstance(data, dict):
+            data = data.get('tasks')
+        if not isinstance(data, list):
+            raise KanbanError("JSON import expects an array of tasks (or {\"tasks\": [...]})")
+        yield from enumerate(data, 1)
+    elif import_format == 'jsonl':
+        with open(path, 'r') as f:
+            number = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                number += 1
+                try:
+                    yield number, json.loads(line)
+                except ValueError as e:
+                    yield number, e
+    else:
+        import csv
+
+        with open(path, 'r', newline='') as f:
+            for number, row in enumerate(csv.DictReader(f), 1):
+                yield number, {key: value for key, value in row.items() if key and value not in (None, '')}
+
+def template_choices(value):
+    """Choices encoded in a task_template value like "low|medium|high", else None"""
+    if isinstance(value, str) and '|' in value:
+        return value.split('|')
+    return None
+
+def check_import_record(record, template):
+    """Validate one record against task_template; returns (task fields, column)
+
+    Fields the template declares as lists accept a list or a "a; b" string
+    (as written by `export --format csv`); `column` (default backlog) picks the
+    target column; an `id` is ignored since IDs are assigned on import.
+    """
+    if isinstance(record, Exception):
+        raise KanbanError(f"invalid JSON: {record}")
+    if not isinstance(record, dict):
+        raise KanbanError("expected an object")
+
+    unknown = set(record) - set(template) - {'column', 'id'}
+    if unknown:
+        raise KanbanError(f"unknown field(s): {', '.join(sorted(unknown))}")
+
+    title = record.get('title')
+    if not isinstance(title, str) or not title.strip():
+        raise KanbanError("title is required")
+
+    column = record.get('column', 'backlog')
+    check_choice('column', column, COLUMNS)
+
+    fields = {}
+    for field, value in record.items():
+        if field in ('id', 'column'):
+            continue
+        expected = template[field]
+        choices = template_choices(expected)
+        if choices:
+            check_choice(field, value, choices)
+        elif isinstance(expected, list):
+            if isinstance(value, str):
+                value = [item.strip() for item in value.split(';') if item.strip()]
+            if not isinstance(value, list):
+                raise KanbanError(f"{field} must be a list")
+            value = [str(item) for item in value]
+        elif isinstance(expected, dict):
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            if not isinstance(value, dict):
+                raise KanbanError(f"{field} must be an object")
+        elif value is not None and not isinstance(value, str):
+            raise KanbanError(f"{field} must be a string")
+        fields[field] = value
+    return fields, column
+
+def build_import_task(task_id, fields, column, now):
+    """Full task dict for an imported record, with add's defaults for missing fields"""
+    task = {
+        "id": task_id,
+        "title": fields['title'],
+        "description": '',
+        "type": 'feature',
+        "priority": 'medium',
+        "assignee": 'unassigned',
+        "use_case": '',
+        "test_data": {"good_samples": [], "bad_samples": []},
+        "acceptance_criteria": [],
+        "validation_status": 'passed' if column == 'done' else 'pending',
+        "created_at": now,
+        "updated_at": now,
+        "completed_at": now if column == 'done' else None,
+        "tags": [],
+        "notes": [],
+    }
+    task.update(fields)
+    return task
+
+def import_source_digest(path):
+    """Content hash identifying an import source for resuming"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def import_tasks(path, import_format=None, dry_run=False, workers=None):
+    """Import tasks from a file; returns a summary dict
+
+    All records are validated first (nothing is written if any fail). The ID
+    range is reserved with one metadata write and remembered in
+    .kanban-cache/imports/, so re-running after an interruption reuses the
+    same IDs and only writes the task files that are still missing.
+    """
+    import_format = import_format or detect_import_format(path)
+    template = load_metadata()['task_template']
+
+    errors = []
+    count = 0
+    for number, record in read_import_records(path, import_format):
+        count += 1
+        try:
+            check_import_record(record, template)
+        except KanbanError as e:
+            errors.append(f"record {number}: {e}")
+    if errors:
+        shown = errors[:20] + ([f"... and {len(errors) - 20} more"] if len(errors) > 20 else [])
+        raise KanbanError(f"{len(errors)} invalid record(s) in {path}:\n  " + '\n  '.join(shown))
+    if dry_run or not count:
+        return {'records': count, 'imported': 0, 'resumed': False, 'dry_run': dry_run}
+
+    state_file = IMPORT_STATE_DIR / f"{import_source_digest(path)}.json"
+    with deferred_index_writes():
+        try:
+            with open(state_file, 'r') as f:
+                state = json.load(f)
+            resumed = True
+        except (OSError, ValueError):
+            state = None
+        if not state or state.get('count') != count:
+            first = int(reserve_task_ids(count)[0].split('-')[1])
+            state = {'source': str(path), 'first': first, 'count': count}
+            IMPORT_STATE_DIR.mkdir(parents=True, exist_ok=True)
+            write_json_atomic(state_file, state)
+            resumed = False
+
+        now = datetime.now().isoformat()
+        ids = [f"TASK-{number:03d}" for number in range(state['first'], state['first'] + count)]
+
+        def write(item):
+            task_id, (fields, column) = item
+            task = build_import_task(task_id, fields, column, now)
+            STORAGE.add_task(task, column)
+            data = {field: task[field] for field in ('title', 'type', 'priority', 'assignee', 'use_case',
+                                                     'description')}
+            if column != 'backlog':
+                data['column'] = column
+            return task_id, column, data
+
+        imported = 0
+        pending = []
+        with ThreadPoolExecutor(max_workers=workers or LOAD_WORKERS or default_load_workers()) as pool:
+            def flush():
+                nonlocal imported
+                changes = []
+                for task_id, column, data in pool.map(write, pending):
+                    changes.append(('add', task_id, data))
+                    # Sent in one outbox write when deferred_index_writes ends
+                    queue_mqtt_event('add', data, {'id': task_id, 'column': column})
+                if changes:
+                    journal_extend(changes)
+                imported += len(changes)
+                pending.clear()
+
+            for task_id, (_, record) in zip(ids, read_import_records(path, import_format)):
+                if resumed and locate_task(task_id):
+                    continue  # written before the interruption
+                pending.append((task_id, check_import_record(record, template)))
+                if len(pending) >= IMPORT_BATCH:
+                    flush()
+            flush()
+
+        # The tasks skip the per-operation change hooks: bring an existing board
+        # index (and its materialized counts) up to date in one sync instead
+        if imported and INDEX_DB_FILE.exists():
+            conn = open_board_index()
+            try:
+                sync_board_index(conn)
+            finally:
+                conn.close()
+
+        state_file.unlink(missing_ok=True)
+
+    return {'records': count, 'imported': imported, 'resumed': resumed, 'first': ids[0], 'last': ids[-1]}
+
+# Archive
+# Old done tasks live in compressed monthly pack files (archive/done-YYYY-MM.zip,
+# one deflated member per task file) listed in archive/index.json; column scans
+# never see them, lookups read them on demand
+
+ARCHIVE_DIR = KANBAN_DIR / "archive"
+ARCHIVE_INDEX_FILE = ARCHIVE_DIR / "index.json"
+ARCHIVE_INDEX_DB_FILE = CACHE_DIR / "archive-index.db"
+DEFAULT_ARCHIVE_DAYS = 90
+
+def load_archive_index():
+    """Archived task ID -> {pack, title, completed_at}"""
+    try:
+        with open(ARCHIVE_INDEX_FILE, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def archive_pack_path(pack):
+    return ARCHIVE_DIR / f"done-{pack}.zip"
+
+def archived_task_file(task_id, index=None):
+    """Path-like handle to an archived task file (zipfile.Path), or None"""
+    import zipfile
+
+    entry = (index if index is not None else load_archive_index()).get(task_id)
+    if not entry:
+        return None
+    return zipfile.Path(archive_pack_path(entry['pack']), at=f"{task_id}.md")
+
+def find_archived_task(task_id):
+    """Fully parsed archived task, or None"""
+    task_file = archived_task_file(task_id)
+    if task_file is None:
+        return None
+    try:
+        return load_task(task_file)
+    except (OSError, KeyError):
+        return None
+
+def iter_archived_files():
+    """Yield ('archive', task file handle) for every archived task, pack by pack"""
+    import zipfile
+
+    for pack in sorted(ARCHIVE_DIR.glob('done-*.zip')) if ARCHIVE_DIR.exists() else []:
+        with zipfile.ZipFile(pack) as zf:
+            names = sorted(zf.namelist(), key=lambda name: task_id_key(name[:-3]))
+        for name in names:
+            yield 'archive', zipfile.Path(pack, at=name)
+
+def archive_month(task, task_file):
+    """YYYY-MM a done task is filed under: completed_at, else updated_at, else file mtime"""
+    for field in ('completed_at', 'updated_at'):
+        value = str(task.get(field) or '')
+        if re.match(r'^\d{4}-\d{2}', value):
+            return value[:7], value
+    stamp = datetime.fromtimestamp(task_file.stat().st_mtime).isoformat()
+    return stamp[:7], stamp
+
+def archive_done_tasks(before, dry_run=False):
+    """Move done tasks completed before `before` (ISO date/time) into monthly packs
+
+    Packs are rewritten to a temporary file and renamed into place, and task
+    files are only deleted once their pack and the index are saved, so an
+    interruption can leave a task in both places but never in neither.
+    Returns {pack: [task ids]}.
+    """
+    import zipfile
+
+    require_markdown_storage('archive')
+    with board_lock():
+        packs = {}
+        for task_file in list_column_files('done'):
+            try:
+                task = read_frontmatter(task_file)
+            except Exception as e:
+                warn(f"Could not load {task_file.name}: {e}")
+                continue
+            month, completed = archive_month(task, task_file)
+            if completed < before:
+                packs.setdefault(month, []).append((task_file, task, completed))
+
+        if dry_run or not packs:
+            return {pack: [task_file.stem for task_file, _, _ in items] for pack, items in sorted(packs.items())}
+
+        ARCHIVE_DIR.mkdir(exist_ok=True)
+        index = load_archive_index()
+        for pack, items in sorted(packs.items()):
+            path = archive_pack_path(pack)
+            fd, temp = tempfile.mkstemp(dir=ARCHIVE_DIR, prefix=f".{path.name}.", suffix='.tmp')
+            os.close(fd)
+            try:
+                adding = {f"{task_file.stem}.md" for task_file, _, _ in items}
+                with zipfile.ZipFile(temp, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as out:
+                    if path.exists():
+                        with zipfile.ZipFile(path) as old:
+                            for info in old.infolist():
+                                if info.filename not in adding:
+                                    out.writestr(info, old.read(info))
+                    for task_file, _, _ in items:
+                        out.write(task_file, f"{task_file.stem}.md")
+                with open(temp, 'rb') as f:
+                    os.fsync(f.fileno())
+                os.replace(temp, path)
+            except BaseException:
+                os.unlink(temp)
+                raise
+            for task_file, task, completed in items:
+                index[task_file.stem] = {'pack': pack, 'title': task.get('title'), 'completed_at': completed}
+
+        write_json_atomic(ARCHIVE_INDEX_FILE, index, indent=1, sort_keys=True)
+
+        with deferred_index_writes():
+            for pack, items in packs.items():
+                for task_file, _, _ in items:
+                    task_file.unlink(missing_ok=True)
+                    index_task(task_file.stem, None)
+        journal_extend([('archive', task_file.stem, {'pack': pack})
+                        for pack, items in sorted(packs.items()) for task_file, _, _ in items])
+
+    return {pack: [task_file.stem for task_file, _, _ in items] for pack, items in sorted(packs.items())}
+
+def sync_archive_index(conn):
+    """Bring the archive search index up to date, re-reading only packs that changed"""
+    import zipfile
+
+    conn.execute("CREATE TABLE IF NOT EXISTS packs (name TEXT PRIMARY KEY, mtime INTEGER, size INTEGER)")
+    known = {name: (mtime, size) for name, mtime, size in conn.execute("SELECT name, mtime, size FROM packs")}
+    current = {}
+    for pack in ARCHIVE_DIR.glob('done-*.zip') if ARCHIVE_DIR.exists() else []:
+        stat = pack.stat()
+        current[pack.name] = (pack, stat.st_mtime_ns, stat.st_size)
+
+    with conn:
+        for name in set(known) - set(current):
+            for (key,) in conn.execute("SELECT key FROM docs WHERE key LIKE ?", (f"{name}/%",)).fetchall():
+                remove_indexed_file(conn, key)
+            conn.execute("DELETE FROM packs WHERE name = ?", (name,))
+        for name, (pack, mtime, size) in current.items():
+            if known.get(name) == (mtime, size):
+                continue
+            for (key,) in conn.execute("SELECT key FROM docs WHERE key LIKE ?", (f"{name}/%",)).fetchall():
+                remove_indexed_file(conn, key)
+            with zipfile.ZipFile(pack) as zf:
+                for member in zf.namelist():
+                    try:
+                        task = parse_markdown_task(zf.read(member).decode())
+                    except Exception as e:
+                        warn(f"Could not index {name}/{member}: {e}")
+                        continue
+                    index_task_record(conn, f"{name}/{member}", 'archive', task, mtime, size, member[:-3])
+            conn.execute("INSERT OR REPLACE INTO packs VALUES (?, ?, ?)", (name, mtime, size))
+
+# Board Check
+# `fsck` validates every task file against task_template and the invariants
+# the rest of the CLI assumes (one file per ID, filename = id, IDs below
+# next_task_number, done tasks completed), then cross-checks the derived caches
+# and indexes against the files. File checks run on a process pool on large
+# boards; --repair fixes what can be fixed mechanically and rebuilds stale caches
+
+# Boards with fewer task files are checked in-process
+FSCK_PARALLEL_MIN = 2000
+# Temp files of atomic writes younger than this (seconds) may still be in use
+FSCK_TEMP_GRACE = 60
+# Values written by --repair for frontmatter fields missing from a task file
+# (missing created_at/updated_at get the file's mtime)
+FSCK_FIELD_DEFAULTS = {'type': 'feature', 'priority': 'medium', 'assignee': 'unassigned',
+                       'validation_status': 'pending', 'tags': []}
+TASK_NUMBER = re.compile(r'^TASK-(\d+)')
+
+def fsck_problem(check, file, task_id, message, fix=None, severity='error'):
+    """One fsck finding; fix is frontmatter updates for `file` or a callable, run by --repair"""
+    return {'check': check, 'severity': severity, 'file': file, 'id': task_id, 'message': message, 'fix': fix}
+
+def parse_timestamp(value):
+    """datetime for an ISO timestamp value, else None"""
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+def check_task_file(column, path, template):
+    """Check one task file against task_template; returns its fsck record
+
+    Runs in fsck's worker processes, so it takes and returns plain data:
+    {key, column, id, mtime, size, fields (frontmatter, None if unparseable),
+    indexed (its board index values), problems}.
+    """
+    task_file = Path(path)
+    key = f"{column}/{task_file.name}"
+    task_id = task_file.stem
+    stat = task_file.stat()
+    record = {'key': key, 'column': column, 'id': task_id, 'mtime': stat.st_mtime_ns, 'size': stat.st_size,
+              'fields': None, 'problems': []}
+
+    def problem(check, message, fix=None, severity='error'):
+        record['problems'].append(fsck_problem(check, key, task_id, message, fix, severity))
+
+    try:
+        with open(task_file, 'r') as f:
+            content = f.read()
+        if not content.startswith('---\n'):
+            raise ValueError("Invalid markdown format: missing frontmatter")
+        task = parse_markdown_task(content)
+        fields = record['fields'] = parse_frontmatter(content.split('---\n', 2)[1])
+        record['indexed'] = indexed_values(task, task_id)
+    except Exception as e:
+        problem('unparseable', f"Could not parse: {e}")
+        return record
+
+    modified = datetime.fromtimestamp(stat.st_mtime).isoformat()
+    if fields.get('id') != task_id:
+        problem('id_mismatch', f"id: {fields.get('id')} does not match the file name", {'id': task_id})
+    if not str(fields.get('title') or '').strip():
+        problem('missing_field', "title is empty")
+
+    for field, expected in template.items():
+        if field in BODY_FIELDS or field in ('id', 'title', 'completed_at'):
+            continue
+        value = fields.get(field)
+        if field not in fields:
+            default = modified if field.endswith('_at') else FSCK_FIELD_DEFAULTS.get(field)
+            problem('missing_field', f"{field} is missing", None if default is None else {field: default})
+            continue
+        choices = template_choices(expected)
+        if choices and value not in choices:
+            problem('invalid_value', f"{field}: {value} is not one of {', '.join(choices)}")
+        elif isinstance(expected, list) and not isinstance(value, list):
+            problem('invalid_value', f"{field} must be a list", {field: [] if value in (None, 'None') else [value]})
+        elif field.endswith('_at') and parse_timestamp(value) is None:
+            problem('invalid_timestamp', f"{field}: {value} is not an ISO timestamp", {field: modified})
+
+    # add writes a missing completed_at as None
+    completed = fields.get('completed_at')
+    if completed in (None, 'None', ''):
+        if column == 'done':
+            updated = fields.get('updated_at')
+            problem('missing_completed_at', "done task has no completed_at",
+                    {'completed_at': updated if parse_timestamp(updated) else modified})
+    elif parse_timestamp(completed) is None:
+        problem('invalid_timestamp', f"completed_at: {completed} is not an ISO timestamp",
+                {'completed_at': modified if column == 'done' else None})
+
+    if column != 'in_progress' and any(fields.get(field) for field in LEASE_FIELDS):
+        problem('stale_lease', f"claimed by {fields.get('lease_owner')} but not in progress",
+                dict.fromkeys(LEASE_FIELDS), 'warning')
+    return record
+
+def check_task_files(items, template):
+    """check_task_file over a chunk of (column, path) pairs"""
+    return [check_task_file(column, path, template) for column, path in items]
+
+def check_metadata(metadata, records):
+    """Findings for board-metadata.json, given the task file records"""
+    problems = []
+    for key, expected in (('columns', dict), ('task_template', dict)):
+        if not isinstance(metadata.get(key), expected):
+            problems.append(fsck_problem('metadata', METADATA_FILE.name, None, f"{key} is missing or invalid"))
+
+    numbered = {}
+    for task_id in [record['id'] for record in records] + list(load_archive_index()):
+        match = TASK_NUMBER.match(task_id)
+        if match:
+            numbered[task_id] = int(match.group(1))
+    highest = max(numbered.values(), default=0)
+
+    def bump_next_task_number():
+        metadata = load_metadata()
+        current = metadata.get('next_task_number')
+        if not isinstance(current, int) or current <= highest:
+            metadata['next_task_number'] = highest + 1
+            save_metadata(metadata)
+
+    next_number = metadata.get('next_task_number')
+    if not isinstance(next_number, int):
+        problems.append(fsck_problem('metadata', METADATA_FILE.name, None,
+                                     f"next_task_number is {next_number!r}", bump_next_task_number))
+        return problems
+    for record in records:
+        if numbered.get(record['id'], 0) >= next_number:
+            problems.append(fsck_problem('id_above_next', record['key'], record['id'],
+                                         f"ID is not below next_task_number ({next_number})", bump_next_task_number))
+    return problems
+
+def check_duplicate_ids(records):
+    """Findings for task IDs present in more than one column
+
+    --repair keeps the most recently updated copy and gives the others new IDs.
+    """
+    by_id = {}
+    for record in records:
+        by_id.setdefault(record['id'], []).append(record)
+
+    problems = []
+    for task_id, copies in by_id.items():
+        if len(copies) < 2:
+            continue
+        # Latest updated_at wins; on a tie, the copy a lookup finds first
+        keep = max(copies, key=lambda record: (
+            str((record['fields'] or {}).get('updated_at') or ''), -COLUMNS.index(record['column'])))
+        for record in copies:
+            if record is not keep:
+                problems.append(fsck_problem('duplicate_id', record['key'], task_id,
+                                             f"also in {keep['key']} (kept)", functools.partial(renumber_task, record)))
+    return problems
+
+def renumber_task(record):
+    """Give a duplicate task file a newly reserved ID"""
+    new_id = reserve_task_ids(1)[0]
+    old_file = KANBAN_DIR / record['key']
+    new_file = old_file.with_name(f"{new_id}.md")
+    os.rename(old_file, new_file)
+    patch_frontmatter(new_file, {'id': new_id})
+    fields = record['fields'] or {}
+    data = {field: fields.get(field) for field in ('title', 'type', 'priority', 'assignee')}
+    if record['column'] != 'backlog':
+        data['column'] = record['column']
+    journal_extend([('add', new_id, data)])
+
+def check_archive(records):
+    """Findings for archive/index.json vs the packs, and tasks left in both places"""
+    import zipfile
+
+    index = load_archive_index()
+    members = {}
+    for pack in sorted(ARCHIVE_DIR.glob('done-*.zip')) if ARCHIVE_DIR.exists() else []:
+        try:
+            with zipfile.ZipFile(pack) as zf:
+                for name in zf.namelist():
+                    members[name[:-3]] = pack.name[len('done-'):-len('.zip')]
+        except zipfile.BadZipFile as e:
+            return [fsck_problem('archive', str(pack.relative_to(KANBAN_DIR)), None, f"Corrupt pack: {e}")]
+
+    problems = []
+    missing = [task_id for task_id, entry in index.items() if members.get(task_id) != entry.get('pack')]
+    unlisted = [task_id for task_id in members if task_id not in index]
+    if missing or unlisted:
+        problems.append(fsck_problem(
+            'archive', str(ARCHIVE_INDEX_FILE.relative_to(KANBAN_DIR)), None,
+            f"{len(missing)} entries without a pack member, {len(unlisted)} pack members not listed",
+            functools.partial(rebuild_archive_index, members)))
+
+    # An interrupted archive can leave a task in its pack and in done
+    for record in records:
+        pack = members.get(record['id'])
+        if pack is None:
+            continue
+        task_file = KANBAN_DIR / record['key']
+        with zipfile.ZipFile(archive_pack_path(pack)) as zf:
+            identical = zf.read(f"{record['id']}.md") == task_file.read_bytes()
+        problems.append(fsck_problem(
+            'archived_duplicate', record['key'], record['id'],
+            f"also archived in {archive_pack_path(pack).name}" + ("" if identical else " (contents differ)"),
+            functools.partial(task_file.unlink, missing_ok=True) if identical else None, 'warning'))
+    return problems
+
+def rebuild_archive_index(members):
+    """Rewrite archive/index.json from the pack contents (members: task ID -> pack)"""
+    import zipfile
+
+    index = load_archive_index()
+    rebuilt = {}
+    for task_id, pack in members.items():
+        entry = index.get(task_id)
+        if not entry or entry.get('pack') != pack:
+            task = read_frontmatter(zipfile.Path(archive_pack_path(pack), at=f"{task_id}.md"))
+            entry = {'pack': pack, 'title': task.get('title'),
+                     'completed_at': task.get('completed_at') or task.get('updated_at')}
+        rebuilt[task_id] = entry
+    write_json_atomic(ARCHIVE_INDEX_FILE, rebuilt, indent=1, sort_keys=True)
+
+def check_temp_files():
+    """Findings for temp files left behind by interrupted atomic writes"""
+    problems = []
+    cutoff = time.time() - FSCK_TEMP_GRACE
+    for folder in [KANBAN_DIR] + [KANBAN_DIR / column for column in COLUMNS]:
+        for temp in folder.glob('.*.tmp') if folder.exists() else []:
+            if temp.stat().st_mtime < cutoff:
+                problems.append(fsck_problem('stray_temp_file', str(temp.relative_to(KANBAN_DIR)), None,
+                                             "left by an interrupted write",
+                                             functools.partial(temp.unlink, missing_ok=True), 'warning'))
+    return problems
+
+def remove_cache_files(*paths):
+    """Delete derived files (SQLite databases with their -wal/-shm files)"""
+    for path in paths:
+        for suffix in ('', '-wal', '-shm'):
+            Path(f"{path}{suffix}").unlink(missing_ok=True)
+
+def rebuild_id_index():
+    global _ID_INDEX
+    remove_cache_files(ID_INDEX_FILE)
+    _ID_INDEX = None
+    load_id_index()
+
+def rebuild_task_cache():
+    remove_cache_files(TASK_CACHE_FILE)
+    get_all_tasks()
+
+def rebuild_board_index():
+    remove_cache_files(INDEX_DB_FILE)
+    conn = open_board_index()
+    try:
+        sync_board_index(conn)
+    finally:
+        conn.close()
+
+def rebuild_archive_search_index():
+    remove_cache_files(ARCHIVE_INDEX_DB_FILE)
+    conn = open_board_index(ARCHIVE_INDEX_DB_FILE)
+    try:
+        sync_archive_index(conn)
+    finally:
+        conn.close()
+
+def check_caches(records):
+    """Findings for derived state that disagrees with the task files it was built from
+
+    Caches stamped with an older folder or file state are rebuilt on their own
+    and are not reported; only entries the CLI would trust are compared.
+    """
+    problems = []
+    current = {record['key']: record for record in records}
+
+    def problem(path, message, rebuild):
+        problems.append(fsck_problem('stale_cache', str(path.relative_to(KANBAN_DIR)), None, message, rebuild))
+
+    if ID_INDEX_FILE.exists():
+        expected = {}
+        for record in records:
+            expected.setdefault(record['id'], record['column'])
+        try:
+            with open(ID_INDEX_FILE, 'r') as f:
+                data = json.load(f)
+            if data.get('dirs') == column_dir_stamps() and data.get('ids') != expected:
+                problem(ID_INDEX_FILE, "ID index does not match the column folders", rebuild_id_index)
+        except (ValueError, AttributeError):
+            problem(ID_INDEX_FILE, "ID index is corrupt", rebuild_id_index)
+
+    stale = [key for key, entry in load_task_cache().items()
+             if key in current and (entry['mtime'], entry['size']) == (current[key]['mtime'], current[key]['size'])
+             and entry['fields'] != current[key]['fields']]
+    if stale:
+        problem(TASK_CACHE_FILE, f"{len(stale)} entries disagree with their task files", rebuild_task_cache)
+
+    for path, rebuild in ((INDEX_DB_FILE, rebuild_board_index), (ARCHIVE_INDEX_DB_FILE, rebuild_archive_search_index)):
+        if not path.exists():
+            continue
+        conn = sqlite3.connect(path, timeout=30)
+        try:
+            if conn.execute("PRAGMA integrity_check").fetchone()[0] != 'ok':
+                problem(path, "database is corrupt", rebuild)
+            elif path == INDEX_DB_FILE and conn.execute("PRAGMA user_version").fetchone()[0] == INDEX_SCHEMA_VERSION:
+                message = check_board_index(conn, current)
+                if message:
+                    problem(path, message, rebuild)
+        except sqlite3.DatabaseError as e:
+            problem(path, f"database is unreadable: {e}", rebuild)
+        finally:
+            conn.close()
+    return problems
+
+def check_board_index(conn, current):
+    """What is wrong with an up-to-date-looking board index, or None"""
+    row = conn.execute("SELECT value FROM meta WHERE name = 'dirs'").fetchone()
+    docs = {key: (col, mtime, size, values) for key, col, mtime, size, *values in
+            conn.execute(f"SELECT key, col, mtime, size, {', '.join(INDEXED_FIELDS)} FROM docs")}
+    if row and json.loads(row[0]) == STORAGE.stamps():
+        parsed = {key for key, record in current.items() if record['fields'] is not None}
+        if set(docs) != parsed:
+            return f"{len(parsed - set(docs))} task files missing, {len(set(docs) - parsed)} removed files listed"
+
+    stale = [key for key, (col, mtime, size, values) in docs.items()
+             if key in current and current[key]['fields'] is not None
+             and (mtime, size) == (current[key]['mtime'], current[key]['size'])
+             and (col, values) != (current[key]['column'], current[key]['indexed'])]
+    if stale:
+        return f"{len(stale)} rows disagree with their task files"
+
+    counts = {(col, assignee, priority, type): count for col, assignee, priority, type, count in conn.execute(
+        "SELECT col, coalesce(assignee, ''), coalesce(priority, ''), coalesce(type, ''), count(*) "
+        "FROM docs GROUP BY 1, 2, 3, 4")}
+    cells = {(col, assignee, priority, type): count for col, assignee, priority, type, count in
+             conn.execute("SELECT col, assignee, priority, type, count FROM cells WHERE count != 0")}
+    if counts != cells:
+        return "materialized counts disagree with the indexed tasks"
+    return None
+
+def check_board(repair=False, jobs=None):
+    """Run every fsck check, and with repair fix what it can; returns the report
+
+    Task files are checked on a pool of `jobs` processes (default: core count)
+    once the board has FSCK_PARALLEL_MIN files. Repairs run under board_lock in
+    order: frontmatter fixes, metadata, duplicate renumbering, archive and temp
+    files, then rebuilding the stale caches and indexes.
+    """
+    require_markdown_storage('fsck')
+    metadata = load_metadata()
+    template = metadata.get('task_template') if isinstance(metadata.get('task_template'), dict) else {}
+
+    files = [(column, str(task_file)) for column in COLUMNS for task_file in list_column_files(column)]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(files) >= FSCK_PARALLEL_MIN:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(files) // (jobs * 4))
+        chunks = [files[i:i + size] for i in range(0, len(files), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            records = [record for chunk in pool.map(functools.partial(check_task_files, template=template), chunks)
+                       for record in chunk]
+    else:
+        records = check_task_files(files, template)
+
+    problems = [problem for record in records for problem in record['problems']]
+    problems += check_metadata(metadata, records)
+    problems += check_duplicate_ids(records)
+    problems += check_archive(records)
+    problems += check_temp_files()
+    problems += check_caches(records)
+
+    for problem in problems:
+        problem['repairable'] = problem['fix'] is not None
+        problem['repaired'] = False
+    if repair:
+        with board_lock():
+            repair_problems(problems)
+
+    for problem in problems:
+        del problem['fix']
+    counts = {}
+    for problem in problems:
+        counts[problem['check']] = counts.get(problem['check'], 0) + 1
+    return {
+        'ok': not any(problem['severity'] == 'error' and not problem['repaired'] for problem in problems),
+        'files': len(records),
+        'problems': problems,
+        'counts': counts,
+        'repaired': sum(problem['repaired'] for problem in problems),
+    }
+
+def repair_problems(problems):
+    """Apply the fixes of fsck findings in order, marking each one repaired"""
+    patches = {}
+    for problem in problems:
+        if isinstance(problem['fix'], dict):
+            patches.setdefault(problem['file'], {}).update(problem['fix'])
+    for file, updates in patches.items():
+        try:
+            patch_frontmatter(KANBAN_DIR / file, updates)
+        except (OSError, ValueError) as e:
+            warn(f"Could not repair {file}: {e}")
+            continue
+        for problem in problems:
+            if problem['file'] == file and isinstance(problem['fix'], dict):
+                problem['repaired'] = True
+
+    done = set()
+    for problem in problems:
+        fix = problem['fix']
+        if not callable(fix):
+            continue
+        # Shared fixes (the metadata bump, a cache rebuild) run once
+        name = getattr(fix, '__name__', None)
+        if name in done:
+            problem['repaired'] = True
+            continue
+        try:
+            fix()
+        except (OSError, ValueError, KanbanError, sqlite3.DatabaseError) as e:
+            warn(f"Could not repair {problem['file']}: {e}")
+            continue
+        if name:
+            done.add(name)
+        problem['repaired'] = True
+
+# Board Daemon
+# `serve` keeps the board in memory and answers the CLI over local HTTP
+
+DAEMON_FILE = CACHE_DIR / "daemon.json"
+DEFAULT_DAEMON_PORT = 3002
+
+# inotify event bits (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_Q_OVERFLOW = 0x4000
+
+class BoardState:
+    """In-memory board kept current by refreshing only changed task files"""
+
+    def __init__(self, workers=None):
+        self.lock = threading.RLock()
+        self.workers = workers
+        self.entries = load_task_cache()
+        self.columns = {column: {} for column in COLUMNS}
+        self.refresh()
+
+    def refresh(self):
+        """Re-stat every task file and re-read the ones that changed"""
+        global _ID_INDEX
+        with self.lock:
+            entries, tasks, dirty = scan_board(self.entries, self.workers)
+            self.entries = entries
+            self.columns = {column: {task.task_file.name: task for task in tasks[column]}
+                            for column in COLUMNS}
+            if dirty:
+                _ID_INDEX = None
+                save_task_cache(entries)
+            return dirty
+
+    def refresh_paths(self, keys):
+        """Re-read just the given "column/filename" task files"""
+        global _ID_INDEX
+        with self.lock:
+            for key in keys:
+                column, name = key.split('/', 1)
+                task_file = KANBAN_DIR / column / name
+                try:
+                    stat = task_file.stat()
+                    entry = cache_entry(stat, *read_frontmatter_block(task_file))
+                except FileNotFoundError:
+                    self.entries.pop(key, None)
+                    self.columns[column].pop(name, None)
+                    continue
+                except Exception as e:
+                    warn(f"Could not load {name}: {e}")
+                    continue
+                self.entries[key] = entry
+                self.columns[column][name] = TaskRecord(entry['fields'], column, name, entry['body'])
+            _ID_INDEX = None
+            save_task_cache(self.entries)
+
+    def refresh_task(self, task_id):
+        """Re-read a task in whichever columns it was or now is"""
+        self.refresh_paths([f"{column}/{task_id}.md" for column in COLUMNS])
+
+    def tasks(self, where=None):
+        """Tasks by column, sorted like get_all_tasks, optionally filtered by a query expression"""
+        with self.lock:
+            tasks = {column: [self.columns[column][name] for name in sorted(self.columns[column])]
+                     for column in COLUMNS}
+        return filter_tasks(tasks, where) if where else tasks
+
+    def id_index(self):
+        """ID -> column mapping built from memory"""
+        with self.lock:
+            index = {}
+            for column in COLUMNS:
+                for name in self.columns[column]:
+                    index.setdefault(name[:-3], column)
+            return index
+
+    def find(self, task_id):
+        """Fully parsed task and its column, or (None, None)"""
+        with self.lock:
+            for column in COLUMNS:
+                if f"{task_id}.md" in self.columns[column]:
+                    return load_task(KANBAN_DIR / column / f"{task_id}.md"), column
+        return None, None
+
+class InotifyWatcher:
+    """Watch the column folders with Linux inotify (via ctypes, no extra dependency)"""
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.columns = {}
+        for column in COLUMNS:
+            path = str(KANBAN_DIR / column).encode()
+            wd = self.libc.inotify_add_watch(self.fd, path, self.MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {column}")
+            self.columns[wd] = column
+
+    def wait(self, debounce):
+        """Block until files change; return changed "column/filename" keys (None = rescan)"""
+        import select
+        import struct
+
+        keys = set()
+        timeout = None
+        while True:
+            readable, _, _ = select.select([self.fd], [], [], timeout)
+            if not readable:
+                return keys
+            data = os.read(self.fd, 65536)
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = struct.unpack_from('iIII', data, offset)
+                name = data[offset + 16:offset + 16 + length].rstrip(b'\0').decode()
+                offset += 16 + length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if name.startswith('TASK-') and name.endswith('.md') and wd in self.columns:
+                    keys.add(f"{self.columns[wd]}/{name}")
+            # Collect the rest of a burst before refreshing
+            timeout = debounce
+
+def watch_board(board, poll_interval, use_inotify=True, debounce=0.05, on_change=None):
+    """Keep board current: inotify when available, otherwise stat polling
+
+    on_change, if given, is called from the watch thread after each refresh
+    with the set of columns that changed (None = any column may have).
+    """
+    watcher = None
+    if use_inotify and sys.platform.startswith('linux'):
+        try:
+            watcher = InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            warn(f"inotify unavailable ({e}), polling every {poll_interval}s")
+
+    def run():
+        while True:
+            if watcher:
+                keys = watcher.wait(debounce)
+                if keys is None:
+                    board.refresh()
+                    changed = None
+                elif keys:
+                    board.refresh_paths(keys)
+                    changed = {key.split('/', 1)[0] for key in keys}
+                else:
+                    continue
+            else:
+                time.sleep(poll_interval)
+                if not board.refresh():
+                    continue
+                changed = None
+            if on_change:
+                on_change(changed)
+
+    thread = threading.Thread(target=run, name='kanban-watch', daemon=True)
+    thread.start()
+    return 'inotify' if watcher else 'polling'
+
+# POST /op runs the change hooks with the client's MQTT_URL swapped in, so
+# operations are applied one at a time
+_daemon_op_lock = threading.Lock()
+
+def handle_daemon_request(board, method, path, query, body):
+    """Route one API request; returns (HTTP status, JSON-able result)"""
+    global MQTT_URL
+    metadata = load_metadata()
+    parts = [part for part in path.split('/') if part]
+
+    if method == 'GET' and parts == ['health']:
+        return 200, {'ok': True, 'pid': os.getpid()}
+    if method == 'GET' and parts == ['show']:
+        column = query.get('column')
+        if column and column not in COLUMNS:
+            return 400, {'ok': False, 'error': f"Unknown column '{column}'"}
+        return 200, board_view(board.tasks(query.get('where')), metadata, column)
+    if method == 'GET' and parts == ['stats']:
+        return 200, board_stats(board.tasks(query.get('where')), metadata)
+    if method == 'GET' and parts == ['query']:
+        return 200, [task_summary(task, column) for column, tasks in board.tasks(query.get('q')).items()
+                     for task in tasks]
+    if method == 'GET' and len(parts) == 2 and parts[0] == 'details':
+        task, column = board.find(parts[1])
+        if not task:
+            task, column = find_task(parts[1], archived=True)
+        if not task:
+            return 404, {'ok': False, 'error': f"Task {parts[1]} not found"}
+        return 200, task_details(task, column, metadata)
+    if method == 'GET' and parts == ['ids']:
+        matches = find_task_ids(query.get('prefix'), query.get('from'), query.get('to'),
+                                index=board.id_index())
+        return 200, [{'id': task_id, 'column': column} for task_id, column in matches]
+    if method == 'GET' and parts == ['search']:
+        return 200, search_tasks(query.get('q', ''), query.get('column'),
+                                 int(query.get('limit', 20)), query.get('any') == '1')
+    if method == 'POST' and parts == ['op']:
+        with _daemon_op_lock:
+            # Publish change events as the client's --mqtt / KANBAN_MQTT_URL says
+            # (an empty value: not at all), not as the daemon's own setting
+            daemon_mqtt_url = MQTT_URL
+            if 'mqtt' in query:
+                MQTT_URL = query['mqtt'] or None
+            try:
+                result = apply_operation(body)
+            except KanbanError as e:
+                status = 404 if str(e).endswith('not found') else 400
+                return status, {'ok': False, 'error': str(e)}
+            finally:
+                MQTT_URL = daemon_mqtt_url
+        if isinstance(result, dict) and result.get('id'):
+            board.refresh_task(result['id'])
+        return 200, result
+
+    return 404, {'ok': False, 'error': f"No route for {method} {path}"}
+
+def serve_board(host, port, poll_interval, use_inotify):
+    """Run the board daemon until interrupted"""
+    import http.server
+    import signal
+    from urllib.parse import urlsplit, parse_qsl
+
+    require_markdown_storage('serve')
+    for column in COLUMNS:
+        (KANBAN_DIR / column).mkdir(exist_ok=True)
+    board = BoardState()
+    mode = watch_board(board, poll_interval, use_inotify)
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def handle_request(self, method):
+            url = urlsplit(self.path)
+            body = None
+            if method == 'POST':
+                length = int(self.headers.get('Content-Length') or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b'null')
+                except ValueError as e:
+                    return self.send_json(400, {'ok': False, 'error': f"Invalid JSON: {e}"})
+            try:
+                status, result = handle_daemon_request(board, method, url.path,
+                                                       dict(parse_qsl(url.query, keep_blank_values=True)),
+                                                       body)
+            except KanbanError as e:
+                status, result = 400, {'ok': False, 'error': str(e)}
+            except Exception as e:
+                status, result = 500, {'ok': False, 'error': str(e)}
+            self.send_json(status, result)
+
+        def send_json(self, status, result):
+            data = json.dumps(result, default=str).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self.handle_request('GET')
+
+        def do_POST(self):
+            self.handle_request('POST')
+
+        def log_message(self, format, *args):
+            pass
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    server = http.server.ThreadingHTTPServer((host, port), Handler)
+    CACHE_DIR.mkdir(exist_ok=True)
+    write_json_atomic(DAEMON_FILE, {'pid': os.getpid(), 'host': host,
+                                    'port': server.server_address[1],
+                                    'started_at': datetime.now().isoformat()})
+    console.print(f"[green]✓[/green] Serving board on http://{host}:{server.server_address[1]} "
+                  f"({len(board.entries)} tasks, {mode})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            with open(DAEMON_FILE, 'r') as f:
+                if json.load(f).get('pid') == os.getpid():
+                    DAEMON_FILE.unlink()
+        except (OSError, ValueError):
+            pass
+
+def daemon_request(method, path, payload=None):
+    """Send a request to a running board daemon
+
+    Returns the decoded JSON result, or None when no daemon is running or it
+    cannot be reached (callers then do the work locally). API errors raise
+    KanbanError.
+    """
+    if not USE_DAEMON:
+        return None
+    try:
+        with open(DAEMON_FILE, 'r') as f:
+            info = json.load(f)
+        os.kill(info['pid'], 0)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    import urllib.error
+    import urllib.request
+
+    data = json.dumps(payload).encode() if payload is not None else None
+    request = urllib.request.Request(f"http://{info['host']}:{info['port']}{path}", data=data,
+                                     method=method, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=DAEMON_TIMEOUT) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            error = json.loads(e.read()).get('error')
+        except (ValueError, AttributeError):
+            error = None
+        if error and e.code < 500:
+            raise KanbanError(error)
+        return None
+    except (OSError, ValueError):
+        return None
+
+def run_operation(operation):
+    """Apply an operation through the daemon if one is running, else locally"""
+    from urllib.parse import urlencode
+
+    result = daemon_request('POST', '/op?' + urlencode({'mqtt': MQTT_URL or ''}), operation)
+    if result is None:
+        result = apply_operation(operation)
+    return result
+
+# Live Dashboard
+# show/stats --watch: tasks stay in memory (BoardState), the column folders are
+# watched (watch_board) and only changed files are re-read; a burst of changes
+# becomes one redraw that rebuilds only the columns it touched
+
+# Seconds between rescans (markdown without inotify) or board.db revision checks
+WATCH_POLL_INTERVAL = 1.0
+
+class BoardWatch:
+    """In-memory board plus the columns changed since the last redraw"""
+
+    def __init__(self):
+        self.changes = threading.Condition()
+        self.pending = None  # changed columns; None = all, empty = nothing to redraw
+        if STORAGE.name == 'markdown':
+            for column in COLUMNS:
+                (KANBAN_DIR / column).mkdir(exist_ok=True)
+            self.board = BoardState()
+            self.mode = watch_board(self.board, WATCH_POLL_INTERVAL, on_change=self.changed)
+        else:
+            # No files to watch: reload whenever the board.db revision moves
+            self.board = None
+            self.snapshot = get_all_tasks()
+            self.mode = 'polling'
+            threading.Thread(target=self.poll_storage, name='kanban-watch', daemon=True).start()
+
+    def changed(self, columns):
+        with self.changes:
+            if self.pending is not None:
+                self.pending = None if columns is None else self.pending | columns
+            self.changes.notify()
+
+    def poll_storage(self):
+        stamps = STORAGE.stamps()
+        while True:
+            time.sleep(WATCH_POLL_INTERVAL)
+            current = STORAGE.stamps()
+            if current == stamps:
+                continue
+            stamps = current
+            tasks = get_all_tasks()
+            with self.changes:
+                self.snapshot = tasks
+            self.changed(None)
+
+    def wait(self, debounce):
+        """Block until the board changes, give the rest of the burst `debounce`
+        seconds to land, then return (tasks by column, changed columns or None)"""
+        with self.changes:
+            while self.pending == set():
+                self.changes.wait()
+        time.sleep(debounce)
+        with self.changes:
+            columns, self.pending = self.pending, set()
+            tasks = self.board.tasks() if self.board else self.snapshot
+        return tasks, columns
+
+def watch_dashboard(update, renderables, debounce):
+    """Redraw until interrupted
+
+    update(tasks, changed columns or None) returns the command's result for the
+    current board; it is printed as one JSON line per update with --json/--jsonl,
+    otherwise renderables(result) gives the rich tables for a full-screen Live view.
+    """
+    watch = BoardWatch()
+    try:
+        if OUTPUT_FORMAT:
+            while True:
+                click.echo(json.dumps(update(*watch.wait(debounce)), default=str))
+
+        from rich.console import Group
+        from rich.live import Live
+        from rich.text import Text
+
+        with Live(console=console.get(), screen=True, auto_refresh=False) as live:
+            while True:
+                result = update(*watch.wait(debounce))
+                # Status first: a board taller than the screen is cropped at the bottom
+                status = Text.from_markup(f"[dim]Updated {datetime.now():%H:%M:%S} · watching "
+                                          f"({watch.mode}) · Ctrl+C to exit[/dim]")
+                live.update(Group(status, *renderables(result)), refresh=True)
+    except KeyboardInterrupt:
+        pass
+
+def watch_show(column, where, debounce):
+    """show --watch: re-filter and re-render only the columns that changed"""
+    predicate = query_predicate(parse_query(where)) if where else None
+    metadata = load_metadata()
+    view, tables = {}, {}
+
+    def update(tasks, changed):
+        for col in ([column] if column else COLUMNS):
+            if changed is None or col in changed or col not in view:
+                col_tasks = [task for task in tasks[col] if predicate(task, col)] if predicate else tasks[col]
+                view[col] = board_view({col: col_tasks}, metadata, col)[col]
+                tables.pop(col, None)
+        return view
+
+    def renderables(view):
+        for col in view:
+            if col not in tables:
+                tables[col] = column_table(view[col])
+        return [tables[col] for col in view]
+
+    watch_dashboard(update, renderables, debounce)
+
+def watch_stats(where, debounce):
+    """stats --watch: recount only the columns that changed"""
+    predicate = query_predicate(parse_query(where)) if where else None
+    metadata = load_metadata()
+    counts = {}
+
+    def update(tasks, changed):
+        for col in COLUMNS:
+            if changed is None or col in changed or col not in counts:
+                col_tasks = [task for task in tasks[col] if predicate(task, col)] if predicate else tasks[col]
+                counts[col] = count_cells({col: col_tasks}, [col])
+        return stats_from_counts({cell: count for col_counts in counts.values()
+                                  for cell, count in col_counts.items()}, metadata)
+
+    watch_dashboard(update, stats_tables, debounce)
+
+# Profiling
+# --profile / KANBAN_TRACE: wall time per phase (exclusive of nested phases)
+# and I/O counters. Enabling it swaps the functions in TRACED_PHASES for timed
+# wrappers, so an untraced run pays only a few `if TRACE:` counter checks
+
+# Module-level function -> phase it is timed under
+TRACED_PHASES = {
+    'list_column_files': 'list',
+    'scan_board': 'scan',
+    'read_frontmatter': 'read',
+    'read_frontmatter_block': 'read',
+    'read_task_body': 'read',
+    'load_task': 'read',
+    'parse_frontmatter': 'parse_frontmatter',
+    'parse_task_body': 'parse_sections',
+    'parse_markdown_sections': 'parse_sections',
+    'task_to_markdown': 'render_markdown',
+    'write_text_atomic': 'write',
+    'load_metadata': 'metadata_read',
+    'save_metadata': 'metadata_write',
+    'reserve_task_ids': 'metadata_write',
+    'load_task_cache': 'cache',
+    'save_task_cache': 'cache',
+    'load_id_index': 'cache',
+    'save_id_index': 'cache',
+    'sync_board_index': 'index',
+    'board_counts': 'index',
+    'query_tasks': 'index',
+    'search_tasks': 'index',
+    'journal_extend': 'journal',
+    'journal_state': 'journal',
+    'daemon_request': 'daemon',
+    'emit': 'render',
+    'render_board': 'render',
+    'render_details': 'render',
+    'render_stats': 'render',
+    'render_analytics': 'render',
+}
+
+class Trace:
+    """Phase timings and counters collected while --profile is on
+
+    Each thread keeps its own stack of open phases, so time spent in a nested
+    phase is only counted once. Phases run on the loader pool are summed over
+    its threads and can add up to more than the wall time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.phases = {}
+        self.counters = {}
+
+    def count(self, **amounts):
+        with self.lock:
+            for name, amount in amounts.items():
+                self.counters[name] = self.counters.get(name, 0) + amount
+
+    def wrap(self, phase, function):
+        """function timed under phase"""
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            stack = self.local.__dict__.setdefault('stack', [])
+            stack.append(0.0)  # time spent in nested phases
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                with self.lock:
+                    entry = self.phases.setdefault(phase, [0, 0.0])
+                    entry[0] += 1
+                    entry[1] += elapsed - nested
+        return traced
+
+    def report(self, command):
+        total = time.perf_counter() - _PROCESS_START
+        phases = {name: {'calls': calls, 'seconds': round(seconds, 6)}
+                  for name, (calls, seconds) in sorted(self.phases.items(), key=lambda item: -item[1][1])}
+        return {
+            'command': command,
+            'total_s': round(total, 6),
+            'startup_s': round(self.started - _PROCESS_START, 6),
+            # Pool threads can push the phase sum past the wall time
+            'other_s': round(max(0.0, total - (self.started - _PROCESS_START) -
+                                 sum(seconds for _, seconds in self.phases.values())), 6),
+            'phases': phases,
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+def enable_trace():
+    """Start collecting a Trace: wrap the TRACED_PHASES functions and change hooks"""
+    global TRACE
+    TRACE = Trace()
+    TRACE.started = time.perf_counter()
+    module = sys.modules[__name__]
+    for name, phase in TRACED_PHASES.items():
+        setattr(module, name, TRACE.wrap(phase, getattr(module, name)))
+    CHANGE_HOOKS[:] = [TRACE.wrap('hooks', hook) for hook in CHANGE_HOOKS]
+
+def print_trace_summary(report):
+    """Plain-text profile summary on stderr (stdout stays clean for --json)"""
+    lines = [f"Profile of `{report['command']}`: {report['total_s']:.3f} s total, "
+             f"{report['startup_s']:.3f} s startup, {report['other_s']:.3f} s untraced",
+             f"  {'phase':<18} {'calls':>8} {'seconds':>10} {'share':>7}"]
+    for name, phase in report['phases'].items():
+        share = phase['seconds'] / report['total_s'] if report['total_s'] else 0
+        lines.append(f"  {name:<18} {phase['calls']:>8} {phase['seconds']:>10.4f} {share:>7.1%}")
+    if report['counters']:
+        lines.append('  ' + ', '.join(f"{name} {value:,}" for name, value in report['counters'].items()))
+    click.echo('\n'.join(lines), err=True)
+
+# CLI Commands
+
+@click.group()
+@click.option('--workers', type=click.IntRange(min=1), envvar='KANBAN_WORKERS',
+              help='Threads used to load task files (default: based on CPU count, 1 = serial)')
+@click.option('--json', 'output_format', flag_value='json',
+              help='Print machine-readable JSON instead of tables')
+@click.option('--jsonl', 'output_format', flag_value='jsonl',
+              help='Print JSON lines (one task/record per line)')
+@click.option('--no-daemon', is_flag=True, envvar='KANBAN_NO_DAEMON',
+              help='Work on the files directly even if a `serve` daemon is running')
+@click.option('--mqtt', 'mqtt_url', envvar='KANBAN_MQTT_URL', metavar='URL',
+              help='Publish board changes to this MQTT broker, e.g. mqtt://localhost:1883')
+@click.option('--profile', is_flag=True, envvar='KANBAN_TRACE',
+              help='Print per-phase timings and I/O counters to stderr when the command ends')
+@click.option('--profile-json', type=click.Path(dir_okay=False), envvar='KANBAN_TRACE_JSON',
+              help='Write the per-phase timings and counters to this JSON file')
+@click.option('--cprofile', type=click.Path(dir_okay=False), envvar='KANBAN_CPROFILE',
+              help='Also run cProfile and dump its stats to this file (read with pstats/snakeviz)')
+@click.pass_context
+def cli(ctx, workers, output_format, no_daemon, mqtt_url, profile, profile_json, cprofile):
+    """Kanban board management for TerrainIQ Dashcam Development"""
+    global LOAD_WORKERS, OUTPUT_FORMAT, USE_DAEMON, MQTT_URL
+    LOAD_WORKERS = workers
+    OUTPUT_FORMAT = output_format
+    USE_DAEMON = not no_daemon
+    if mqtt_url:
+        try:
+            parse_mqtt_url(mqtt_url)
+        except KanbanError as e:
+            raise click.BadParameter(str(e), param_hint='--mqtt')
+        MQTT_URL = mqtt_url
+
+    if not (profile or profile_json or cprofile):
+        return
+    enable_trace()
+    profiler = None
+    if cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(cprofile)
+        report = TRACE.report(ctx.invoked_subcommand)
+        if profile_json:
+            with open(profile_json, 'w') as f:
+                json.dump(report, f, indent=2)
+        if profile or not (profile_json or cprofile):
+            print_trace_summary(report)
+
+    ctx.call_on_close(finish)
+
+@cli.command()
+@click.option('--column', type=click.Choice(COLUMNS), help='Show specific column only')
+@click.option('--where', help='Only tasks matching a query expression (see `query`)')
+@click.option('--watch', is_flag=True, help='Keep the board on screen, redrawing as tasks change')
+@click.option('--debounce', default=0.25, show_default=True,
+              help='With --watch, seconds to collect a burst of changes into one redraw')
+def show(column, where, watch, debounce):
+    """Display the kanban board"""
+    from urllib.parse import urlencode
+
+    try:
+        if watch:
+            return watch_show(column, where, debounce)
+        view = daemon_request('GET', '/show?' + urlencode({key: value for key, value in
+                                                           {'column': column, 'where': where}.items() if value}))
+        if view is None:
+            view = board_view(query_tasks(where) if where else get_all_tasks(), load_metadata(), column)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(view, [task for col in view.values() for task in col['tasks']])
+        return
+
+    render_board(view)
+
+def render_board(view):
+    """Print a board_view as one rich table per column"""
+    for col in view.values():
+        console.print(column_table(col))
+
+def column_table(col):
+    """rich table for one board_view column (a dim line when it is empty)"""
+    from rich.table import Table
+    from rich.text import Text
+
+    if not col['tasks']:
+        return Text.from_markup(f"\n[dim]{col['name']}: No tasks[/dim]")
+
+    table = Table(title=f"\n{col['name']} ({len(col['tasks'])} tasks)",
+                 title_style="bold cyan")
+
+    table.add_column("ID", style="cyan", width=10)
+    table.add_column("Title", style="white", width=40)
+    table.add_column("Type", width=10)
+    table.add_column("Priority", width=10)
+    table.add_column("Assignee", width=12)
+
+    for task in col['tasks']:
+        type_color = get_color_for_type(task.get('type') or 'feature')
+        priority_color = get_color_for_priority(task.get('priority') or 'medium')
+        assignee_style = "green" if task.get('assignee') == 'agent' else "blue" if task.get('assignee') == 'human' else "dim"
+
+        table.add_row(
+            f"[cyan]{task['id']}[/cyan]",
+            task['title'][:38] + "..." if len(task['title']) > 40 else task['title'],
+            f"[{type_color}]{task.get('type') or 'feature'}[/{type_color}]",
+            f"[{priority_color}]{task.get('priority') or 'medium'}[/{priority_color}]",
+            f"[{assignee_style}]{task.get('assignee') or 'unassigned'}[/{assignee_style}]"
+        )
+
+    return table
+
+@cli.command()
+@click.option('--title', prompt='Task title', help='Task title')
+@click.option('--description', prompt='Description', help='Detailed description')
+@click.option('--type', type=click.Choice(TASK_TYPES),
+              prompt='Type', help='Task type')
+@click.option('--priority', type=click.Choice(PRIORITIES),
+              prompt='Priority', help='Task priority')
+@click.option('--assignee', type=click.Choice(ASSIGNEES),
+              default='unassigned', help='Task assignee')
+@click.option('--use-case', default='', help='Related use case ID')
+@click.option('--id', 'task_id', help='Use an ID previously reserved with reserve-ids')
+def add(title, description, type, priority, assignee, use_case, task_id):
+    """Add new task to backlog"""
+    try:
+        operation = {'op': 'add', 'title': title, 'description': description, 'type': type,
+                     'priority': priority, 'assignee': assignee, 'use_case': use_case}
+        if task_id:
+            operation['id'] = task_id
+        result = run_operation(operation)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    console.print(f"[green]✓[/green] Created task [cyan]{result['id']}[/cyan]: {title}")
+    console.print(f"[dim]Task added to backlog[/dim]")
+
+@cli.command()
+@click.argument('task_id')
+@click.argument('column', type=click.Choice(COLUMNS))
+def move(task_id, column):
+    """Move task to a different column"""
+    try:
+        result = run_operation({'op': 'move', 'id': task_id, 'column': column})
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    if not result['moved']:
+        console.print(f"[yellow]Task {task_id} is already in {column}[/yellow]")
+        return
+
+    console.print(f"[green]✓[/green] Moved [cyan]{task_id}[/cyan] from [yellow]{result['from']}[/yellow] to [green]{column}[/green]")
+
+@cli.command()
+@click.argument('task_id')
+@click.argument('assignee', type=click.Choice(ASSIGNEES))
+def assign(task_id, assignee):
+    """Assign task to agent or human"""
+    try:
+        result = run_operation({'op': 'assign', 'id': task_id, 'assignee': assignee})
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    assignee_color = "green" if assignee == 'agent' else "blue" if assignee == 'human' else "dim"
+    console.print(f"[green]✓[/green] Assigned [cyan]{task_id}[/cyan] to [{assignee_color}]{assignee}[/{assignee_color}]")
+
+@cli.command()
+@click.argument('task_id')
+def details(task_id):
+    """Show detailed task information"""
+    try:
+        result = daemon_request('GET', f"/details/{task_id}")
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if result is None:
+        task, column = find_task(task_id, archived=True)
+
+        if not task:
+            report_error(f"Task {task_id} not found")
+            return
+
+        result = task_details(task, column, load_metadata())
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    render_details(result)
+
+def render_details(task):
+    """Print a task_details result"""
+    col_name = task['column_name']
+
+    console.print()
+    console.print(f"[bold cyan]{'='*70}[/bold cyan]")
+    console.print(f"[bold]Task Details: {task['id']}[/bold]")
+    console.print(f"[bold cyan]{'='*70}[/bold cyan]")
+    console.print()
+
+    console.print(f"[bold]Title:[/bold] {task['title']}")
     console.print(f"[bold]Description:[/bold] {task['description']}")
     console.print()
 
@@ -450,6 +4840,8 @@ def details(task_id):
     console.print(f"[bold]Type:[/bold] [{type_color}]{task.get('type', 'feature')}[/{type_color}]")
     console.print(f"[bold]Priority:[/bold] [{priority_color}]{task.get('priority', 'medium')}[/{priority_color}]")
     console.print(f"[bold]Assignee:[/bold] {task.get('assignee', 'unassigned')}")
+    if task.get('lease_owner'):
+        console.print(f"[bold]Claimed by:[/bold] {task['lease_owner']} (lease until {task.get('lease_expires_at')})")
     console.print(f"[bold]Status:[/bold] [yellow]{col_name}[/yellow]")
     console.print()
 
@@ -487,10 +4879,43 @@ def details(task_id):
     console.print()
 
 @cli.command()
-def stats():
+@click.option('--where', help='Only count tasks matching a query expression (see `query`)')
+@click.option('--resync', is_flag=True, help='Re-check every task file first (catches edits made in place)')
+@click.option('--watch', is_flag=True, help='Keep the statistics on screen, updating as tasks change')
+@click.option('--debounce', default=0.25, show_default=True,
+              help='With --watch, seconds to collect a burst of changes into one redraw')
+def stats(where, resync, watch, debounce):
     """Show board statistics"""
-    tasks = get_all_tasks()
-    metadata = load_metadata()
+    from urllib.parse import urlencode
+
+    try:
+        if watch:
+            return watch_stats(where, debounce)
+        # The daemon's in-memory board is already current
+        result = daemon_request('GET', '/stats' + (f"?{urlencode({'where': where})}" if where else ''))
+        if result is None:
+            metadata = load_metadata()
+            result = (board_stats(query_tasks(where), metadata) if where
+                      else stats_from_counts(board_counts(resync), metadata))
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    render_stats(result)
+
+def render_stats(result):
+    """Print a board_stats result as rich tables"""
+    for table in stats_tables(result):
+        console.print(table)
+    console.print()
+
+def stats_tables(result):
+    """rich tables (column counts, priority breakdown) for a board_stats result"""
+    from rich.table import Table
 
     # Overall stats table
     table = Table(title="\nKanban Board Statistics", title_style="bold cyan")
@@ -500,125 +4925,79 @@ def stats():
     table.add_column("Human", justify="right", width=10)
     table.add_column("Unassigned", justify="right", width=12)
 
-    total_tasks = 0
-    total_agent = 0
-    total_human = 0
-    total_unassigned = 0
-
-    for col in COLUMNS:
-        col_meta = metadata['columns'][col]
-        col_tasks = tasks[col]
-        count = len(col_tasks)
-        total_tasks += count
-
-        agent_count = sum(1 for t in col_tasks if t.get('assignee') == 'agent')
-        human_count = sum(1 for t in col_tasks if t.get('assignee') == 'human')
-        unassigned_count = sum(1 for t in col_tasks if t.get('assignee', 'unassigned') == 'unassigned')
-
-        total_agent += agent_count
-        total_human += human_count
-        total_unassigned += unassigned_count
+    for counts in result['columns'].values():
+        agent_count = counts['agent']
+        human_count = counts['human']
+        unassigned_count = counts['unassigned']
 
         table.add_row(
-            col_meta['name'],
-            str(count),
+            counts['name'],
+            str(counts['count']),
             f"[green]{agent_count}[/green]" if agent_count else "[dim]0[/dim]",
             f"[blue]{human_count}[/blue]" if human_count else "[dim]0[/dim]",
             f"[yellow]{unassigned_count}[/yellow]" if unassigned_count else "[dim]0[/dim]"
         )
 
+    total = result['total']
     table.add_row(
         "[bold]TOTAL[/bold]",
-        f"[bold]{total_tasks}[/bold]",
-        f"[bold green]{total_agent}[/bold green]",
-        f"[bold blue]{total_human}[/bold blue]",
-        f"[bold yellow]{total_unassigned}[/bold yellow]"
+        f"[bold]{total['count']}[/bold]",
+        f"[bold green]{total['agent']}[/bold green]",
+        f"[bold blue]{total['human']}[/bold blue]",
+        f"[bold yellow]{total['unassigned']}[/bold yellow]"
     )
 
-    console.print(table)
-
     # Priority breakdown
     priority_table = Table(title="\nPriority Breakdown", title_style="bold cyan")
     priority_table.add_column("Priority", style="cyan")
     priority_table.add_column("Count", justify="right")
 
-    all_tasks = []
-    for col_tasks in tasks.values():
-        all_tasks.extend(col_tasks)
-
-    for priority in ['critical', 'high', 'medium', 'low']:
-        count = sum(1 for t in all_tasks if t.get('priority') == priority)
+    for priority, count in result['priorities'].items():
         color = get_color_for_priority(priority)
         priority_table.add_row(
             f"[{color}]{priority.capitalize()}[/{color}]",
             f"[{color}]{count}[/{color}]" if count else "[dim]0[/dim]"
         )
 
-    console.print(priority_table)
-    console.print()
+    return [table, priority_table]
 
 @cli.command()
 @click.argument('task_id')
 @click.option('--title', help='Update title')
 @click.option('--description', help='Update description')
-@click.option('--priority', type=click.Choice(['low', 'medium', 'high', 'critical']), help='Update priority')
-@click.option('--type', type=click.Choice(['feature', 'bug', 'test', 'docs', 'refactor']), help='Update type')
+@click.option('--priority', type=click.Choice(PRIORITIES), help='Update priority')
+@click.option('--type', type=click.Choice(TASK_TYPES), help='Update type')
 @click.option('--add-note', help='Add a note')
 @click.option('--add-tag', help='Add a tag')
 def update(task_id, title, description, priority, type, add_note, add_tag):
     """Update task properties"""
-    task, column = find_task(task_id)
-
-    if not task:
-        console.print(f"[red]Error: Task {task_id} not found[/red]")
+    try:
+        changes = {'title': title, 'description': description, 'priority': priority,
+                   'type': type, 'add_note': add_note, 'add_tag': add_tag}
+        result = run_operation(dict({'op': 'update', 'id': task_id},
+                                    **{key: value for key, value in changes.items() if value}))
+    except KanbanError as e:
+        report_error(str(e))
         return
 
-    updated = False
-
-    if title:
-        task['title'] = title
-        updated = True
-        console.print(f"[green]✓[/green] Updated title")
-
-    if description:
-        task['description'] = description
-        updated = True
-        console.print(f"[green]✓[/green] Updated description")
-
-    if priority:
-        task['priority'] = priority
-        updated = True
-        console.print(f"[green]✓[/green] Updated priority to {priority}")
-
-    if type:
-        task['type'] = type
-        updated = True
-        console.print(f"[green]✓[/green] Updated type to {type}")
-
-    if add_note:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        note_with_time = f"[{timestamp}] {add_note}"
-        if 'notes' not in task:
-            task['notes'] = []
-        task['notes'].append(note_with_time)
-        updated = True
-        console.print(f"[green]✓[/green] Added note")
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
 
-    if add_tag:
-        tags = task.get('tags', [])
-        if isinstance(tags, str):
-            tags = [t.strip() for t in tags.split(',') if t.strip()]
-        if add_tag not in tags:
-            tags.append(add_tag)
-            task['tags'] = tags
-            updated = True
-            console.print(f"[green]✓[/green] Added tag: {add_tag}")
-        else:
-            console.print(f"[yellow]Tag '{add_tag}' already exists[/yellow]")
+    messages = {
+        'title': "Updated title",
+        'description': "Updated description",
+        'priority': f"Updated priority to {priority}",
+        'type': f"Updated type to {type}",
+        'note': "Added note",
+        'tag': f"Added tag: {add_tag}",
+    }
+    for change in result['changes']:
+        console.print(f"[green]✓[/green] {messages[change]}")
+    if 'tag' in result['skipped']:
+        console.print(f"[yellow]Tag '{add_tag}' already exists[/yellow]")
 
-    if updated:
-        task['updated_at'] = datetime.now().isoformat()
-        save_task(task, column)
+    if result['changes']:
         console.print(f"[green]✓[/green] Task [cyan]{task_id}[/cyan] updated")
     else:
         console.print("[yellow]No updates specified[/yellow]")
@@ -628,33 +5007,619 @@ def update(task_id, title, description, priority, type, add_note, add_tag):
 @click.confirmation_option(prompt='Are you sure you want to delete this task?')
 def delete(task_id):
     """Delete task permanently"""
-    task, column = find_task(task_id)
-
-    if not task:
-        console.print(f"[red]Error: Task {task_id} not found[/red]")
+    try:
+        result = run_operation({'op': 'delete', 'id': task_id})
+    except KanbanError as e:
+        report_error(str(e))
         return
 
-    task_file = KANBAN_DIR / column / f"{task_id}.md"
-    task_file.unlink()
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
 
     console.print(f"[green]✓[/green] Deleted task [cyan]{task_id}[/cyan]")
 
+@cli.command()
+@click.option('--type', 'types', type=click.Choice(TASK_TYPES), multiple=True,
+              help='Only claim a task of this type (repeatable)')
+@click.option('--tag', 'tags', multiple=True, help='Only claim a task with this tag (repeatable, all must match)')
+@click.option('--ttl', type=click.IntRange(min=1), default=DEFAULT_LEASE_TTL, show_default=True,
+              help='Lease length in seconds')
+@click.option('--owner', envvar='KANBAN_AGENT', help='Lease holder (default: $KANBAN_AGENT, else user@host)')
+def claim(types, tags, ttl, owner):
+    """Take the most urgent unassigned ready task and move it to in_progress
+
+    The task is leased to the owner for --ttl seconds. Keep it with `renew`,
+    finish it with `move`, or hand it back with `release`; a task whose lease
+    runs out returns to ready.
+    """
+    owner = owner or default_lease_owner()
+    try:
+        result = run_operation({'op': 'claim', 'owner': owner, 'ttl': ttl, 'type': list(types), 'tags': list(tags)})
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    console.print(f"[green]✓[/green] Claimed [cyan]{result['id']}[/cyan] ({result['priority']}): {result['title']}")
+    console.print(f"[dim]Leased to {owner} until {result['lease_expires_at']}[/dim]")
+
+@cli.command()
+@click.argument('task_id')
+@click.option('--ttl', type=click.IntRange(min=1), default=DEFAULT_LEASE_TTL, show_default=True,
+              help='New lease length in seconds, from now')
+@click.option('--owner', envvar='KANBAN_AGENT', help='Lease holder (default: $KANBAN_AGENT, else user@host)')
+def renew(task_id, ttl, owner):
+    """Extend the lease on a claimed task"""
+    try:
+        result = run_operation({'op': 'renew', 'id': task_id, 'owner': owner or default_lease_owner(), 'ttl': ttl})
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    console.print(f"[green]✓[/green] Lease on [cyan]{task_id}[/cyan] renewed until {result['lease_expires_at']}")
+
+@cli.command()
+@click.argument('task_id')
+@click.option('--owner', envvar='KANBAN_AGENT', help='Lease holder (default: $KANBAN_AGENT, else user@host)')
+@click.option('--force', is_flag=True, help='Release even if someone else holds the lease')
+def release(task_id, owner, force):
+    """Give a claimed task back to ready, unassigned"""
+    try:
+        result = run_operation({'op': 'release', 'id': task_id, 'owner': owner or default_lease_owner(),
+                                'force': force})
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    console.print(f"[green]✓[/green] Released [cyan]{task_id}[/cyan] (held by {result['owner']}) back to ready")
+
 @cli.command()
 def list_files():
     """List all task files (debugging)"""
+    files = {column: [task_file.name for task_file in STORAGE.column_files(column)]
+             for column in COLUMNS}
+    if OUTPUT_FORMAT:
+        emit(files, [{'column': column, 'file': name} for column, names in files.items() for name in names])
+        return
+
     console.print("\n[bold]Task Files by Column:[/bold]\n")
 
     for column in COLUMNS:
-        column_path = KANBAN_DIR / column
-        if column_path.exists():
-            task_files = list(column_path.glob('TASK-*.md'))
-            console.print(f"[cyan]{column}[/cyan]: {len(task_files)} files")
-            for task_file in sorted(task_files):
-                console.print(f"  • {task_file.name}")
-        else:
+        if STORAGE.name == 'markdown' and not (KANBAN_DIR / column).exists():
             console.print(f"[dim]{column}: directory not found[/dim]")
+            continue
+        console.print(f"[cyan]{column}[/cyan]: {len(files[column])} files")
+        for name in files[column]:
+            console.print(f"  • {name}")
+
+    console.print()
+
+@cli.command()
+@click.argument('source', type=click.File('r'), default='-')
+@click.option('--stop-on-error', is_flag=True, help='Stop at the first failing operation')
+def batch(source, stop_on_error):
+    """Apply JSON-lines operations from SOURCE (default: stdin) in one process
+
+    Each line is an object with an "op" of add, move, assign, update, delete,
+    claim, renew or release plus that command's fields, e.g. {"op": "move", "id": "TASK-001", "column": "done"}.
+    One JSON result line is written per operation.
+    """
+    global OUTPUT_FORMAT
+    # stdout is JSON lines either way; this sends warnings to stderr
+    OUTPUT_FORMAT = OUTPUT_FORMAT or 'jsonl'
+    operations = []
+    for line_number, line in enumerate(source, 1):
+        if not line.strip():
+            continue
+        try:
+            operations.append((line_number, json.loads(line)))
+        except ValueError as e:
+            operations.append((line_number, KanbanError(f"Invalid JSON: {e}")))
+
+    # One metadata write for every add that needs a new ID
+    new_ids = sum(1 for _, op in operations
+                  if isinstance(op, dict) and op.get('op') == 'add' and 'id' not in op)
+    reserved_ids = iter(reserve_task_ids(new_ids) if new_ids else [])
+
+    failed = 0
+    with deferred_index_writes():
+        for line_number, operation in operations:
+            name = operation.get('op') if isinstance(operation, dict) else None
+            try:
+                if isinstance(operation, KanbanError):
+                    raise operation
+                result = {'line': line_number, 'op': name, 'ok': True,
+                          'result': apply_operation(operation, reserved_ids)}
+            except Exception as e:
+                # Whatever went wrong (e.g. a malformed task file, a failed write),
+                # every operation still gets its result line
+                failed += 1
+                result = {'line': line_number, 'op': name, 'ok': False, 'error': str(e)}
+            click.echo(json.dumps(result))
+            if failed and stop_on_error:
+                break
+
+    if failed:
+        sys.exit(1)
 
+@cli.command()
+@click.argument('count', type=click.IntRange(min=1))
+def reserve_ids(count):
+    """Reserve a block of task IDs for later use with add --id"""
+    task_ids = reserve_task_ids(count)
+
+    if OUTPUT_FORMAT:
+        emit(task_ids, [{'id': task_id} for task_id in task_ids])
+        return
+
+    for task_id in task_ids:
+        click.echo(task_id)
+
+@cli.command()
+@click.argument('prefix', required=False)
+@click.option('--from', 'start', help='First ID of an inclusive range')
+@click.option('--to', 'end', help='Last ID of an inclusive range')
+def ids(prefix, start, end):
+    """List task IDs from the index (PREFIX includes subtasks, e.g. TASK-006)"""
+    from urllib.parse import urlencode
+
+    query = urlencode({key: value for key, value in
+                       {'prefix': prefix, 'from': start, 'to': end}.items() if value})
+    try:
+        records = daemon_request('GET', f"/ids?{query}")
+        if records is None:
+            matches = find_task_ids(prefix, start, end)
+        else:
+            matches = [(record['id'], record['column']) for record in records]
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        records = [{'id': task_id, 'column': column} for task_id, column in matches]
+        emit(records, records)
+        return
+
+    for task_id, column in matches:
+        console.print(f"[cyan]{task_id}[/cyan]  {column}")
+
+    if not matches:
+        console.print("[dim]No matching tasks[/dim]")
+
+@cli.command()
+@click.argument('query', nargs=-1, required=True)
+@click.option('--column', type=click.Choice(COLUMNS), help='Only tasks in this column')
+@click.option('--limit', default=20, show_default=True, help='Maximum results (0 = all)')
+@click.option('--any', 'match_any', is_flag=True, help='Match any term instead of all terms')
+@click.option('--archived', is_flag=True, help='Also search archived done tasks')
+def search(query, column, limit, match_any, archived):
+    """Full-text search over titles, descriptions, use cases, criteria, notes and tags
+
+    A term ending in * matches as a prefix (e.g. `search mqtt reconn*`).
+    """
+    results = search_tasks(' '.join(query), column, limit, match_any, archived)
+
+    if OUTPUT_FORMAT:
+        emit(results, results)
+        return
+
+    if not results:
+        console.print("[dim]No matching tasks[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"\nSearch: {' '.join(query)} ({len(results)} results)", title_style="bold cyan")
+    table.add_column("ID", style="cyan", width=10)
+    table.add_column("Column", width=12)
+    table.add_column("Title", style="white", width=40)
+    table.add_column("Matched In", width=24)
+    table.add_column("Score", justify="right", width=7)
+
+    for result in results:
+        title = result['title']
+        table.add_row(
+            result['id'],
+            result['column'],
+            title[:37] + "..." if len(title) > 40 else title,
+            ', '.join(field.replace('_', ' ') for field in result['fields']),
+            f"{result['score']:.2f}"
+        )
+
+    console.print(table)
+
+@cli.command()
+@click.argument('expression', nargs=-1, required=True)
+def query(expression):
+    """List tasks matching a query expression
+
+    \b
+    Fields: column, tag, id, title, type, priority, assignee, validation_status,
+            use_case, created_at, updated_at, completed_at
+    Operators: = != < <= > >= (priority and column compare by rank),
+               ~ (substring), tag:NAME; combine with and, or, not and ( )
+    \b
+    Example: query 'priority>=high and assignee=agent and tag:mqtt and column!=done'
+    """
+    from urllib.parse import urlencode
+
+    expression = ' '.join(expression)
+    try:
+        records = daemon_request('GET', f"/query?{urlencode({'q': expression})}")
+        if records is None:
+            records = [task_summary(task, column) for column, tasks in query_tasks(expression).items()
+                       for task in tasks]
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(records, records)
+        return
+
+    if not records:
+        console.print("[dim]No matching tasks[/dim]")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"\nQuery: {expression} ({len(records)} tasks)", title_style="bold cyan")
+    table.add_column("ID", style="cyan", width=10)
+    table.add_column("Column", width=12)
+    table.add_column("Title", style="white", width=40)
+    table.add_column("Type", width=10)
+    table.add_column("Priority", width=10)
+    table.add_column("Assignee", width=12)
+
+    for task in records:
+        title = task.get('title') or ''
+        priority_color = get_color_for_priority(task.get('priority') or 'medium')
+        table.add_row(
+            task['id'],
+            task['column'],
+            title[:37] + "..." if len(title) > 40 else title,
+            f"[{get_color_for_type(task.get('type') or 'feature')}]{task.get('type')}[/]",
+            f"[{priority_color}]{task.get('priority')}[/{priority_color}]",
+            task.get('assignee') or 'unassigned'
+        )
+
+    console.print(table)
+
+@cli.command()
+@click.argument('task_id')
+def history(task_id):
+    """Show the journaled changes of a task (adds, moves, assigns, updates, deletes)"""
+    try:
+        events = task_history(task_id)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(events, events)
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"\nHistory of {task_id}", title_style="bold cyan")
+    table.add_column("Time", style="dim", width=19)
+    table.add_column("Event", style="cyan", width=9)
+    table.add_column("Details", style="white")
+
+    for event in events:
+        op = event['op']
+        if op == 'add':
+            details = f"created in backlog: {event.get('title')}"
+        elif op == 'move':
+            details = f"{event['from']} → {event['to']}"
+        elif op in ('claim', 'release'):
+            details = f"{event['from']} → {event['to']} ({event['owner']}{', lease expired' if event.get('expired') else ''})"
+        elif op == 'baseline':
+            details = f"in {event['column']} when the journal started"
+        else:
+            details = ', '.join(f"{key}={value}" for key, value in event.items() if key not in ('ts', 'op'))
+        table.add_row(event['ts'][:19].replace('T', ' '), op, details)
+
+    console.print(table)
+
+@cli.command()
+@click.option('--until', 'until', required=True, help='Point in time, e.g. 2025-10-20 or 2025-10-20T14:30')
+@click.option('--column', type=click.Choice(COLUMNS), help='Show specific column only')
+def replay(until, column):
+    """Rebuild the board as it was at a past time from the journal"""
+    try:
+        tasks, state = replay_board(until)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    view = board_view(tasks, load_metadata(), column)
+    if OUTPUT_FORMAT:
+        emit(view, [task for col in view.values() for task in col['tasks']])
+        return
+
+    console.print(f"[bold]Board as of {until}[/bold] [dim](next task number {state['next_task_number']})[/dim]")
+    render_board(view)
+
+@cli.command()
+@click.option('--weeks', default=12, show_default=True, type=click.IntRange(min=1),
+              help='Weeks of throughput and WIP to show')
+def analytics(weeks):
+    """Flow metrics: lead time, cycle time per column, weekly throughput and WIP (agent vs human)"""
+    try:
+        result = flow_analytics(weeks)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result, result['weekly'])
+        return
+
+    render_analytics(result)
+
+def render_analytics(result):
+    """Print a flow_analytics result as rich tables"""
+    from rich.table import Table
+
+    def days(value):
+        return "[dim]-[/dim]" if value is None else f"{value:.1f}"
+
+    table = Table(title=f"\nLead Time in Days ({result['completed']} of {result['tasks']} tasks completed)",
+                  title_style="bold cyan")
+    table.add_column("Assignee", style="cyan", width=10)
+    table.add_column("Count", justify="right")
+    for p in PERCENTILES:
+        table.add_column(f"P{p}", justify="right")
+    table.add_column("Mean", justify="right")
+    for group, summary in result['lead_time_days'].items():
+        table.add_row(group, str(summary['count']), *[days(summary[f"p{p}"]) for p in PERCENTILES],
+                      days(summary['mean']))
+    console.print(table)
+
+    histogram = result['lead_time_histogram']
+    table = Table(title="\nLead Time Distribution", title_style="bold cyan")
+    table.add_column("Days", style="cyan")
+    for group in ANALYTICS_GROUPS:
+        table.add_column(group.capitalize(), justify="right")
+    for i, label in enumerate(histogram['bins']):
+        table.add_row(label, *[str(histogram[group][i]) for group in ANALYTICS_GROUPS])
+    console.print(table)
+
+    table = Table(title="\nCycle Time per Column in Days (P50 / P85, from the journal)", title_style="bold cyan")
+    table.add_column("Column", style="cyan", width=15)
+    for group in ANALYTICS_GROUPS:
+        table.add_column(group.capitalize(), justify="right")
+    table.add_column("Stints", justify="right")
+    for column, groups in result['cycle_time_days'].items():
+        table.add_row(column, *[f"{days(groups[group]['p50'])} / {days(groups[group]['p85'])}"
+                                for group in ANALYTICS_GROUPS], str(groups['all']['count']))
+    console.print(table)
+
+    table = Table(title="\nWeekly Throughput and WIP", title_style="bold cyan")
+    table.add_column("Week of", style="cyan")
+    for group in ANALYTICS_GROUPS:
+        table.add_column(f"Done ({group})", justify="right")
+    for group in ANALYTICS_GROUPS:
+        table.add_column(f"Open ({group})", justify="right")
+    for week in result['weekly']:
+        table.add_row(week['week'], *[str(week['throughput'][group]) for group in ANALYTICS_GROUPS],
+                      *[str(week['wip'][group]) for group in ANALYTICS_GROUPS])
+    console.print(table)
     console.print()
 
+@cli.command()
+@click.option('--format', 'export_format', type=click.Choice(EXPORT_FORMATS), default='jsonl',
+              show_default=True, help='Output format (parquet needs pyarrow)')
+@click.option('--fields', help=f"Comma-separated fields (default: {','.join(EXPORT_FIELDS)})")
+@click.option('--column', type=click.Choice(COLUMNS), help='Only tasks in this column')
+@click.option('--where', help='Only tasks matching a query expression (see `query`)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='File to write (default: stdout)')
+@click.option('--archived', is_flag=True, help='Include archived done tasks (column "archive")')
+def export(export_format, fields, column, where, output, archived):
+    """Export tasks as JSON lines, CSV or Parquet"""
+    fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    try:
+        count = export_tasks(export_format, fields, column, where, output, archived)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if not output:
+        return
+    if OUTPUT_FORMAT:
+        emit({'ok': True, 'exported': count, 'output': output})
+    else:
+        console.print(f"[green]✓[/green] Exported {count} tasks to {output}")
+
+@cli.command('import')
+@click.argument('source', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'import_format', type=click.Choice(IMPORT_FORMATS),
+              help='Input format (default: from the file extension)')
+@click.option('--dry-run', is_flag=True, help='Only validate the records')
+def import_(source, import_format, dry_run):
+    """Import tasks from a JSON, JSON lines or CSV file
+
+    Records are checked against task_template in board-metadata.json; a
+    `column` field places a task in another column. If an import is
+    interrupted, run the same command again to finish it with the same IDs.
+    """
+    try:
+        result = import_tasks(source, import_format, dry_run)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    if dry_run:
+        console.print(f"[green]✓[/green] {result['records']} valid records")
+    elif not result['records']:
+        console.print("[dim]No records to import[/dim]")
+    else:
+        resumed = " (resumed)" if result['resumed'] else ""
+        console.print(f"[green]✓[/green] Imported {result['imported']} tasks{resumed}: "
+                      f"{result['first']} … {result['last']}")
+
+@cli.command()
+@click.option('--older-than', 'days', type=click.IntRange(min=0), default=DEFAULT_ARCHIVE_DAYS,
+              show_default=True, help='Archive done tasks completed more than DAYS ago')
+@click.option('--before', help='Archive done tasks completed before this date (overrides --older-than)')
+@click.option('--dry-run', is_flag=True, help='Only list the tasks that would be archived')
+def archive(days, before, dry_run):
+    """Move old done tasks into compressed monthly packs under archive/
+
+    Archived tasks no longer slow down show, stats or queries; `details`,
+    `search --archived` and `export --archived` still read them.
+    """
+    try:
+        if before:
+            before = normalize_timestamp(before)
+        else:
+            before = (datetime.now() - timedelta(days=days)).isoformat()
+        packs = archive_done_tasks(before, dry_run)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    count = sum(len(ids) for ids in packs.values())
+    if OUTPUT_FORMAT:
+        emit({'ok': True, 'dry_run': dry_run, 'archived': count, 'before': before,
+              'packs': {archive_pack_path(pack).name: ids for pack, ids in packs.items()}})
+        return
+
+    if not count:
+        console.print("[dim]No done tasks to archive[/dim]")
+        return
+    verb = "Would archive" if dry_run else "Archived"
+    for pack, ids in packs.items():
+        console.print(f"  {archive_pack_path(pack).name}: {len(ids)} tasks")
+    console.print(f"[green]✓[/green] {verb} {count} tasks completed before {before[:10]}")
+
+@cli.command('convert-storage')
+@click.argument('target', type=click.Choice(STORAGE_TYPES))
+@click.option('--mirror/--no-mirror', default=True, show_default=True,
+              help='With sqlite: keep the markdown files as a mirror of the database')
+def convert_storage_command(target, mirror):
+    """Convert the board between markdown files and a SQLite database (board.db)"""
+    try:
+        count = convert_storage(target, mirror)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit({'ok': True, 'storage': target, 'tasks': count, 'mirror': mirror if target == 'sqlite' else None})
+        return
+
+    console.print(f"[green]✓[/green] Converted {count} tasks to {target} storage")
+    if target == 'sqlite':
+        console.print("  Markdown mirror: " + ("on" if mirror else "off (task files removed)"))
+
+@cli.command()
+@click.option('--repair', is_flag=True, help='Fix what can be fixed and rebuild stale caches and indexes')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), help='Worker processes for the file checks (default: core count)')
+def fsck(repair, jobs):
+    """Check task files, metadata and derived indexes for consistency
+
+    Every task file is validated against the task_template in
+    board-metadata.json; IDs must be unique, match their file name and lie
+    below next_task_number. With --json the report is printed as JSON (--jsonl:
+    one problem per line) and the exit status is 1 if unrepaired errors remain.
+    """
+    try:
+        report = check_board(repair, jobs)
+    except KanbanError as e:
+        report_error(str(e))
+        return
+
+    if OUTPUT_FORMAT:
+        emit(report, report['problems'])
+        if not report['ok']:
+            sys.exit(1)
+        return
+
+    if not report['problems']:
+        console.print(f"[green]✓[/green] Checked {report['files']} task files, no problems found")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=f"\nBoard Check ({report['files']} task files)", title_style="bold cyan")
+    table.add_column("Severity")
+    table.add_column("Check", style="cyan")
+    table.add_column("File")
+    table.add_column("Problem")
+    table.add_column("Status")
+    for problem in report['problems']:
+        severity = "[red]error[/red]" if problem['severity'] == 'error' else "[yellow]warning[/yellow]"
+        if problem['repaired']:
+            status = "[green]repaired[/green]"
+        else:
+            status = "repairable" if problem['repairable'] else "[dim]manual fix[/dim]"
+        table.add_row(severity, problem['check'], problem['file'], problem['message'], status)
+    console.print(table)
+
+    if report['repaired']:
+        console.print(f"[green]✓[/green] Repaired {report['repaired']} of {len(report['problems'])} problems")
+    elif any(problem['repairable'] for problem in report['problems']):
+        console.print("Run [cyan]fsck --repair[/cyan] to fix the repairable problems")
+
+@cli.command()
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to bind')
+@click.option('--port', default=DEFAULT_DAEMON_PORT, show_default=True, envvar='KANBAN_DAEMON_PORT',
+              help='Port to listen on (0 = any free port)')
+@click.option('--poll-interval', default=2.0, show_default=True,
+              help='Seconds between rescans when inotify is unavailable')
+@click.option('--no-inotify', is_flag=True, help='Always poll instead of using inotify')
+def serve(host, port, poll_interval, no_inotify):
+    """Serve the board from memory over a local HTTP API"""
+    try:
+        serve_board(host, port, poll_interval, not no_inotify)
+    except KanbanError as e:
+        report_error(str(e))
+
+@cli.command('publish-events')
+@click.option('--follow', is_flag=True, help='Keep running and publish new events as they are queued')
+def publish_events(follow):
+    """Publish queued board-change events to the --mqtt broker
+
+    Normally started in the background by the first change that queues an
+    event; run it directly to flush events queued during a broker outage.
+    """
+    if not MQTT_URL:
+        report_error("No MQTT broker configured (use --mqtt or KANBAN_MQTT_URL)")
+        return
+    try:
+        published = run_mqtt_publisher(MQTT_URL, follow)
+    except KeyboardInterrupt:
+        published = 0
+    result = {'published': published, 'queued': queued_mqtt_events(), 'running': published is None}
+
+    if OUTPUT_FORMAT:
+        emit(result)
+        return
+
+    if published is None:
+        console.print("[yellow]Another publisher is already running[/yellow]")
+    else:
+        console.print(f"[green]✓[/green] Published {published} message(s) to {MQTT_URL}")
+    if result['queued']:
+        console.print(f"[yellow]{result['queued']} event(s) still queued (broker unreachable?)[/yellow]")
+
 if __name__ == '__main__':
     cli()
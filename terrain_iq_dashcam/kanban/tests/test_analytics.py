@@ -0,0 +1,47 @@
+"""
+Tests for the `analytics` flow metrics
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+
+import pytest
+
+from test_cli_json import board, run_kanban
+
+pytest.importorskip('numpy')
+
+def test_analytics_counts_and_cycle_times(board):
+    run_kanban(board, 'move', 'TASK-011', 'ready')
+    run_kanban(board, 'move', 'TASK-011', 'done')
+
+    result = json.loads(run_kanban(board, '--json', 'analytics', '--weeks', '4').stdout)
+    show = json.loads(run_kanban(board, '--json', 'show').stdout)
+    tasks = [task for view in show.values() for task in view['tasks']]
+
+    assert result['tasks'] == len(tasks)
+    lead = result['lead_time_days']
+    assert lead['all']['count'] == result['completed'] > 0
+    assert lead['agent']['count'] + lead['human']['count'] <= lead['all']['count']
+    assert sum(result['lead_time_histogram']['all']) == lead['all']['count']
+
+    # The ready stint is measurable from the journal
+    assert result['cycle_time_days']['ready']['all']['count'] == 1
+    assert 'done' not in result['cycle_time_days']
+
+    assert len(result['weekly']) == 4
+    assert result['weekly'][-1]['throughput']['all'] >= 1
+
+def test_cycle_times_follow_claims_and_releases(board):
+    added = run_kanban(board, '--json', 'add', '--title', 'Queued', '--description', 'Queued work',
+                       '--type', 'feature', '--priority', 'critical')
+    task_id = json.loads(added.stdout)['id']
+    run_kanban(board, 'move', task_id, 'ready')
+    for command in ('claim', 'release', 'claim'):
+        run_kanban(board, command, *([task_id] if command == 'release' else []), '--owner', 'worker-1')
+    run_kanban(board, 'move', task_id, 'done')
+
+    cycle = json.loads(run_kanban(board, '--json', 'analytics').stdout)['cycle_time_days']
+    # Each claim closes a ready stint; the release and the final move close in_progress ones
+    assert cycle['ready']['all']['count'] == 2 and cycle['ready']['agent']['count'] == 0
+    assert cycle['in_progress']['all']['count'] == cycle['in_progress']['agent']['count'] == 2
@@ -0,0 +1,43 @@
+"""
+Tests for `archive` and reading archived tasks back (details, search, export)
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+
+from test_cli_json import board, run_kanban
+
+def test_archive_moves_done_tasks_into_packs(board):
+    done = sorted(path.stem for path in (board / 'done').glob('TASK-*.md'))
+    dry = json.loads(run_kanban(board, '--json', 'archive', '--before', '2025-10-12T08:00', '--dry-run').stdout)
+    assert 0 < dry['archived'] < len(done)
+    assert sorted(path.stem for path in (board / 'done').glob('TASK-*.md')) == done
+
+    result = json.loads(run_kanban(board, '--json', 'archive', '--before', '2030-01-01').stdout)
+    assert result['archived'] == len(done)
+    assert list(result['packs']) == ['done-2025-10.zip']
+    assert not list((board / 'done').glob('TASK-*.md'))
+    assert (board / 'archive' / 'done-2025-10.zip').exists()
+
+    stats = json.loads(run_kanban(board, '--json', 'stats').stdout)
+    assert stats['columns']['done']['count'] == 0
+
+    task = json.loads(run_kanban(board, '--json', 'details', done[0]).stdout)
+    assert task['id'] == done[0] and task['column'] == 'archive'
+    assert task['acceptance_criteria']
+
+def test_archived_tasks_in_search_and_export(board):
+    title = json.loads(run_kanban(board, '--json', 'details', 'TASK-001').stdout)['title']
+    run_kanban(board, 'archive', '--before', '2030-01-01')
+
+    query = title.split()[0]
+    assert 'TASK-001' not in [hit['id'] for hit in json.loads(run_kanban(board, '--json', 'search', query).stdout)]
+    hits = json.loads(run_kanban(board, '--json', 'search', '--archived', query).stdout)
+    assert {'id': 'TASK-001', 'column': 'archive'}.items() <= next(h for h in hits if h['id'] == 'TASK-001').items()
+
+    records = [json.loads(line) for line in
+               run_kanban(board, 'export', '--archived', '--fields', 'id,column').stdout.splitlines()]
+    assert {'id': 'TASK-001', 'column': 'archive'} in records
+    filtered = [json.loads(line) for line in
+                run_kanban(board, 'export', '--archived', '--where', 'id=TASK-001').stdout.splitlines()]
+    assert [record['id'] for record in filtered] == ['TASK-001']
@@ -0,0 +1,89 @@
+"""
+Tests for `batch`: per-operation results, failures partway through, exit status
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def batch(board, lines, *args):
+    """Run batch on the given input lines; returns (exit status, result objects)"""
+    result = subprocess.run([sys.executable, str(KANBAN_PY), 'batch', *args], capture_output=True, text=True,
+                            input='\n'.join(line if isinstance(line, str) else json.dumps(line) for line in lines),
+                            env=dict(os.environ, KANBAN_DIR=str(board)))
+    return result.returncode, [json.loads(line) for line in result.stdout.splitlines()]
+
+def details(board, task_id):
+    return json.loads(run_kanban(board, '--json', 'details', task_id).stdout)
+
+def test_batch_writes_one_result_per_operation(board):
+    status, results = batch(board, [
+        {'op': 'add', 'title': 'Batched', 'type': 'bug', 'priority': 'high'},
+        '',
+        {'op': 'move', 'id': 'TASK-007', 'column': 'ready'},
+        {'op': 'assign', 'id': 'TASK-007', 'assignee': 'human'},
+        {'op': 'update', 'id': 'TASK-007', 'priority': 'critical', 'add_tag': 'batch'},
+    ])
+    assert status == 0
+    # Blank lines are skipped, but results keep the input line numbers
+    assert [(result['line'], result['op'], result['ok']) for result in results] == [
+        (1, 'add', True), (3, 'move', True), (4, 'assign', True), (5, 'update', True)]
+    assert results[0]['result']['id'] == 'TASK-017'
+    assert results[1]['result'] == {'id': 'TASK-007', 'from': 'backlog', 'to': 'ready', 'moved': True}
+
+    task = details(board, 'TASK-007')
+    assert (task['column'], task['assignee'], task['priority']) == ('ready', 'human', 'critical')
+    assert 'batch' in task['tags']
+
+def test_batch_results_stream_as_operations_finish(board):
+    proc = subprocess.Popen([sys.executable, str(KANBAN_PY), 'batch'], stdin=subprocess.PIPE,
+                            stdout=subprocess.PIPE, text=True, env=dict(os.environ, KANBAN_DIR=str(board)))
+    proc.stdin.write(''.join(json.dumps({'op': 'update', 'id': 'TASK-007', 'add_note': f'note {i}'}) + '\n'
+                             for i in range(500)))
+    proc.stdin.close()
+    # The first result arrives while later operations are still being applied
+    assert json.loads(proc.stdout.readline())['line'] == 1
+    assert proc.poll() is None
+    assert len(proc.stdout.readlines()) == 499 and proc.wait() == 0
+
+def test_batch_failure_partway_through(board):
+    lines = [
+        {'op': 'move', 'id': 'TASK-007', 'column': 'ready'},
+        {'op': 'move', 'id': 'TASK-999', 'column': 'ready'},
+        '{"op": "assign", ',
+        {'op': 'archive', 'id': 'TASK-007'},
+        {'op': 'assign', 'id': 'TASK-007', 'assignee': 'human'},
+    ]
+    # Later operations still run; the exit status reports the failures
+    status, results = batch(board, lines)
+    assert status == 1
+    assert [result['ok'] for result in results] == [True, False, False, False, True]
+    assert 'TASK-999 not found' in results[1]['error']
+    assert results[2]['error'].startswith('Invalid JSON') and results[2]['op'] is None
+    assert results[3]['error'].startswith("Unknown op 'archive'")
+    assert details(board, 'TASK-007')['assignee'] == 'human'
+
+    # --stop-on-error: nothing after the first failure is applied or reported
+    lines[0] = {'op': 'move', 'id': 'TASK-007', 'column': 'review'}
+    lines[-1] = {'op': 'assign', 'id': 'TASK-007', 'assignee': 'agent'}
+    status, results = batch(board, lines, '--stop-on-error')
+    assert status == 1 and [result['ok'] for result in results] == [True, False]
+    task = details(board, 'TASK-007')
+    assert (task['column'], task['assignee']) == ('review', 'human')
+
+def test_batch_reports_unexpected_errors_and_continues(board):
+    # No frontmatter: patching it during the move raises a ValueError
+    (board / 'backlog' / 'TASK-007.md').write_text('# Not a task file\n')
+    status, results = batch(board, [
+        {'op': 'assign', 'id': 'TASK-006', 'assignee': 'human'},
+        {'op': 'move', 'id': 'TASK-007', 'column': 'ready'},
+        {'op': 'assign', 'id': 'TASK-006', 'assignee': 'agent'},
+    ])
+    assert status == 1
+    assert [(result['line'], result['ok']) for result in results] == [(1, True), (2, False), (3, True)]
+    assert 'frontmatter' in results[1]['error']
+    assert details(board, 'TASK-006')['assignee'] == 'agent'
@@ -0,0 +1,81 @@
+"""
+Tests for the `claim` / `renew` / `release` lease-based work queue
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def batch(board, operations):
+    result = subprocess.run([sys.executable, str(KANBAN_PY), 'batch'], capture_output=True, text=True,
+                            input='\n'.join(json.dumps(op) for op in operations),
+                            env=dict(os.environ, KANBAN_DIR=str(board)))
+    assert result.returncode == 0, result.stdout
+    return [json.loads(line)['result'] for line in result.stdout.splitlines()]
+
+def ready_tasks(board, *specs):
+    """Add (priority, type, tags) tasks straight into ready; returns their IDs"""
+    added = batch(board, [{'op': 'add', 'title': f'Queued {i}', 'priority': priority, 'type': task_type}
+                          for i, (priority, task_type, _) in enumerate(specs)])
+    ids = [result['id'] for result in added]
+    batch(board, [{'op': 'update', 'id': task_id, 'add_tag': tag}
+                  for task_id, (_, _, tags) in zip(ids, specs) for tag in tags] +
+                 [{'op': 'move', 'id': task_id, 'column': 'ready'} for task_id in ids])
+    return ids
+
+def claim(board, *args):
+    result = run_kanban(board, '--json', 'claim', *args)
+    return json.loads(result.stdout)
+
+def test_claims_follow_priority_and_filters(board):
+    low, critical, tagged, high = ready_tasks(board, ('low', 'feature', []), ('critical', 'bug', []),
+                                              ('high', 'feature', ['mqtt']), ('high', 'feature', []))
+    assert claim(board, '--tag', 'mqtt')['id'] == tagged
+    assert claim(board, '--type', 'feature')['id'] == high
+    first = claim(board, '--owner', 'agent-1')
+    assert first['id'] == critical and first['owner'] == 'agent-1'
+    assert claim(board)['id'] == low
+    assert claim(board) == {'ok': False, 'error': 'No unassigned task in ready to claim'}
+
+    details = json.loads(run_kanban(board, '--json', 'details', critical).stdout)
+    assert details['column'] == 'in_progress' and details['assignee'] == 'agent'
+    assert details['lease_owner'] == 'agent-1'
+
+def test_concurrent_claimers_never_share_a_task(board):
+    ids = ready_tasks(board, *[(['low', 'medium', 'high', 'critical'][i % 4], 'test', []) for i in range(12)])
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    procs = [subprocess.Popen([sys.executable, str(KANBAN_PY), '--json', 'claim', '--owner', f'agent-{i}'],
+                              stdout=subprocess.PIPE, env=env) for i in range(16)]
+    results = [(json.loads(proc.communicate()[0]), proc.returncode) for proc in procs]
+
+    claimed = [result['id'] for result, status in results if status == 0]
+    assert sorted(claimed) == sorted(ids)
+    assert sum(1 for _, status in results if status != 0) == 4
+    in_progress = json.loads(run_kanban(board, '--json', 'show', '--column', 'in_progress').stdout)
+    assert set(ids) <= {task['id'] for task in in_progress['in_progress']['tasks']}
+
+def test_leases_expire_renew_and_release(board):
+    task_id, = ready_tasks(board, ('medium', 'docs', []))
+    assert claim(board, '--owner', 'agent-1', '--ttl', '1')['id'] == task_id
+    assert 'claimed by agent-1' in run_kanban(board, '--json', 'renew', task_id, '--owner', 'agent-2').stdout
+    assert 'claimed by agent-1' in run_kanban(board, '--json', 'release', task_id, '--owner', 'agent-2').stdout
+
+    time.sleep(2)
+    # The expired lease goes back to ready and is claimed again
+    assert claim(board, '--owner', 'agent-2')['id'] == task_id
+    history = json.loads(run_kanban(board, '--json', 'history', task_id).stdout)
+    assert [event['op'] for event in history][-3:] == ['claim', 'release', 'claim']
+    assert history[-2]['expired']
+
+    renewed = json.loads(run_kanban(board, '--json', 'renew', task_id, '--owner', 'agent-2', '--ttl', '600').stdout)
+    assert renewed['lease_expires_at'] > history[-1]['ts'][:19]
+    released = json.loads(run_kanban(board, '--json', 'release', task_id, '--owner', 'agent-2').stdout)
+    assert released['to'] == 'ready'
+    details = json.loads(run_kanban(board, '--json', 'details', task_id).stdout)
+    assert details['column'] == 'ready' and details['assignee'] == 'unassigned'
+    assert not details.get('lease_owner')
@@ -0,0 +1,86 @@
+"""
+Tests for the kanban.py --json/--jsonl output modes and their startup-time budget
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+KANBAN_PY = Path(__file__).resolve().parent.parent / "kanban.py"
+SOURCE_BOARD = KANBAN_PY.parent
+
+# Median wall-clock budget for `kanban.py --json show` on the sample board
+STARTUP_BUDGET_MS = float(os.environ.get('KANBAN_STARTUP_BUDGET_MS', 300))
+
+@pytest.fixture
+def board(tmp_path):
+    """Copy of the project board, so commands never touch the real task files"""
+    shutil.copy(SOURCE_BOARD / "board-metadata.json", tmp_path)
+    for column in ['backlog', 'ready', 'in_progress', 'review', 'done']:
+        if (SOURCE_BOARD / column).exists():
+            shutil.copytree(SOURCE_BOARD / column, tmp_path / column)
+    return tmp_path
+
+def run_kanban(board, *args):
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    return subprocess.run([sys.executable, str(KANBAN_PY), *args],
+                          capture_output=True, text=True, env=env)
+
+def test_json_show_lists_every_column(board):
+    result = run_kanban(board, '--json', 'show')
+    assert result.returncode == 0, result.stderr
+    view = json.loads(result.stdout)
+    assert list(view) == ['backlog', 'ready', 'in_progress', 'review', 'done']
+    ids = [task['id'] for column in view.values() for task in column['tasks']]
+    assert 'TASK-006' in ids and 'TASK-006.01' in ids
+
+def test_jsonl_show_prints_one_task_per_line(board):
+    result = run_kanban(board, '--jsonl', 'show', '--column', 'done')
+    lines = [json.loads(line) for line in result.stdout.splitlines()]
+    assert lines and all(task['column'] == 'done' for task in lines)
+
+def test_json_details_and_stats(board):
+    task = json.loads(run_kanban(board, '--json', 'details', 'TASK-006').stdout)
+    assert task['column'] == 'in_progress'
+    assert task['acceptance_criteria']
+    assert '_markdown' not in task
+
+    stats = json.loads(run_kanban(board, '--json', 'stats').stdout)
+    assert stats['total']['count'] == sum(col['count'] for col in stats['columns'].values())
+    assert sum(stats['priorities'].values()) == stats['total']['count']
+
+def test_json_errors_exit_nonzero(board):
+    result = run_kanban(board, '--json', 'details', 'TASK-999')
+    assert result.returncode == 1
+    assert json.loads(result.stdout) == {'ok': False, 'error': 'Task TASK-999 not found'}
+
+def test_json_mode_never_imports_rich(board):
+    code = (
+        "import sys; sys.argv = ['kanban.py', '--json', 'show']\n"
+        f"sys.path.insert(0, {str(KANBAN_PY.parent)!r})\n"
+        "import kanban\n"
+        "kanban.cli(standalone_mode=False)\n"
+        "assert not any(m == 'rich' or m.startswith('rich.') for m in sys.modules), 'rich imported'\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            env=dict(os.environ, KANBAN_DIR=str(board)))
+    assert result.returncode == 0, result.stderr
+
+def test_json_show_startup_budget(board):
+    run_kanban(board, '--json', 'show')  # warm the task cache and page cache
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        result = run_kanban(board, '--json', 'show')
+        timings.append((time.perf_counter() - start) * 1000)
+        assert result.returncode == 0, result.stderr
+    median = statistics.median(timings)
+    assert median < STARTUP_BUDGET_MS, f"--json show took {median:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)"
@@ -0,0 +1,51 @@
+"""
+Tests for concurrent `add` and `reserve-ids` on the markdown storage
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def run_parallel(board, commands):
+    """Start every command at once; returns their parsed --json outputs"""
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    procs = [subprocess.Popen([sys.executable, str(KANBAN_PY), '--json', *command],
+                              stdout=subprocess.PIPE, env=env)
+             for command in commands]
+    return [json.loads(proc.communicate()[0]) for proc in procs]
+
+def test_concurrent_adds_get_distinct_ids(board):
+    before = json.loads((board / 'board-metadata.json').read_text())['next_task_number']
+    ids = [result['id'] for result in run_parallel(board, [
+        ('add', '--title', f'Agent {i}', '--description', '', '--type', 'test', '--priority', 'low')
+        for i in range(16)])]
+    assert len(set(ids)) == 16
+
+    files = sorted(path.stem for path in (board / 'backlog').glob('TASK-*.md'))
+    assert set(ids) <= set(files)
+    assert json.loads((board / 'board-metadata.json').read_text())['next_task_number'] == before + 16
+    # Every write went through a temp file renamed into place
+    assert not list(board.glob('**/*.tmp'))
+    listed = [record['id'] for record in json.loads(run_kanban(board, '--json', 'ids').stdout)]
+    assert len(listed) == len(set(listed)) and set(ids) <= set(listed)
+
+def test_concurrent_reserve_ids_get_disjoint_blocks(board):
+    before = json.loads((board / 'board-metadata.json').read_text())['next_task_number']
+    blocks = run_parallel(board, [('reserve-ids', '5') for _ in range(8)])
+    reserved = sorted(int(task_id.split('-')[1]) for block in blocks for task_id in block)
+    assert reserved == list(range(before, before + 40))
+    for block in blocks:
+        numbers = [int(task_id.split('-')[1]) for task_id in block]
+        assert numbers == list(range(numbers[0], numbers[0] + 5))
+
+    task_id = blocks[3][2]
+    add = ('--title', 'Reserved', '--description', '', '--type', 'test', '--priority', 'low')
+    assert json.loads(run_kanban(board, '--json', 'add', '--id', task_id, *add).stdout)['id'] == task_id
+    # Used once only, and never past the reserved range
+    assert run_kanban(board, '--json', 'add', '--id', task_id, *add).returncode == 1
+    assert run_kanban(board, '--json', 'add', '--id', f'TASK-{before + 40}', *add).returncode == 1
+    assert (board / 'backlog' / f'{task_id}.md').exists()
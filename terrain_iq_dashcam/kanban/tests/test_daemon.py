@@ -0,0 +1,86 @@
+"""
+Tests for routing commands through the `serve` daemon, and falling back without it
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from test_cli_json import KANBAN_PY, board
+from test_mqtt import broker
+
+def kanban(board, *args, mqtt_url=None, no_daemon=False, input=None):
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    env.pop('KANBAN_NO_DAEMON', None)
+    env.pop('KANBAN_MQTT_URL', None)
+    if mqtt_url:
+        env['KANBAN_MQTT_URL'] = mqtt_url
+    if no_daemon:
+        env['KANBAN_NO_DAEMON'] = '1'
+    return subprocess.run([sys.executable, str(KANBAN_PY), '--json', *args], input=input,
+                          capture_output=True, text=True, env=env)
+
+@pytest.fixture
+def daemon(board):
+    """A daemon on a free port that only rescans the board once a minute"""
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    env.pop('KANBAN_MQTT_URL', None)
+    proc = subprocess.Popen([sys.executable, str(KANBAN_PY), 'serve', '--port', '0', '--no-inotify',
+                             '--poll-interval', '60'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env)
+    daemon_file = board / '.kanban-cache' / 'daemon.json'
+    deadline = time.time() + 15
+    while not daemon_file.exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert daemon_file.exists()
+    yield proc
+    proc.kill()
+    proc.wait()
+
+def priority(board, task_id, **kwargs):
+    show = json.loads(kanban(board, 'show', **kwargs).stdout)
+    return next(task['priority'] for view in show.values() for task in view['tasks'] if task['id'] == task_id)
+
+def test_commands_route_through_the_daemon(board, daemon):
+    task_file = board / 'review' / 'TASK-009.md'
+    task_file.write_text(task_file.read_text().replace('priority: high', 'priority: low', 1))
+    # The daemon answers from memory (it has not rescanned yet); --no-daemon reads the file
+    assert priority(board, 'TASK-009') == 'high'
+    assert priority(board, 'TASK-009', no_daemon=True) == 'low'
+
+    # Writes are applied by the daemon, which re-reads the written task
+    assert json.loads(kanban(board, 'update', 'TASK-009', '--priority', 'critical').stdout)['id'] == 'TASK-009'
+    assert priority(board, 'TASK-009') == 'critical'
+    ids = ('ids', '--from', 'TASK-005', '--to', 'TASK-010')
+    listed = json.loads(kanban(board, *ids).stdout)
+    assert listed and listed == json.loads(kanban(board, *ids, no_daemon=True).stdout)
+    # API errors come back as ordinary command errors
+    result = kanban(board, 'details', 'TASK-999')
+    assert result.returncode == 1 and 'TASK-999 not found' in result.stdout
+
+def test_commands_fall_back_when_the_daemon_is_down(board, daemon):
+    daemon.send_signal(signal.SIGKILL)
+    daemon.wait()
+    # daemon.json is left behind, naming a dead process
+    assert (board / '.kanban-cache' / 'daemon.json').exists()
+
+    start = time.perf_counter()
+    assert json.loads(kanban(board, 'assign', 'TASK-006', 'human').stdout)['assignee'] == 'human'
+    assert json.loads(kanban(board, 'details', 'TASK-006').stdout)['assignee'] == 'human'
+    assert [record['id'] for record in json.loads(kanban(board, 'ids', 'TASK-006').stdout)][0] == 'TASK-006'
+    assert time.perf_counter() - start < 10
+
+def test_daemon_publishes_with_the_clients_mqtt_setting(board, daemon, broker):
+    # The daemon itself runs without --mqtt
+    assert kanban(board, 'assign', 'TASK-006', 'human').returncode == 0
+    assert not (board / '.kanban-cache' / 'mqtt-outbox.jsonl').exists()
+
+    assert kanban(board, 'assign', 'TASK-006', 'agent', mqtt_url=broker.url).returncode == 0
+    topic, event = broker.wait_for(1)[0]
+    assert topic == 'kanban/in_progress/TASK-006' and event['changes'] == {'assignee': 'agent'}
@@ -0,0 +1,46 @@
+"""
+Tests for `export` (JSON lines, CSV, Parquet)
+Run with: python -m pytest kanban/tests
+"""
+
+import csv
+import io
+import json
+
+import pytest
+
+from test_cli_json import board, run_kanban
+
+def test_export_jsonl_projection(board):
+    result = run_kanban(board, 'export', '--fields', 'id,column,tags')
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    show = json.loads(run_kanban(board, '--json', 'show').stdout)
+    assert [(record['id'], record['column']) for record in records] == \
+        [(task['id'], column) for column, view in show.items() for task in view['tasks']]
+    assert all(set(record) == {'id', 'column', 'tags'} for record in records)
+
+def test_export_csv_with_filter(board):
+    result = run_kanban(board, 'export', '--format', 'csv', '--where', 'priority=critical')
+    rows = list(csv.DictReader(io.StringIO(result.stdout)))
+    assert rows and all(row['priority'] == 'critical' for row in rows)
+    assert 'description' in rows[0]
+
+def test_export_rejects_unknown_fields(board, tmp_path):
+    output = tmp_path / 'tasks.csv'
+    result = run_kanban(board, '--json', 'export', '--format', 'csv', '-o', str(output),
+                        '--fields', 'id,prority,titel')
+    assert result.returncode == 1
+    assert json.loads(result.stdout)['error'].startswith('Unknown field(s): prority, titel')
+    assert not output.exists()
+    # Template keys outside the default projection are fine
+    records = [json.loads(line) for line in run_kanban(board, 'export', '--fields', 'id,test_data').stdout.splitlines()]
+    assert records and all(set(record) == {'id', 'test_data'} for record in records)
+
+def test_export_parquet(board, tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    output = tmp_path / 'tasks.parquet'
+    result = run_kanban(board, '--json', 'export', '--format', 'parquet', '--column', 'done', '-o', str(output))
+    summary = json.loads(result.stdout)
+    table = pq.read_table(output)
+    assert table.num_rows == summary['exported'] > 0
+    assert set(table.column('column').to_pylist()) == {'done'}
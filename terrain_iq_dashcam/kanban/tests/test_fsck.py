@@ -0,0 +1,65 @@
+"""
+Tests for `fsck` board checks and `fsck --repair`
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import re
+import sqlite3
+
+from test_cli_json import board, run_kanban
+
+def fsck(board, *args):
+    result = run_kanban(board, '--json', 'fsck', *args)
+    report = json.loads(result.stdout)
+    assert result.returncode == (0 if report['ok'] else 1), result.stderr
+    return report
+
+def checks(report):
+    return {(problem['check'], problem['file']) for problem in report['problems']}
+
+def test_fsck_finds_and_repairs_inconsistencies(board):
+    # The sample board's one real problem: a value outside the template's choices
+    assert checks(fsck(board)) == {('invalid_value', 'backlog/TASK-014.md')}
+
+    (board / 'backlog' / 'TASK-001.md').write_bytes((board / 'done' / 'TASK-001.md').read_bytes())
+    mismatch = board / 'done' / 'TASK-002.md'
+    mismatch.write_text(mismatch.read_text().replace('id: TASK-002', 'id: TASK-099', 1))
+    incomplete = board / 'done' / 'TASK-003.md'
+    incomplete.write_text(re.sub(r'(?m)^completed_at: .*$', 'completed_at: None', incomplete.read_text(), 1))
+    high = board / 'backlog' / 'TASK-050.md'
+    high.write_text((board / 'backlog' / 'TASK-007.md').read_text().replace('id: TASK-007', 'id: TASK-050', 1))
+
+    report = fsck(board)
+    assert not report['ok'] and report['files'] == 19
+    assert {
+        ('duplicate_id', 'done/TASK-001.md'),
+        ('id_mismatch', 'done/TASK-002.md'),
+        ('missing_completed_at', 'done/TASK-003.md'),
+        ('id_above_next', 'backlog/TASK-050.md'),
+    } <= checks(report)
+    assert all(problem['repairable'] for problem in report['problems'] if problem['check'] != 'invalid_value')
+
+    repaired = fsck(board, '--repair')
+    assert repaired['repaired'] == len(repaired['problems']) - 1
+    assert checks(fsck(board)) == {('invalid_value', 'backlog/TASK-014.md')}
+
+    metadata = json.loads((board / 'board-metadata.json').read_text())
+    assert metadata['next_task_number'] == 52
+    assert (board / 'done' / 'TASK-051.md').exists() and not (board / 'done' / 'TASK-001.md').exists()
+    assert json.loads(run_kanban(board, '--json', 'details', 'TASK-051').stdout)['column'] == 'done'
+    assert 'id: TASK-002\n' in mismatch.read_text()
+    assert re.search(r'(?m)^completed_at: \d{4}-', incomplete.read_text())
+
+def test_fsck_rebuilds_stale_index(board):
+    stats = json.loads(run_kanban(board, '--json', 'stats').stdout)
+    conn = sqlite3.connect(board / '.kanban-cache' / 'index.db')
+    with conn:
+        conn.execute("UPDATE docs SET priority = 'low' WHERE key = 'done/TASK-001.md'")
+    conn.close()
+
+    report = fsck(board, '--repair')
+    stale = [problem for problem in report['problems'] if problem['check'] == 'stale_cache']
+    assert [(problem['file'], problem['repaired']) for problem in stale] == [('.kanban-cache/index.db', True)]
+    assert json.loads(run_kanban(board, '--json', 'stats').stdout) == stats
+    assert checks(fsck(board)) == {('invalid_value', 'backlog/TASK-014.md')}
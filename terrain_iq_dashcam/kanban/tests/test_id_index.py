@@ -0,0 +1,36 @@
+"""
+Tests for `ids` prefix and range lookups in the task ID index
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+
+from test_cli_json import board, run_kanban
+
+def ids(board, *args):
+    return [record['id'] for record in json.loads(run_kanban(board, '--no-daemon', '--json', 'ids', *args).stdout)]
+
+def test_ids_prefixes_and_ranges(board):
+    every = ids(board)
+    files = sorted(path.stem for path in board.glob('*/TASK-*.md'))
+    assert sorted(every) == files and len(every) == len(set(every))
+
+    # A textual prefix covers the whole range
+    assert ids(board, 'TASK-') == ids(board, 'TASK') == every
+    assert ids(board, 'BUG-') == []
+
+    # A numeric prefix: the task and its subtasks only
+    subtasks = [task_id for task_id in every if task_id.startswith('TASK-006.')]
+    assert subtasks and ids(board, 'TASK-006') == ['TASK-006'] + subtasks
+    assert ids(board, 'TASK-999') == []
+
+    # Inclusive ranges, in numeric order, combined with a prefix
+    assert ids(board, '--from', 'TASK-005', '--to', 'TASK-007') == \
+        ['TASK-005', 'TASK-006'] + subtasks + ['TASK-007']
+    assert ids(board, 'TASK-', '--from', 'TASK-016') == [task_id for task_id in every
+                                                          if int(task_id[5:8]) >= 16]
+    assert ids(board, 'TASK-006', '--to', 'TASK-006') == ['TASK-006']
+
+    # A task added later lands in order
+    run_kanban(board, 'add', '--title', 'Later', '--description', '', '--type', 'test', '--priority', 'low')
+    assert ids(board, 'TASK-')[-1] == 'TASK-017'
@@ -0,0 +1,92 @@
+"""
+Tests for `import` (validation, batched ID reservation, resume)
+Run with: python -m pytest kanban/tests
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+from test_mqtt import broker
+
+def next_task_number(board):
+    return json.loads((board / 'board-metadata.json').read_text())['next_task_number']
+
+def test_import_jsonl_and_csv(board, tmp_path):
+    first = next_task_number(board)
+    source = tmp_path / 'tasks.jsonl'
+    source.write_text('\n'.join(json.dumps(record) for record in [
+        {'title': 'Imported one', 'priority': 'high', 'tags': ['migrated']},
+        {'title': 'Imported two', 'column': 'done', 'assignee': 'human'},
+    ]) + '\n')
+    result = json.loads(run_kanban(board, '--json', 'import', str(source)).stdout)
+    assert result['imported'] == 2 and result['first'] == f'TASK-{first:03d}'
+    assert next_task_number(board) == first + 2
+    assert (board / 'done' / f'TASK-{first + 1:03d}.md').exists()
+
+    csv_source = tmp_path / 'tasks.csv'
+    csv_source.write_text('title,type,tags\nFrom CSV,bug,a; b\n')
+    run_kanban(board, 'import', str(csv_source))
+    details = json.loads(run_kanban(board, '--json', 'details', f'TASK-{first + 2:03d}').stdout)
+    assert details['type'] == 'bug' and details['tags'] == ['a', 'b']
+
+def test_invalid_records_write_nothing(board, tmp_path):
+    first = next_task_number(board)
+    source = tmp_path / 'bad.jsonl'
+    source.write_text('{"title": "ok"}\n{"title": "x", "priority": "urgent"}\n{"bogus": 1}\n')
+    result = run_kanban(board, '--json', 'import', str(source))
+    assert result.returncode == 1
+    error = json.loads(result.stdout)['error']
+    assert 'record 2' in error and 'record 3' in error
+    assert next_task_number(board) == first
+
+def test_rerun_resumes_with_same_ids(board, tmp_path):
+    source = tmp_path / 'tasks.json'
+    source.write_text(json.dumps([{'title': f'Task {i}'} for i in range(5)]))
+    first = next_task_number(board)
+    # An interrupted import: IDs reserved and recorded, only some files written
+    state_dir = board / '.kanban-cache' / 'imports'
+    run_kanban(board, 'reserve-ids', '5')
+    state_dir.mkdir(parents=True, exist_ok=True)
+    (state_dir / f"{hashlib.sha256(source.read_bytes()).hexdigest()}.json").write_text(
+        json.dumps({'source': str(source), 'first': first, 'count': 5}))
+    run_kanban(board, 'add', '--id', f'TASK-{first:03d}', '--title', 'Task 0', '--description', '',
+               '--type', 'feature', '--priority', 'medium')
+
+    result = json.loads(run_kanban(board, '--json', 'import', str(source)).stdout)
+    assert result == {'records': 5, 'imported': 4, 'resumed': True,
+                      'first': f'TASK-{first:03d}', 'last': f'TASK-{first + 4:03d}'}
+    assert next_task_number(board) == first + 5
+    assert not list(state_dir.iterdir())
+
+def test_import_updates_index_counts_and_publishes(board, tmp_path, broker):
+    stats = lambda *args: json.loads(run_kanban(board, '--json', 'stats', *args).stdout)
+    before = stats()
+    source = tmp_path / 'tasks.jsonl'
+    source.write_text('\n'.join(json.dumps({'title': f'Imported {i}', 'priority': 'critical',
+                                            'column': ['ready', 'review'][i % 2]}) for i in range(6)))
+    result = subprocess.run([sys.executable, str(KANBAN_PY), '--json', 'import', str(source)], capture_output=True,
+                            text=True, env=dict(os.environ, KANBAN_DIR=str(board), KANBAN_MQTT_URL=broker.url))
+    first = json.loads(result.stdout)['first']
+
+    # The import itself brought the existing index up to date
+    conn = sqlite3.connect(board / '.kanban-cache' / 'index.db')
+    try:
+        indexed = {key for key, in conn.execute("SELECT key FROM docs")}
+    finally:
+        conn.close()
+    assert indexed == {str(path.relative_to(board)) for path in board.glob('*/TASK-*.md')}
+
+    after = stats()
+    assert after == stats('--where', 'id~TASK')
+    assert after['total']['count'] == before['total']['count'] + 6
+    assert after['priorities']['critical'] == before['priorities']['critical'] + 6
+    assert after['columns']['ready']['count'] == before['columns']['ready']['count'] + 3
+
+    topics = dict(broker.wait_for(6))
+    assert topics[f'kanban/ready/{first}']['ops'] == ['add']
+    assert len([topic for topic in topics if topic.startswith(('kanban/ready/', 'kanban/review/'))]) == 6
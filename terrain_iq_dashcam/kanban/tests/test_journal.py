@@ -0,0 +1,40 @@
+"""
+Tests for the mutation journal: `history` and `replay --until`
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import time
+from datetime import datetime
+
+from test_cli_json import board, run_kanban
+
+def test_history_and_replay(board):
+    added = json.loads(run_kanban(board, '--json', 'add', '--title', 'Journaled task', '--description', '',
+                                  '--type', 'bug', '--priority', 'high').stdout)
+    task_id = added['id']
+    time.sleep(0.01)
+    before_move = datetime.now().isoformat()
+    time.sleep(0.01)
+    run_kanban(board, 'move', task_id, 'review')
+    run_kanban(board, 'assign', task_id, 'human')
+
+    events = json.loads(run_kanban(board, '--json', 'history', task_id).stdout)
+    assert [event['op'] for event in events] == ['add', 'move', 'assign']
+    assert events[1]['from'] == 'backlog' and events[1]['to'] == 'review'
+
+    then = json.loads(run_kanban(board, '--json', 'replay', '--until', before_move).stdout)
+    now = json.loads(run_kanban(board, '--json', 'replay', '--until', datetime.now().isoformat()).stdout)
+    assert task_id in [task['id'] for task in then['backlog']['tasks']]
+    assert task_id in [task['id'] for task in now['review']['tasks']]
+
+    # Replaying to now gives the same tasks per column as the board itself
+    board_now = json.loads(run_kanban(board, '--json', 'show').stdout)
+    assert {column: [task['id'] for task in view['tasks']] for column, view in now.items()} == \
+        {column: [task['id'] for task in view['tasks']] for column, view in board_now.items()}
+
+def test_replay_before_journal_start(board):
+    run_kanban(board, 'assign', 'TASK-006', 'agent')
+    result = run_kanban(board, '--json', 'replay', '--until', '2020-01-01')
+    assert result.returncode == 1
+    assert 'journal starts' in json.loads(result.stdout)['error']
@@ -0,0 +1,68 @@
+"""
+Tests that `move` keeps task files byte-for-byte apart from the patched fields
+Run with: python -m pytest kanban/tests
+"""
+
+import re
+
+from test_cli_json import board, run_kanban
+
+# CRLF and LF mixed, a comment, quoted and unicode values, an unknown key and a
+# body with its own "---" line, checkbox state, trailing spaces and no final newline
+UNUSUAL_TASK = (
+    b"---\r\n"
+    b"id: TASK-090\r\n"
+    b"title: \"Colons: in 'quotes' \xe2\x80\x94 and unicode\"\r\n"
+    b"# a comment the parser skips\n"
+    b"type: feature\r\n"
+    b"priority: low\r\n"
+    b"assignee: human\r\n"
+    b"custom_field:   keep   this   spacing\r\n"
+    b"tags: [x, 'y z']\r\n"
+    b"updated_at: 2024-01-01T00:00:00\r\n"
+    b"---\r\n"
+    b"\r\n"
+    b"# Unusual\r\n"
+    b"\r\n"
+    b"## Description\r\n"
+    b"\r\n"
+    b"Body with a rule:\n"
+    b"---\n"
+    b"and trailing spaces   \r\n"
+    b"\r\n"
+    b"## Acceptance Criteria\r\n"
+    b"\r\n"
+    b"- [x] done already\r\n"
+    b"- [ ] still open\r\n"
+    b"\r\n"
+    b"## Unknown Section\r\n"
+    b"\r\n"
+    b"<!-- kept as-is -->"
+)
+
+def without(data, *fields):
+    """The file bytes with the given frontmatter lines dropped"""
+    return re.sub(rb'(?m)^(%s): [^\r\n]*\r?\n' % b'|'.join(field.encode() for field in fields), b'', data)
+
+def test_move_is_lossless(board):
+    (board / 'backlog' / 'TASK-090.md').write_bytes(UNUSUAL_TASK)
+
+    assert run_kanban(board, 'move', 'TASK-090', 'ready').returncode == 0
+    assert not (board / 'backlog' / 'TASK-090.md').exists()
+    moved = (board / 'ready' / 'TASK-090.md').read_bytes()
+    assert moved != UNUSUAL_TASK
+    assert without(moved, 'updated_at') == without(UNUSUAL_TASK, 'updated_at')
+
+    # Moving to done adds completed_at/validation_status before the closing line
+    assert run_kanban(board, 'move', 'TASK-090', 'done').returncode == 0
+    done = (board / 'done' / 'TASK-090.md').read_bytes()
+    assert re.search(rb'(?m)^completed_at: \d{4}-[^\r\n]*\r\nvalidation_status: passed\r\n---\r\n', done)
+    assert (without(done, 'updated_at', 'completed_at', 'validation_status') ==
+            without(UNUSUAL_TASK, 'updated_at'))
+
+def test_move_never_replaces_an_existing_file(board):
+    (board / 'review' / 'TASK-006.md').write_bytes(b'not a task, but not ours to overwrite\n')
+    result = run_kanban(board, '--json', 'move', 'TASK-006', 'review')
+    assert result.returncode == 1 and 'already exists' in result.stdout
+    assert (board / 'review' / 'TASK-006.md').read_bytes() == b'not a task, but not ours to overwrite\n'
+    assert (board / 'in_progress' / 'TASK-006.md').exists()
@@ -0,0 +1,131 @@
+"""
+Tests for board-change events published over MQTT, against a local broker stand-in
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from test_cli_json import KANBAN_PY, board
+
+class FakeBroker(socketserver.ThreadingTCPServer):
+    """Accepts MQTT 3.1.1 CONNECT/PUBLISH/DISCONNECT and records (topic, payload)"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0):
+        self.messages = []
+        self.connections = 0
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(handler):
+                self.connections += 1
+                while True:
+                    header = handler.rfile.read(1)
+                    if not header:
+                        return
+                    length, shift = 0, 0
+                    while True:
+                        byte = handler.rfile.read(1)[0]
+                        length |= (byte & 0x7f) << shift
+                        shift += 7
+                        if not byte & 0x80:
+                            break
+                    body = handler.rfile.read(length)
+                    packet_type = header[0] & 0xf0
+                    if packet_type == 0x10:
+                        handler.wfile.write(bytes([0x20, 2, 0, 0]))
+                    elif packet_type == 0x30:
+                        size = int.from_bytes(body[:2], 'big')
+                        topic = body[2:2 + size].decode()
+                        self.messages.append((topic, json.loads(body[4 + size:])))
+                        handler.wfile.write(bytes([0x40, 2]) + body[2 + size:4 + size])
+                    elif packet_type == 0xe0:
+                        return
+
+        super().__init__(('127.0.0.1', port), Handler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"mqtt://127.0.0.1:{self.server_address[1]}"
+
+    def wait_for(self, count, timeout=15):
+        deadline = time.time() + timeout
+        while len(self.messages) < count and time.time() < deadline:
+            time.sleep(0.05)
+        return self.messages
+
+@pytest.fixture
+def broker():
+    server = FakeBroker()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def kanban(board, url, *args, input=None):
+    env = dict(os.environ, KANBAN_DIR=str(board), KANBAN_NO_DAEMON='1', KANBAN_MQTT_URL=url)
+    return subprocess.run([sys.executable, str(KANBAN_PY), *args], input=input,
+                          capture_output=True, text=True, env=env)
+
+# The publisher's retry backoff doubles from 0.5 s, so it retries within ~8 s
+MQTT_RETRY_WAIT = 20
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def test_batch_publishes_one_coalesced_message_per_task(board, broker):
+    operations = [
+        {'op': 'add', 'title': 'Published task', 'type': 'bug', 'priority': 'high'},
+        {'op': 'move', 'id': 'TASK-001', 'column': 'ready'},
+        {'op': 'update', 'id': 'TASK-001', 'priority': 'critical', 'add_tag': 'mqtt'},
+        {'op': 'update', 'id': 'TASK-001', 'add_tag': 'events'},
+        {'op': 'move', 'id': 'TASK-001', 'column': 'in_progress'},
+        {'op': 'assign', 'id': 'TASK-001', 'assignee': 'agent'},
+    ]
+    result = kanban(board, broker.url, 'batch', input='\n'.join(json.dumps(op) for op in operations))
+    assert result.returncode == 0, result.stderr
+    added = json.loads(result.stdout.splitlines()[0])['result']['id']
+
+    messages = dict(broker.wait_for(2))
+    time.sleep(0.5)
+    assert len(broker.messages) == 2
+    task = messages['kanban/in_progress/TASK-001']
+    assert task['ops'] == ['move', 'update', 'assign']
+    assert task['changes'] == {'priority': 'critical', 'tags': ['mqtt', 'events'], 'assignee': 'agent'}
+    assert task['column'] == 'in_progress' and 'from' in task
+    new = messages[f'kanban/backlog/{added}']
+    assert new['ops'] == ['add'] and new['changes']['title'] == 'Published task'
+
+def test_broker_outage_never_slows_the_cli(board):
+    port = free_port()
+    url = f"mqtt://127.0.0.1:{port}"
+    column = json.loads(kanban(board, url, '--json', 'details', 'TASK-002').stdout)['column']
+    start = time.perf_counter()
+    for column in ['ready', 'review', 'done']:
+        assert kanban(board, url, 'move', 'TASK-002', column).returncode == 0
+    assert kanban(board, url, 'delete', 'TASK-003', input='y\n').returncode == 0
+    assert time.perf_counter() - start < 5
+
+    # The events stay queued; the background publisher retries until the broker is back
+    broker = FakeBroker(port)
+    try:
+        topics = dict(broker.wait_for(2, timeout=MQTT_RETRY_WAIT))
+        assert topics['kanban/done/TASK-002']['ops'] == ['move']
+        assert topics['kanban/done/TASK-002']['from'] == column
+        assert [topic for topic in topics if topic.endswith('/TASK-003')]
+        assert json.loads(kanban(board, url, '--json', 'publish-events').stdout)['queued'] == 0
+    finally:
+        broker.shutdown()
+        broker.server_close()
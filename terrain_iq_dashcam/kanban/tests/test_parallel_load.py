@@ -0,0 +1,53 @@
+"""
+Tests that loading on a thread pool keeps column order and per-file warnings
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board
+
+# Loads the board cold and warm with each worker count; prints IDs and warnings
+LOAD_BOARD = """
+import json, kanban
+warnings = []
+kanban.warn = warnings.append
+loads = {}
+for workers in (1, 8):
+    for state in ('cold', 'warm'):
+        if state == 'cold':
+            kanban.TASK_CACHE_FILE.unlink(missing_ok=True)
+        warnings.clear()
+        tasks = kanban.get_all_tasks(workers=workers)
+        loads[f'{workers}/{state}'] = {'ids': {column: [task['id'] for task in column_tasks]
+                                               for column, column_tasks in tasks.items()},
+                                       'warnings': list(warnings)}
+print(json.dumps(loads))
+"""
+
+def test_parallel_load_keeps_order_and_warnings(board):
+    template = (board / 'backlog' / 'TASK-007.md').read_text()
+    # Enough files for several chunks per worker, written in non-sorted order
+    for number in range(300, 100, -1):
+        column = ['backlog', 'ready', 'review'][number % 3]
+        (board / column).mkdir(exist_ok=True)
+        (board / column / f'TASK-{number}.md').write_text(template.replace('id: TASK-007', f'id: TASK-{number}', 1))
+    (board / 'ready' / 'TASK-050.md').write_text('no frontmatter here\n')
+    (board / 'review' / 'TASK-051.md').write_bytes(b'---\nid: TASK-051\ntitle: \xff\xfe\n---\n')
+
+    env = dict(os.environ, KANBAN_DIR=str(board), PYTHONPATH=str(KANBAN_PY.parent))
+    result = subprocess.run([sys.executable, '-c', LOAD_BOARD], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    loads = json.loads(result.stdout)
+
+    serial = loads['1/cold']
+    assert all(load == serial for load in loads.values())
+    for column, task_ids in serial['ids'].items():
+        files = sorted(path.stem for path in (board / column).glob('TASK-*.md')
+                       if path.stem not in ('TASK-050', 'TASK-051'))
+        assert task_ids == files
+    assert sorted(warning.split(':')[0] for warning in serial['warnings']) == \
+        ['Could not load TASK-050.md', 'Could not load TASK-051.md']
@@ -0,0 +1,34 @@
+"""
+Tests for the global --profile / KANBAN_TRACE instrumentation
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def test_profile_json_and_summary(board, tmp_path):
+    report_file = tmp_path / 'profile.json'
+    result = run_kanban(board, '--json', '--profile', '--profile-json', str(report_file), 'show')
+    # stdout stays machine-readable; the summary goes to stderr
+    view = json.loads(result.stdout)
+    task_count = sum(len(column['tasks']) for column in view.values())
+    assert 'Profile of `show`' in result.stderr
+
+    report = json.loads(report_file.read_text())
+    assert report['command'] == 'show'
+    assert {'scan', 'read', 'parse_frontmatter', 'metadata_read', 'render'} <= set(report['phases'])
+    assert report['counters']['files_scanned'] == task_count
+    assert report['counters']['files_read'] == task_count
+    assert report['counters']['bytes_read'] > 0
+
+    # Warm run via the environment: the frontmatter cache means no task file is read
+    env = dict(os.environ, KANBAN_DIR=str(board), KANBAN_TRACE_JSON=str(report_file))
+    warm = subprocess.run([sys.executable, str(KANBAN_PY), '--json', 'show'], capture_output=True, text=True, env=env)
+    assert json.loads(warm.stdout) == view
+    assert not warm.stderr
+    report = json.loads(report_file.read_text())
+    assert 'read' not in report['phases'] and 'files_read' not in report['counters']
@@ -0,0 +1,85 @@
+"""
+Tests for the `query` expression language and `show`/`stats --where`
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+
+from test_cli_json import board, run_kanban
+
+PRIORITY_RANK = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+
+def all_tasks(board):
+    view = json.loads(run_kanban(board, '--json', 'show').stdout)
+    return [task for column in view.values() for task in column['tasks']]
+
+def query_ids(board, expression):
+    result = run_kanban(board, '--jsonl', 'query', expression)
+    assert result.returncode == 0, result.stdout + result.stderr
+    return [json.loads(line)['id'] for line in result.stdout.splitlines()]
+
+def test_query_matches_full_scan(board):
+    expected = [task['id'] for task in all_tasks(board)
+                if PRIORITY_RANK.get(task['priority'], -1) >= PRIORITY_RANK['high']
+                and task['assignee'] == 'agent' and task['column'] != 'done']
+    assert expected
+    assert query_ids(board, 'priority>=high and assignee=agent and column!=done') == expected
+
+def test_query_or_not_and_tags(board):
+    tasks = all_tasks(board)
+    tagged = [task['id'] for task in tasks if 'testing' in (task['tags'] or [])]
+    assert query_ids(board, 'tag:testing') == tagged
+    others = [task['id'] for task in tasks if task['type'] != 'feature' or task['column'] == 'done']
+    assert query_ids(board, 'not type=feature or column=done') == others
+
+def test_show_and_stats_where(board):
+    ids = query_ids(board, 'priority=critical')
+    view = json.loads(run_kanban(board, '--json', 'show', '--where', 'priority=critical').stdout)
+    assert [task['id'] for column in view.values() for task in column['tasks']] == ids
+
+    stats = json.loads(run_kanban(board, '--json', 'stats', '--where', 'priority=critical').stdout)
+    assert stats['total']['count'] == len(ids)
+    assert stats['priorities']['critical'] == len(ids)
+
+def test_index_follows_writes(board):
+    task_id = query_ids(board, 'priority=critical')[0]
+    run_kanban(board, 'update', task_id, '--priority', 'low')
+    assert task_id not in query_ids(board, 'priority=critical')
+    assert task_id in query_ids(board, 'priority=low')
+
+def test_invalid_query_reports_error(board):
+    for expression in ['prio>=high', 'priority>=urgent', '(type=bug', 'type>bug']:
+        result = run_kanban(board, '--json', 'query', expression)
+        assert result.returncode == 1
+        assert json.loads(result.stdout)['ok'] is False
+
+def test_stats_aggregates_follow_writes_and_outside_edits(board):
+    def stats(*args):
+        return json.loads(run_kanban(board, '--json', 'stats', *args).stdout)
+
+    def check():
+        # stats reads the materialized counts; --where recomputes from the index
+        assert stats() == stats('--where', 'id~TASK')
+
+    task_id = query_ids(board, 'column=backlog')[0]
+    check()
+    run_kanban(board, 'move', task_id, 'ready')
+    run_kanban(board, 'assign', task_id, 'human')
+    run_kanban(board, 'update', task_id, '--priority', 'critical')
+    check()
+    (board / 'ready' / f'{task_id}.md').unlink()
+    check()
+    assert stats()['total']['count'] == len(all_tasks(board))
+
+    # Edited in place: the folder mtime doesn't change, so --resync stats the files
+    edited = board / 'review' / 'TASK-009.md'
+    edited.write_text(edited.read_text().replace('priority: high', 'priority: low', 1))
+    assert stats('--resync')['priorities']['low'] == 1
+    check()
+
+    # Added by hand, then a CLI write in another column before the next read
+    (board / 'review' / 'TASK-200.md').write_text(
+        (board / 'review' / 'TASK-009.md').read_text().replace('id: TASK-009', 'id: TASK-200', 1))
+    run_kanban(board, 'assign', 'TASK-006', 'agent')
+    check()
+    assert stats()['total']['count'] == len(all_tasks(board))
@@ -0,0 +1,67 @@
+"""
+Tests for `search` ranking and the incrementally maintained full-text index
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def search(board, *args):
+    return json.loads(run_kanban(board, '--json', 'search', *args).stdout)
+
+def add(board, title, description, tag=None):
+    """Add a task (with an optional tag); returns its ID"""
+    operation = {'op': 'add', 'title': title, 'description': description}
+    result = subprocess.run([sys.executable, str(KANBAN_PY), 'batch'], capture_output=True, text=True,
+                            input=json.dumps(operation), env=dict(os.environ, KANBAN_DIR=str(board)))
+    task_id = json.loads(result.stdout)['result']['id']
+    if tag:
+        run_kanban(board, 'update', task_id, '--add-tag', tag)
+    return task_id
+
+def indexed_terms(board, task_id):
+    conn = sqlite3.connect(board / '.kanban-cache' / 'index.db')
+    try:
+        return {term for term, in conn.execute(
+            "SELECT term FROM postings JOIN docs USING (key) WHERE docs.id = ?", (task_id,))}
+    finally:
+        conn.close()
+
+def test_bm25_ranking_order(board):
+    # Same-length documents that differ only in where "zephyr" appears
+    in_title = add(board, 'Zephyr relay', 'Route frames over the link')
+    tagged = add(board, 'Quiet relay', 'Route frames over the link', tag='zephyr')
+    in_description = add(board, 'Quiet relay', 'Route zephyr over the link')
+    hits = search(board, 'zephyr')
+    assert [hit['id'] for hit in hits] == [in_title, tagged, in_description]
+    assert hits[0]['score'] > hits[1]['score'] > hits[2]['score']
+    assert hits[0]['fields'] == {'title': ['zephyr']}
+
+    # A rarer term outweighs a common one; every term must match unless --any
+    rare = add(board, 'Relay gremlin', 'Route frames over the link')
+    assert [hit['id'] for hit in search(board, '--any', 'gremlin', 'relay')][0] == rare
+    assert [hit['id'] for hit in search(board, 'gremlin', 'relay')] == [rare]
+    assert [hit['id'] for hit in search(board, 'zeph*')] == [in_title, tagged, in_description]
+    assert [hit['id'] for hit in search(board, '--limit', '1', 'zephyr')] == [in_title]
+
+def test_index_follows_add_update_and_delete(board):
+    search(board, 'relay')
+    task_id = add(board, 'Quokka uplink', 'Buffer frames while offline')
+    # The write itself updated the index, without waiting for the next search
+    assert {'quokka', 'uplink', 'buffer'} <= indexed_terms(board, task_id)
+    assert [hit['id'] for hit in search(board, 'quokka')] == [task_id]
+
+    run_kanban(board, 'update', task_id, '--title', 'Wombat uplink', '--add-note', 'numbat retry')
+    assert {'wombat', 'numbat'} <= indexed_terms(board, task_id) and 'quokka' not in indexed_terms(board, task_id)
+    assert search(board, 'quokka') == []
+    hit, = search(board, 'numbat')
+    assert (hit['id'], hit['fields']) == (task_id, {'notes': ['numbat']})
+
+    run_kanban(board, 'delete', '--yes', task_id)
+    assert indexed_terms(board, task_id) == set()
+    assert search(board, 'wombat') == []
@@ -0,0 +1,59 @@
+"""
+Tests for the SQLite storage backend and `convert-storage`
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def task_files(board):
+    return {str(path.relative_to(board)): path.read_bytes()
+            for path in sorted(board.glob('*/TASK-*.md'))}
+
+def test_sqlite_storage_with_mirror_round_trip(board):
+    show = run_kanban(board, '--json', 'show').stdout
+    stats = run_kanban(board, '--json', 'stats').stdout
+
+    result = json.loads(run_kanban(board, '--json', 'convert-storage', 'sqlite').stdout)
+    assert result['tasks'] == len(task_files(board))
+    assert (board / 'board.db').exists()
+    assert run_kanban(board, '--json', 'show').stdout == show
+    assert run_kanban(board, '--json', 'stats').stdout == stats
+
+    added = json.loads(run_kanban(board, '--json', 'add', '--title', 'Stored in SQLite', '--description', 'x',
+                                  '--type', 'bug', '--priority', 'critical').stdout)
+    run_kanban(board, 'move', added['id'], 'review')
+    details = json.loads(run_kanban(board, '--json', 'details', added['id']).stdout)
+    assert details['column'] == 'review' and details['title'] == 'Stored in SQLite'
+    assert added['id'] in [task['id'] for task in
+                           json.loads(run_kanban(board, '--json', 'query', 'column=review').stdout)]
+    # The mirror follows every write
+    assert (board / 'review' / f"{added['id']}.md").exists()
+    assert not (board / 'backlog' / f"{added['id']}.md").exists()
+
+    mirrored = task_files(board)
+    run_kanban(board, 'convert-storage', 'markdown')
+    assert not (board / 'board.db').exists()
+    assert task_files(board) == mirrored
+    assert json.loads(run_kanban(board, '--json', 'details', added['id']).stdout)['column'] == 'review'
+
+def test_sqlite_storage_concurrent_adds(board):
+    run_kanban(board, 'convert-storage', 'sqlite', '--no-mirror')
+    assert not task_files(board)
+    before = len(json.loads(run_kanban(board, '--json', 'ids').stdout))
+
+    env = dict(os.environ, KANBAN_DIR=str(board))
+    procs = [subprocess.Popen([sys.executable, str(KANBAN_PY), '--json', 'add', '--title', f'Agent {i}',
+                               '--description', '', '--type', 'test', '--priority', 'low'],
+                              stdout=subprocess.PIPE, env=env)
+             for i in range(16)]
+    ids = [json.loads(proc.communicate()[0])['id'] for proc in procs]
+    assert len(set(ids)) == 16
+
+    listed = [record['id'] for record in json.loads(run_kanban(board, '--json', 'ids').stdout)]
+    assert len(listed) == before + 16 and set(ids) <= set(listed)
+    assert json.loads(run_kanban(board, '--json', 'stats').stdout)['total']['count'] == len(listed)
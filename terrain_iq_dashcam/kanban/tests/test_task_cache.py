@@ -0,0 +1,57 @@
+"""
+Tests that the parsed-task cache never serves a changed task file
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import time
+
+from test_cli_json import board, run_kanban
+
+def shown(board):
+    """Task ID -> (column, assignee) as `show` lists it"""
+    show = json.loads(run_kanban(board, '--json', 'show').stdout)
+    return {task['id']: (column, task['assignee']) for column, view in show.items() for task in view['tasks']}
+
+def cache_entries(board):
+    return json.loads((board / '.kanban-cache' / 'tasks.json').read_text())['files']
+
+def age(path, seconds=3600):
+    """Backdate a file's mtime, so its cache entry is trusted"""
+    stamp = time.time_ns() - seconds * 1_000_000_000
+    os.utime(path, ns=(stamp, stamp))
+
+def test_cache_follows_moves_removes_and_same_size_edits(board):
+    for path in board.glob('*/TASK-*.md'):
+        age(path)
+    tasks = shown(board)
+    assert all(entry['mtime'] for entry in cache_entries(board).values())
+
+    run_kanban(board, 'move', 'TASK-007', 'ready')
+    (board / 'done' / 'TASK-001.md').rename(board / 'review' / 'TASK-001.md')
+    (board / 'done' / 'TASK-002.md').unlink()
+    tasks.update({'TASK-007': ('ready', tasks['TASK-007'][1]), 'TASK-001': ('review', tasks['TASK-001'][1])})
+    del tasks['TASK-002']
+    assert shown(board) == tasks
+
+    # agent <-> human keeps the size; assign also rewrites updated_at in the same second
+    for assignee in ('human', 'agent', 'human'):
+        run_kanban(board, 'assign', 'TASK-006', assignee)
+        assert shown(board)['TASK-006'] == ('in_progress', assignee)
+
+def test_racy_entries_are_read_again(board):
+    task_file = board / 'in_progress' / 'TASK-006.md'
+    text = task_file.read_text()
+    assert 'assignee: agent' in text
+    task_file.write_text(text)
+    # Cached right after a write: the entry must not be trusted later...
+    shown(board)
+    assert cache_entries(board)['in_progress/TASK-006.md']['mtime'] is None
+
+    # ...because a same-size edit within the same tick leaves mtime and size alone
+    stat = task_file.stat()
+    task_file.write_text(text.replace('assignee: agent', 'assignee: human'))
+    os.utime(task_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert task_file.stat().st_size == stat.st_size
+    assert shown(board)['TASK-006'] == ('in_progress', 'human')
@@ -0,0 +1,50 @@
+"""
+Tests for the compact TaskRecords get_all_tasks returns
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board
+
+# Compares every record with the dict load_task returns, on a cold and a warm cache
+CHECK_RECORDS = """
+import json, kanban
+metadata = kanban.load_metadata()
+for _ in range(2):
+    for column, tasks in kanban.get_all_tasks().items():
+        for task in tasks:
+            full = kanban.load_task(task.task_file)
+            assert task == full and list(task) == list(full), task
+            assert json.dumps(dict(task), default=str) == json.dumps(full, default=str)
+            assert kanban.task_to_markdown(task) == kanban.task_to_markdown(full)
+            assert kanban.task_details(task, column, metadata) == kanban.task_details(full, column, metadata)
+tasks = kanban.get_all_tasks()
+# The frontmatter grew after the task was listed: the body offset is stale
+task = next(task for task in tasks['backlog'] if task['id'] == 'TASK-007')
+kanban.patch_frontmatter(task.task_file, {'title': 'A much longer title than the task had before'})
+print(json.dumps({'interned': tasks['backlog'][0]['type'] is kanban.sys.intern('feature'),
+                  'crlf': [task['notes'] for task in tasks['backlog'] if task['id'] == 'TASK-090'],
+                  'stale_offset': task['description'] == kanban.load_task(task.task_file)['description'],
+                  'order': list(tasks['ready'][0])[:7]}))
+"""
+
+def test_records_read_like_task_dicts(board):
+    (board / 'backlog' / 'TASK-090.md').write_bytes(
+        b"---\r\nid: TASK-090\r\ntitle: Windows file\r\ntype: feature\r\ncompleted_at: None\r\n"
+        b"tags: [a, b]\r\n---\r\n\r\n# Windows file\r\n\r\n## Description\r\n\r\nCRLF\r\n\r\n"
+        b"## Notes\r\n\r\n- one\r\n")
+    # Frontmatter keys out of the usual order, one also a body field
+    (board / 'ready').mkdir(exist_ok=True)
+    (board / 'ready' / 'TASK-091.md').write_text(
+        "---\ntitle: Out of order\ncustom: 1\nid: TASK-091\ntags: []\npriority: low\nnotes: [x]\n"
+        "type: bug\n---\n\n# Out of order\n\n## Notes\n\n- body note\n")
+    env = dict(os.environ, KANBAN_DIR=str(board), PYTHONPATH=str(KANBAN_PY.parent))
+    result = subprocess.run([sys.executable, '-c', CHECK_RECORDS], capture_output=True, text=True, env=env)
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout) == {'interned': True, 'crlf': [['one']], 'stale_offset': True,
+                                          'order': ['title', 'custom', 'id', 'tags', 'priority', 'notes', 'type']}
+
@@ -0,0 +1,45 @@
+"""
+Tests for `show --watch` and `stats --watch` (JSON update stream)
+Run with: python -m pytest kanban/tests
+"""
+
+import json
+import os
+import select
+import subprocess
+import sys
+
+from test_cli_json import KANBAN_PY, board, run_kanban
+
+def watch(board, *args):
+    env = dict(os.environ, KANBAN_DIR=str(board), KANBAN_NO_DAEMON='1')
+    return subprocess.Popen([sys.executable, str(KANBAN_PY), '--json', *args, '--watch', '--debounce', '0.5'],
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, env=env)
+
+def next_update(proc, timeout=10):
+    readable, _, _ = select.select([proc.stdout], [], [], timeout)
+    assert readable, 'no update within timeout'
+    return json.loads(proc.stdout.readline())
+
+def test_watch_redraws_once_per_burst(board):
+    show, stats = watch(board, 'show'), watch(board, 'stats')
+    try:
+        first_view, first_stats = next_update(show), next_update(stats)
+        moving = [task['id'] for task in first_view['backlog']['tasks']][:5]
+        assert moving
+
+        operations = '\n'.join(json.dumps({'op': 'move', 'id': task_id, 'column': 'review'}) for task_id in moving)
+        subprocess.run([sys.executable, str(KANBAN_PY), 'batch'], input=operations, text=True, check=True,
+                       capture_output=True, env=dict(os.environ, KANBAN_DIR=str(board)))
+
+        view, counts = next_update(show), next_update(stats)
+        assert set(moving) <= {task['id'] for task in view['review']['tasks']}
+        assert not set(moving) & {task['id'] for task in view['backlog']['tasks']}
+        assert view == json.loads(run_kanban(board, '--json', 'show').stdout)
+        assert counts['columns']['review']['count'] == first_stats['columns']['review']['count'] + len(moving)
+        assert counts == json.loads(run_kanban(board, '--json', 'stats').stdout)
+        # The whole batch was one redraw
+        assert not select.select([show.stdout, stats.stdout], [], [], 1.5)[0]
+    finally:
+        show.kill()
+        stats.kill()